@@ -9,7 +9,7 @@ spatial-temporal data
 from .core import grid
 from .core.dask import DaskMoveDataFrame
 from .core.dataframe import MoveDataFrame
-from .core.grid import Grid
+from .core.grid import Grid, GridPyramid
 from .core.pandas import PandasMoveDataFrame
 from .core.pandas_discrete import PandasDiscreteMoveDataFrame
 from .models.pattern_mining import clustering
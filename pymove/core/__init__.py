@@ -5,7 +5,8 @@ MoveDataFrame,
 PandasMoveDataFrame,
 DaskMoveDataFrame,
 PandasDiscreteMoveDataFrame,
-Grid
+Grid,
+GridPyramid
 
 """
 
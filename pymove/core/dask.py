@@ -366,6 +366,14 @@ class DaskMoveDataFrame(DataFrame, MoveDataFrameAbstractModel):
         """Create the three speed in meters by seconds to an GPS point P."""
         raise NotImplementedError('To be implemented')
 
+    def get_last_points(self, *args, **kwargs):
+        """Returns the last point of each trajectory."""
+        raise NotImplementedError('To be implemented')
+
+    def append_dist_time_speed_features(self, *args, **kwargs):
+        """Appends new points computing only their distance, time and speed."""
+        raise NotImplementedError('To be implemented')
+
     def generate_move_and_stop_by_radius(self, *args, **kwargs):
         """Create or update column with move and stop points by radius."""
         raise NotImplementedError('To be implemented')
@@ -1,27 +1,39 @@
-"""Grid class."""
+"""Grid classes."""
 from __future__ import annotations
 
 import math
-from typing import Callable
+from typing import Callable, Generator
 
 import joblib
 import numpy as np
-from pandas import DataFrame
+from numpy import ndarray
+from pandas import DataFrame, Series
+from pandas.util import hash_array
 from shapely.geometry import Polygon
 
 from pymove.utils.constants import (
+    COUNT,
     DATETIME,
+    DISTINCT_IDS,
     INDEX_GRID,
     INDEX_GRID_LAT,
     INDEX_GRID_LON,
     LATITUDE,
     LONGITUDE,
+    MEAN_SPEED,
+    POLYGON,
+    SPEED_TO_PREV,
     TRAJ_ID,
 )
 from pymove.utils.conversions import lat_meters
 from pymove.utils.log import logger, progress_bar
 from pymove.utils.mem import begin_operation, end_operation
 
+try:
+    from shapely import polygons as shapely_polygons
+except ImportError:
+    shapely_polygons = None
+
 
 class Grid:
     """PyMove class representing a grid."""
@@ -65,7 +77,8 @@ class Grid:
             self._create_virtual_grid(data, cell_size, meters_by_degree)
         else:
             raise ValueError('Must pass either data or cell size.')
-        self.grid_polygon = None
+        self.grid_polygon: ndarray | None = None
+        self.grid_cells: ndarray | None = None
 
     def get_grid(self) -> dict:
         """
@@ -109,6 +122,7 @@ class Grid:
         self.grid_size_lon_x = dict_grid['grid_size_lon_x']
         self.cell_size_by_degree = dict_grid['cell_size_by_degree']
         self.grid_polygon = None
+        self.grid_cells = None
 
     def _create_virtual_grid(
         self, data: DataFrame, cell_size: float, meters_by_degree: float
@@ -289,15 +303,94 @@ class Grid:
 
         return polygon
 
-    def create_all_polygons_on_grid(self):
+    def _create_polygons(
+        self, index_grid_lat: ndarray, index_grid_lon: ndarray
+    ) -> ndarray:
+        """Returns the polygons of the cells in the order of the indexes."""
+        cell_size = self.cell_size_by_degree
+        lat_init = self.lat_min_y + cell_size * index_grid_lat
+        lon_init = self.lon_min_x + cell_size * index_grid_lon
+        shells = np.stack([
+            np.column_stack([lon_init, lat_init]),
+            np.column_stack([lon_init, lat_init + cell_size]),
+            np.column_stack([lon_init + cell_size, lat_init + cell_size]),
+            np.column_stack([lon_init + cell_size, lat_init])
+        ], axis=1)
+
+        if shapely_polygons is not None:
+            return shapely_polygons(shells)
+        polygons = np.empty(len(shells), dtype=object)
+        polygons[:] = [Polygon(shell) for shell in shells]
+        return polygons
+
+    def create_polygons_to_cells_on_grid(
+        self, index_grid_lat: ndarray, index_grid_lon: ndarray
+    ) -> ndarray:
+        """
+        Create the polygons of many cells on grid.
+
+        One polygon is created to each distinct cell and shared by
+        the repeated ones.
+
+        Parameters
+        ----------
+        index_grid_lat : array
+            Represents the indexes of grid that reference latitude.
+        index_grid_lon : array
+            Represents the indexes of grid that reference longitude.
+
+        Returns
+        -------
+        ndarray
+            Represents the polygons of the cells in a grid.
+
+        """
+        cells, inverse = np.unique(
+            np.column_stack([
+                np.asarray(index_grid_lat, dtype=np.float64),
+                np.asarray(index_grid_lon, dtype=np.float64)
+            ]),
+            axis=0,
+            return_inverse=True
+        )
+        polygons = self._create_polygons(cells[:, 0], cells[:, 1])
+        return polygons[inverse.ravel()]
+
+    def create_all_polygons_on_grid(self, data: DataFrame | None = None):
         """
         Create all polygons that are represented in a grid.
 
-        Stores the polygons in the `grid_polygon` key
+        Stores the polygons in the `grid_polygon` key.
+        If data is given, the grid is sparse: only the ids of the cells
+        occupied by its points are stored in the `grid_cells` key,
+        and their polygons are created on demand by get_cells_polygons
+        or get_cells_geojson.
+
+        Parameters
+        ----------
+        data : DataFrame, optional
+            Represents the dataset with contains lat and long, by default None
 
         """
         operation = begin_operation('create_all_polygons_on_grid')
 
+        if data is not None:
+            logger.debug('\nSelecting the occupied cells on virtual grid')
+            if INDEX_GRID in data:
+                cells = data[INDEX_GRID].to_numpy(dtype=np.float64)
+            else:
+                lat_, lon_ = self.point_to_index_grid(
+                    data[LATITUDE], data[LONGITUDE]
+                )
+                cells = np.asarray(lon_ * self.grid_size_lat_y + lat_, dtype=np.float64)
+            self.grid_cells = np.unique(cells[~np.isnan(cells)].astype(np.int64))
+            self.grid_polygon = None
+            logger.debug(
+                '...%s cells saved on Grid grid_cells property' % self.grid_cells.size
+            )
+            self.last_operation = end_operation(operation)
+            return
+
         logger.debug('\nCreating all polygons on virtual grid')
         grid_polygon = np.array(
             [
@@ -320,11 +413,109 @@ class Grid:
                 lon_init += cell_size
             lat_init += cell_size
         self.grid_polygon = grid_polygon
+        self.grid_cells = None
         logger.debug('...geometries saved on Grid grid_polygon property')
         self.last_operation = end_operation(operation)
 
+    def get_cells_bounds(self, cells: ndarray | None = None) -> ndarray:
+        """
+        Returns the bounds of cells on grid.
+
+        Parameters
+        ----------
+        cells : array, optional
+            Represents the unique indexes of the cells, by default None,
+            using the occupied cells or every cell of a dense grid
+
+        Returns
+        -------
+        ndarray
+            Represents the lon_min, lat_min, lon_max and lat_max of each cell.
+
+        """
+        cells = self._get_cells(cells)
+        cell_size = self.cell_size_by_degree
+        lat_init = self.lat_min_y + cell_size * (cells % self.grid_size_lat_y)
+        lon_init = self.lon_min_x + cell_size * (cells // self.grid_size_lat_y)
+        return np.column_stack([
+            lon_init, lat_init, lon_init + cell_size, lat_init + cell_size
+        ])
+
+    def get_cells_polygons(self, cells: ndarray | None = None) -> ndarray:
+        """
+        Create the polygons of cells on grid.
+
+        Parameters
+        ----------
+        cells : array, optional
+            Represents the unique indexes of the cells, by default None,
+            using the occupied cells or every cell of a dense grid
+
+        Returns
+        -------
+        ndarray
+            Represents the polygons of the cells.
+
+        """
+        cells = self._get_cells(cells)
+        return self._create_polygons(
+            cells % self.grid_size_lat_y, cells // self.grid_size_lat_y
+        )
+
+    def get_cells_geojson(
+        self, cells: ndarray | None = None, chunk_size: int = 10000
+    ) -> Generator[dict, None, None]:
+        """
+        Generates the GeoJSON features of cells on grid.
+
+        The features are created chunk_size cells at a time.
+
+        Parameters
+        ----------
+        cells : array, optional
+            Represents the unique indexes of the cells, by default None,
+            using the occupied cells or every cell of a dense grid
+        chunk_size : int, optional
+            Represents the number of cells created at a time, by default 10000
+
+        Yields
+        ------
+        dict
+            A GeoJSON polygon feature with the cell index in its properties.
+
+        """
+        cells = self._get_cells(cells)
+        for start in range(0, cells.size, chunk_size):
+            chunk = cells[start:start + chunk_size]
+            bounds = self.get_cells_bounds(chunk)
+            for cell, (lon_min, lat_min, lon_max, lat_max) in zip(
+                chunk.tolist(), bounds.tolist()
+            ):
+                yield {
+                    'type': 'Feature',
+                    'geometry': {
+                        'type': 'Polygon',
+                        'coordinates': [[
+                            [lon_min, lat_min],
+                            [lon_min, lat_max],
+                            [lon_max, lat_max],
+                            [lon_max, lat_min],
+                            [lon_min, lat_min],
+                        ]],
+                    },
+                    'properties': {INDEX_GRID: cell},
+                }
+
+    def _get_cells(self, cells: ndarray | None) -> ndarray:
+        """Returns the given, the occupied or all the cells of the grid."""
+        if cells is not None:
+            return np.asarray(cells, dtype=np.int64)
+        if self.grid_cells is not None:
+            return self.grid_cells
+        return np.arange(self.grid_size_lat_y * self.grid_size_lon_x, dtype=np.int64)
+
     def create_all_polygons_to_all_point_on_grid(
-        self, data: DataFrame
+        self, data: DataFrame, create_polygons: bool = True
     ) -> DataFrame:
         """
         Create all polygons to all points represented in a grid.
@@ -333,6 +524,10 @@ class Grid:
         ----------
         data : DataFrame
             Represents the dataset with contains lat, long and datetime
+        create_polygons : bool, optional
+            Whether to create the polygons, otherwise only the cells of
+            the points are returned and their polygons can be created later
+            with create_polygons_to_cells_on_grid, by default True
 
         Returns
         -------
@@ -347,14 +542,11 @@ class Grid:
 
         datapolygons = data[[TRAJ_ID, INDEX_GRID_LAT, INDEX_GRID_LON]].drop_duplicates()
 
-        polygons = datapolygons.apply(
-            lambda row: self.create_one_polygon_to_point_on_grid(
-                row[INDEX_GRID_LAT], row[INDEX_GRID_LON]
-            ), axis=1
-        )
-
-        logger.debug('...polygons were created')
-        datapolygons['polygon'] = polygons
+        if create_polygons:
+            datapolygons[POLYGON] = self.create_polygons_to_cells_on_grid(
+                datapolygons[INDEX_GRID_LAT], datapolygons[INDEX_GRID_LON]
+            )
+            logger.debug('...polygons were created')
         self.last_operation = end_operation(operation)
         return datapolygons
 
@@ -444,3 +636,239 @@ class Grid:
         """
         text = [f'{k}: {v}' for k, v in self.get_grid().items()]
         return '\n'.join(text)
+
+
+def _hll_registers(
+    groups: ndarray, n_groups: int, values: ndarray, precision: int
+) -> ndarray:
+    """Returns the HyperLogLog registers of the values of each group."""
+    hashes = hash_array(np.asarray(values))
+    buckets = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    # leading zeros in the first 32 bits after the bucket bits
+    rest = ((hashes << np.uint64(precision)) >> np.uint64(32)).astype(np.float64)
+    ranks = 33 - np.frexp(rest)[1]
+
+    registers = np.zeros((n_groups, 1 << precision), dtype=np.uint8)
+    maxima = Series(ranks).groupby(groups * (1 << precision) + buckets).max()
+    registers.ravel()[maxima.index.to_numpy()] = maxima.to_numpy()
+    return registers
+
+
+def _hll_estimate(registers: ndarray) -> ndarray:
+    """Returns the number of distinct values estimated from HyperLogLog registers."""
+    m = registers.shape[1]
+    alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+    raw = alpha * m * m / np.exp2(-registers.astype(np.float64)).sum(axis=1)
+    zeros = np.count_nonzero(registers == 0, axis=1)
+    # linear counting is more accurate for small cardinalities
+    small = (raw <= 2.5 * m) & (zeros > 0)
+    return np.where(small, m * np.log(m / np.maximum(zeros, 1)), raw)
+
+
+class GridPyramid:
+    """PyMove class pre-aggregating the points of a grid in many resolutions."""
+
+    def __init__(
+        self,
+        data: DataFrame,
+        cell_size: float,
+        levels: int = 4,
+        meters_by_degree: float | None = None,
+        label_id: str = TRAJ_ID,
+        label_speed: str = SPEED_TO_PREV,
+        precision: int = 8
+    ):
+        """
+        Creates a grid pyramid from the trajectories.
+
+        The level 0 is a grid with cells of cell_size and each other level
+        merges 2 x 2 cells of the level below it. The number of points,
+        the distinct ids and the speeds of each occupied cell are aggregated
+        once in level 0 and rolled up to the other levels. The distinct ids
+        are estimated with HyperLogLog registers.
+
+        Parameters
+        ----------
+        data : DataFrame
+            Dataframe containing the trajectories
+        cell_size : float
+            Represents the cell size of level 0
+        levels : int, optional
+            Represents the number of levels, by default 4
+        meters_by_degree : float, optional
+            Represents the corresponding meters of lat by degree,
+                by default lat_meters(-3.71839)
+        label_id : str, optional
+            Represents the label of the id column, by default TRAJ_ID
+        label_speed : str, optional
+            Represents the label of the speed column, by default SPEED_TO_PREV,
+            without mean speeds if it is not in data
+        precision : int, optional
+            Represents the number of bits indexing the HyperLogLog registers,
+            with a relative error of about 1.04 / sqrt(2 ** precision), by default 8
+
+        Raises
+        ------
+        ValueError
+            If levels is not positive or precision is not between 4 and 16
+        """
+        if levels < 1:
+            raise ValueError('levels must be positive.')
+        if not 4 <= precision <= 16:
+            raise ValueError('precision must be between 4 and 16.')
+        operation = begin_operation('GridPyramid')
+
+        self.grid = Grid(data, cell_size, meters_by_degree)
+        self.levels = levels
+        self.precision = precision
+
+        lat_, lon_ = self.grid.point_to_index_grid(data[LATITUDE], data[LONGITUDE])
+        cells = (
+            np.asarray(lon_, dtype=np.int64) * self.grid.grid_size_lat_y
+            + np.asarray(lat_, dtype=np.int64)
+        )
+        cells, inverse = np.unique(cells, return_inverse=True)
+        if label_speed in data:
+            speeds = data[label_speed].to_numpy(dtype=np.float64)
+        else:
+            speeds = np.full(inverse.size, np.nan)
+        valid = ~np.isnan(speeds)
+
+        logger.debug('\nAggregating %s cells of level 0' % cells.size)
+        self._statistics = [{
+            INDEX_GRID: cells,
+            COUNT: np.bincount(inverse, minlength=cells.size),
+            'speed_sum': np.bincount(
+                inverse[valid], speeds[valid], minlength=cells.size
+            ),
+            'speed_count': np.bincount(inverse[valid], minlength=cells.size),
+            'registers': _hll_registers(
+                inverse, cells.size, data[label_id].to_numpy(), precision
+            ),
+        }]
+        for level in range(1, levels):
+            self._statistics.append(self._roll_up(level))
+        logger.debug(
+            '...cells by level: %s'
+            % [statistics[INDEX_GRID].size for statistics in self._statistics]
+        )
+        self.last_operation = end_operation(operation)
+
+    def _roll_up(self, level: int) -> dict:
+        """Returns the statistics of a level aggregated from the level below."""
+        finer = self._statistics[level - 1]
+        size_lat = self.get_level_grid(level - 1).grid_size_lat_y
+        lat_ = finer[INDEX_GRID] % size_lat // 2
+        lon_ = finer[INDEX_GRID] // size_lat // 2
+        parents = lon_ * self.get_level_grid(level).grid_size_lat_y + lat_
+
+        order = np.argsort(parents, kind='stable')
+        parents = parents[order]
+        starts = np.flatnonzero(np.r_[True, parents[1:] != parents[:-1]])
+        statistics = {INDEX_GRID: parents[starts]}
+        for key in [COUNT, 'speed_sum', 'speed_count']:
+            statistics[key] = np.add.reduceat(finer[key][order], starts)
+        statistics['registers'] = np.maximum.reduceat(
+            finer['registers'][order], starts, axis=0
+        )
+        return statistics
+
+    def get_level_grid(self, level: int) -> Grid:
+        """
+        Returns the grid of a level.
+
+        The occupied cells of the level are stored in its `grid_cells` key.
+
+        Parameters
+        ----------
+        level : int
+            Represents the level of the pyramid
+
+        Returns
+        -------
+        Grid
+            Grid object containing informations about the level grid
+        """
+        scale = 1 << level
+        grid = Grid(data={
+            'lon_min_x': self.grid.lon_min_x,
+            'lat_min_y': self.grid.lat_min_y,
+            'grid_size_lat_y': -(-self.grid.grid_size_lat_y // scale),
+            'grid_size_lon_x': -(-self.grid.grid_size_lon_x // scale),
+            'cell_size_by_degree': self.grid.cell_size_by_degree * scale,
+        })
+        if level < len(self._statistics):
+            grid.grid_cells = self._statistics[level][INDEX_GRID]
+        return grid
+
+    def get_level_statistics(
+        self, level: int = 0, bbox: tuple[float, float, float, float] | None = None
+    ) -> DataFrame:
+        """
+        Returns the statistics of the occupied cells of a level.
+
+        Parameters
+        ----------
+        level : int, optional
+            Represents the level of the pyramid, by default 0
+        bbox : tuple(float, float, float, float), optional
+            Represents the lat_min, lon_min, lat_max and lon_max of the
+            cells returned, by default None, returning all cells
+
+        Returns
+        -------
+        DataFrame
+            Represents the index of each cell, the number of points in it,
+            the estimated number of distinct ids and the mean speed
+
+        Raises
+        ------
+        ValueError
+            If the level is not in the pyramid
+        """
+        if not 0 <= level < self.levels:
+            raise ValueError(f'level must be between 0 and {self.levels - 1}.')
+        statistics = self._statistics[level]
+        size_lat = self.get_level_grid(level).grid_size_lat_y
+        cells = statistics[INDEX_GRID]
+        lat_, lon_ = cells % size_lat, cells // size_lat
+
+        selected = np.ones(cells.size, dtype=bool)
+        if bbox is not None:
+            lat_min, lon_min = self.get_level_grid(level).point_to_index_grid(
+                bbox[0], bbox[1]
+            )
+            lat_max, lon_max = self.get_level_grid(level).point_to_index_grid(
+                bbox[2], bbox[3]
+            )
+            selected = (
+                (lat_ >= lat_min) & (lat_ <= lat_max)
+                & (lon_ >= lon_min) & (lon_ <= lon_max)
+            )
+
+        speed_count = statistics['speed_count'][selected]
+        return DataFrame({
+            INDEX_GRID: cells[selected],
+            INDEX_GRID_LAT: lat_[selected],
+            INDEX_GRID_LON: lon_[selected],
+            COUNT: statistics[COUNT][selected],
+            DISTINCT_IDS: _hll_estimate(statistics['registers'][selected]),
+            MEAN_SPEED: np.divide(
+                statistics['speed_sum'][selected],
+                speed_count,
+                out=np.full(speed_count.size, np.nan),
+                where=speed_count > 0
+            ),
+        })
+
+    def __repr__(self) -> str:
+        """
+        String representation of grid pyramid.
+
+        Returns
+        -------
+        str
+            levels: number of levels
+            the level 0 grid
+        """
+        return f'levels: {self.levels}\n{self.grid}'
@@ -142,6 +142,14 @@ class MoveDataFrameAbstractModel(abc.ABC):
     def generate_speed_features(self):
         pass
 
+    @abc.abstractmethod
+    def get_last_points(self):
+        pass
+
+    @abc.abstractmethod
+    def append_dist_time_speed_features(self):
+        pass
+
     @abc.abstractmethod
     def generate_move_and_stop_by_radius(self):
         pass
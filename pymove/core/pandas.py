@@ -4,7 +4,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Callable
 
 import numpy as np
-from pandas import DataFrame, DateOffset, Series, Timedelta
+from numpy import ndarray
+from pandas import DataFrame, DateOffset, Series, Timedelta, concat, factorize
 
 from pymove.core.dataframe import MoveDataFrame
 from pymove.core.grid import Grid
@@ -805,12 +806,140 @@ class PandasMoveDataFrame(DataFrame):
 
         return ids, size_id, idx
 
+    @staticmethod
+    def _group_boundaries(ids: Any) -> tuple[ndarray, ndarray, ndarray]:
+        """
+        Computes a stable ordering of the rows grouped by trajectory id.
+
+        Parameters
+        ----------
+        ids : array-like
+            Trajectory id of each row.
+
+        Returns
+        -------
+        Tuple[ndarray, ndarray, ndarray]
+            positions that group the rows by id, keeping the original
+            order inside each id.
+            mask of the first point of each id in the grouped order.
+            mask of the last point of each id in the grouped order.
+
+        """
+        codes, _ = factorize(ids)
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+
+        first = np.ones(codes.size, dtype=np.bool_)
+        last = np.ones(codes.size, dtype=np.bool_)
+        changed = codes[1:] != codes[:-1]
+        first[1:] = changed
+        last[:-1] = changed
+
+        return order, first, last
+
+    @staticmethod
+    def _generate_dist_time_speed(
+        data: DataFrame, columns: list[str], label_dtype: type = np.float64
+    ):
+        """
+        Computes distance, time and speed features in a single pass.
+
+        The rows are grouped by the dataframe index, which must hold the
+        trajectory ids, and only the requested features and the ones they
+        depend on are computed.
+
+        Parameters
+        ----------
+        data : DataFrame
+            Dataframe indexed by trajectory id.
+        columns : list of str
+            Features to create or update, any of the distance, time
+            and speed to prev, to next and prev to next labels.
+        label_dtype : type, optional
+            Represents column id type, by default np.float64
+
+        Raises
+        ------
+        ValueError
+            If any of the columns is not a distance, time or speed feature
+
+        """
+        distances = {
+            DIST_TO_PREV: ('prev', 'curr'),
+            DIST_TO_NEXT: ('curr', 'next'),
+            DIST_PREV_TO_NEXT: ('prev', 'next'),
+        }
+        times = {
+            TIME_TO_PREV: ('prev', 'curr'),
+            TIME_TO_NEXT: ('curr', 'next'),
+            TIME_PREV_TO_NEXT: ('prev', 'next'),
+        }
+        speeds = {
+            SPEED_TO_PREV: ([DIST_TO_PREV], TIME_TO_PREV),
+            SPEED_TO_NEXT: ([DIST_TO_NEXT], TIME_TO_NEXT),
+            SPEED_PREV_TO_NEXT: ([DIST_TO_PREV, DIST_TO_NEXT], TIME_PREV_TO_NEXT),
+        }
+        unknown = [
+            c for c in columns if c not in {**distances, **times, **speeds}
+        ]
+        if unknown:
+            raise ValueError(f'Unknown features {unknown}')
+
+        required = set(columns)
+        for column in required & speeds.keys():
+            dists, time_label = speeds[column]
+            required.update(dists + [time_label])
+
+        order, first, last = PandasMoveDataFrame._group_boundaries(data.index)
+        single = first & last
+        features: dict[str, ndarray] = {}
+
+        def _neighbours(values: ndarray) -> dict[str, ndarray]:
+            prev_, next_ = shift(values, 1), shift(values, -1)
+            prev_[first], next_[last] = np.nan, np.nan
+            return {'prev': prev_, 'curr': values, 'next': next_}
+
+        if required & distances.keys():
+            lat = _neighbours(data[LATITUDE].values[order])
+            lon = _neighbours(data[LONGITUDE].values[order])
+            for label in required & distances.keys():
+                start, end = distances[label]
+                features[label] = np.asarray(haversine(
+                    lat[start], lon[start], lat[end], lon[end]
+                ))
+
+        if required & times.keys():
+            time_ = _neighbours(data[DATETIME].values[order].astype(label_dtype))
+            for label in required & times.keys():
+                start, end = times[label]
+                features[label] = (time_[end] - time_[start]) * (10 ** -9)
+
+        for label in features:
+            features[label] = features[label].astype(label_dtype, copy=False)
+            # trajectories with a single point keep the default value
+            if label not in [DIST_TO_PREV, TIME_TO_PREV]:
+                features[label][single] = label_dtype(-1.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for label in required & speeds.keys():
+                dists, time_label = speeds[label]
+                features[label] = (
+                    sum(features[d] for d in dists) / features[time_label]
+                )  # unit: m/srs
+
+        for label in columns:
+            feature: ndarray = np.empty(order.size, dtype=label_dtype)
+            feature[order] = features[label]
+            data[label] = feature
+
     def generate_dist_time_speed_features(
         self,
         label_id: str = TRAJ_ID,
-        label_dtype: Callable = np.float64,
+        label_dtype: type = np.float64,
         sort: bool = True,
-        inplace: bool = True
+        inplace: bool = True,
+        engine: str = 'vectorized',
+        columns: list[str] | None = None
     ) -> 'PandasMoveDataFrame' | None:
         """
         Adds distance, time and speed information to the dataframe.
@@ -823,19 +952,33 @@ class PandasMoveDataFrame(DataFrame):
         ----------
         label_id : str, optional
             Represents name of column of trajectories id, by default TRAJ_ID
-        label_dtype : callable, optional
+        label_dtype : type, optional
             Represents column id type, by default np.float64
         sort : bool, optional
             If sort == True the dataframe will be sorted, by True
         inplace : bool, optional
             Represents whether the operation will be performed on
             the data provided or in a copy, by default True
+        engine : str, optional
+            Strategy used to compute the features, by default 'vectorized'
+            'vectorized' computes all trajectories in a single pass
+            over the columns, masking the points where the id changes.
+            'loop' computes the features iterating over each id.
+        columns : list of str, optional
+            Features to create with the vectorized engine, any of the
+            nine distance, time and speed features, by default
+            [DIST_TO_PREV, TIME_TO_PREV, SPEED_TO_PREV]
 
         Returns
         -------
         PandasMoveDataFrame
             Object with new features or None
 
+        Raises
+        ------
+        ValueError
+            If the engine is unknown or the loop engine receives columns
+
         Examples
         --------
         - dist_to_prev =  248.33 meters, dist_to_prev 536.57 meters
@@ -843,6 +986,11 @@ class PandasMoveDataFrame(DataFrame):
         - speed_to_prev = 4.13 m/srs, speed_prev = 8.94 m/srs.
 
         """
+        if engine not in ['vectorized', 'loop']:
+            raise ValueError('Unknown engine. Use vectorized or loop')
+        if engine == 'loop' and columns is not None:
+            raise ValueError('Columns are only supported by the vectorized engine')
+
         operation = begin_operation('generate_dist_time_speed_features')
         if not inplace:
             data = self.copy()
@@ -858,43 +1006,48 @@ class PandasMoveDataFrame(DataFrame):
             message
         )
 
-        # create new feature to distance
-        data[DIST_TO_PREV] = label_dtype(-1.0)
+        if engine == 'vectorized':
+            if columns is None:
+                columns = [DIST_TO_PREV, TIME_TO_PREV, SPEED_TO_PREV]
+            self._generate_dist_time_speed(data, columns, label_dtype)
+        else:
+            # create new feature to distance
+            data[DIST_TO_PREV] = label_dtype(-1.0)
 
-        # create new feature to time
-        data[TIME_TO_PREV] = label_dtype(-1.0)
+            # create new feature to time
+            data[TIME_TO_PREV] = label_dtype(-1.0)
 
-        # create new feature to speed
-        data[SPEED_TO_PREV] = label_dtype(-1.0)
+            # create new feature to speed
+            data[SPEED_TO_PREV] = label_dtype(-1.0)
 
-        for idx in progress_bar(
-            ids, desc='Generating distance, time and speed features'
-        ):
-            curr_lat = data.at[idx, LATITUDE]
-            curr_lon = data.at[idx, LONGITUDE]
+            for idx in progress_bar(
+                ids, desc='Generating distance, time and speed features'
+            ):
+                curr_lat = data.at[idx, LATITUDE]
+                curr_lon = data.at[idx, LONGITUDE]
 
-            size_id = curr_lat.size
+                size_id = curr_lat.size
 
-            if size_id <= 1:
-                data.at[idx, DIST_TO_PREV] = np.nan
-                data.at[idx, TIME_TO_PREV] = np.nan
-                data.at[idx, SPEED_TO_PREV] = np.nan
-            else:
-                prev_lat = shift(curr_lat, 1)
-                prev_lon = shift(curr_lon, 1)
-                # compute distance from previous to current point
-                data.at[idx, DIST_TO_PREV] = haversine(
-                    prev_lat, prev_lon, curr_lat, curr_lon
-                )
+                if size_id <= 1:
+                    data.at[idx, DIST_TO_PREV] = np.nan
+                    data.at[idx, TIME_TO_PREV] = np.nan
+                    data.at[idx, SPEED_TO_PREV] = np.nan
+                else:
+                    prev_lat = shift(curr_lat, 1)
+                    prev_lon = shift(curr_lon, 1)
+                    # compute distance from previous to current point
+                    data.at[idx, DIST_TO_PREV] = haversine(
+                        prev_lat, prev_lon, curr_lat, curr_lon
+                    )
 
-                time_ = data.at[idx, DATETIME].values.astype(label_dtype)
-                time_prev = (time_ - shift(time_, 1)) * (10 ** -9)
-                data.at[idx, TIME_TO_PREV] = time_prev
+                    time_ = data.at[idx, DATETIME].values.astype(label_dtype)
+                    time_prev = (time_ - shift(time_, 1)) * (10 ** -9)
+                    data.at[idx, TIME_TO_PREV] = time_prev
 
-                # set speed features
-                data.at[idx, SPEED_TO_PREV] = (
-                    data.at[idx, DIST_TO_PREV] / time_prev
-                )  # unit: m/srs
+                    # set speed features
+                    data.at[idx, SPEED_TO_PREV] = (
+                        data.at[idx, DIST_TO_PREV] / time_prev
+                    )  # unit: m/srs
 
         data.reset_index(inplace=True)
         data.last_operation = end_operation(operation)
@@ -904,7 +1057,7 @@ class PandasMoveDataFrame(DataFrame):
     def generate_dist_features(
         self,
         label_id: str = TRAJ_ID,
-        label_dtype: Callable = np.float64,
+        label_dtype: type = np.float64,
         sort: bool = True,
         inplace: bool = True
     ) -> 'PandasMoveDataFrame' | None:
@@ -915,7 +1068,7 @@ class PandasMoveDataFrame(DataFrame):
         ----------
         label_id : str, optional
             Represents name of column of trajectories id, by default TRAJ_ID
-        label_dtype : callable, optional
+        label_dtype : type, optional
             Represents column id type, by default np.float64
         sort : bool, optional
             If sort == True the dataframe will be sorted, by True
@@ -941,48 +1094,13 @@ class PandasMoveDataFrame(DataFrame):
         else:
             data = self
 
-        ids, size_id, idx = self._prepare_generate_data(
-            data, sort, label_id
-        )
+        self._prepare_generate_data(data, sort, label_id)
 
         logger.debug('\nCreating or updating distance features in meters...\n')
 
-        # create ou update columns
-        data[DIST_TO_PREV] = label_dtype(-1.0)
-        data[DIST_TO_NEXT] = label_dtype(-1.0)
-        data[DIST_PREV_TO_NEXT] = label_dtype(-1.0)
-
-        for idx in progress_bar(ids, desc='Generating distance features'):
-            curr_lat = data.at[idx, LATITUDE]
-            curr_lon = data.at[idx, LONGITUDE]
-
-            size_id = curr_lat.size
-
-            if size_id <= 1:
-                data.at[idx, DIST_TO_PREV] = np.nan
-
-            else:
-                prev_lat = shift(curr_lat, 1)
-                prev_lon = shift(curr_lon, 1)
-                # compute distance from previous to current point
-                data.at[idx, DIST_TO_PREV] = haversine(
-                    prev_lat, prev_lon, curr_lat, curr_lon
-                )
-
-                next_lat = shift(curr_lat, -1)
-                next_lon = shift(curr_lon, -1)
-                # compute distance to next point
-                data.at[idx, DIST_TO_NEXT] = haversine(
-                    curr_lat, curr_lon, next_lat, next_lon
-                )
-
-                # using pandas shift in a large dataset: 7min 21s
-                # using numpy shift above: 33.6 srs
-
-                # use distance from previous to next
-                data.at[idx, DIST_PREV_TO_NEXT] = haversine(
-                    prev_lat, prev_lon, next_lat, next_lon
-                )
+        self._generate_dist_time_speed(
+            data, [DIST_TO_PREV, DIST_TO_NEXT, DIST_PREV_TO_NEXT], label_dtype
+        )
 
         data.reset_index(inplace=True)
         data.last_operation = end_operation(operation)
@@ -992,7 +1110,7 @@ class PandasMoveDataFrame(DataFrame):
     def generate_time_features(
         self,
         label_id: str = TRAJ_ID,
-        label_dtype: Callable = np.float64,
+        label_dtype: type = np.float64,
         sort: bool = True,
         inplace: bool = True
     ) -> 'PandasMoveDataFrame' | None:
@@ -1003,7 +1121,7 @@ class PandasMoveDataFrame(DataFrame):
         ----------
         label_id : str, optional
             Represents name of column of trajectories id, by default TRAJ_ID
-        label_dtype : callable, optional
+        label_dtype : type, optional
             Represents column id type, by default np.float64
         sort : bool, optional
             If sort == True the dataframe will be sorted, by True
@@ -1029,39 +1147,15 @@ class PandasMoveDataFrame(DataFrame):
         else:
             data = self
 
-        ids, size_id, idx = self._prepare_generate_data(
-            data, sort, label_id
-        )
+        self._prepare_generate_data(data, sort, label_id)
 
         logger.debug(
             '\nCreating or updating time features seconds\n'
         )
 
-        # create new feature to time
-        data[TIME_TO_PREV] = label_dtype(-1.0)
-        data[TIME_TO_NEXT] = label_dtype(-1.0)
-        data[TIME_PREV_TO_NEXT] = label_dtype(-1.0)
-
-        for idx in progress_bar(
-            ids, desc='Generating time features'
-        ):
-            curr_time = data.at[idx, DATETIME].values.astype(label_dtype)
-
-            size_id = curr_time.size
-
-            if size_id <= 1:
-                data.at[idx, TIME_TO_PREV] = np.nan
-            else:
-                prev_time = shift(curr_time, 1)
-                time_prev = (curr_time - prev_time) * (10 ** -9)
-                data.at[idx, TIME_TO_PREV] = time_prev
-
-                next_time = shift(curr_time, -1)
-                time_prev = (next_time - curr_time) * (10 ** -9)
-                data.at[idx, TIME_TO_NEXT] = time_prev
-
-                time_prev_to_next = (next_time - prev_time) * (10 ** -9)
-                data.at[idx, TIME_PREV_TO_NEXT] = time_prev_to_next
+        self._generate_dist_time_speed(
+            data, [TIME_TO_PREV, TIME_TO_NEXT, TIME_PREV_TO_NEXT], label_dtype
+        )
 
         data.reset_index(inplace=True)
         data.last_operation = end_operation(operation)
@@ -1071,7 +1165,7 @@ class PandasMoveDataFrame(DataFrame):
     def generate_speed_features(
         self,
         label_id: str = TRAJ_ID,
-        label_dtype: Callable = np.float64,
+        label_dtype: type = np.float64,
         sort: bool = True,
         inplace: bool = True
     ) -> 'PandasMoveDataFrame' | None:
@@ -1082,7 +1176,7 @@ class PandasMoveDataFrame(DataFrame):
         ----------
         label_id : str, optional
             Represents name of column of trajectories id, by default TRAJ_ID
-        label_dtype : callable, optional
+        label_dtype : type, optional
             Represents column id type, by default np.float64
         sort : bool, optional
             If sort == True the dataframe will be sorted, by True
@@ -1095,11 +1189,6 @@ class PandasMoveDataFrame(DataFrame):
         PandasMoveDataFrame
             Object with new features or None
 
-        Raises
-        ------
-        ValueError
-            If feature generation fails
-
         Examples
         --------
         - P to P.next = 1 meter/seconds
@@ -1117,30 +1206,195 @@ class PandasMoveDataFrame(DataFrame):
             '\nCreating or updating speed features meters by seconds\n'
         )
 
-        dists = data.generate_dist_features(
-            label_id, label_dtype, sort, inplace=False
-        )
-        times = data.generate_time_features(
-            label_id, label_dtype, sort, inplace=False
+        self._prepare_generate_data(data, sort, label_id)
+        self._generate_dist_time_speed(
+            data, [SPEED_TO_PREV, SPEED_TO_NEXT, SPEED_PREV_TO_NEXT], label_dtype
         )
+        data.reset_index(inplace=True)
+        data.last_operation = end_operation(operation)
 
-        if dists is None or times is None:
-            raise ValueError('Geretating dist or time feature failed')
+        if not inplace:
+            return data
 
-        data[SPEED_TO_PREV] = dists[DIST_TO_PREV] / times[TIME_TO_PREV]
-        data[SPEED_TO_NEXT] = dists[DIST_TO_NEXT] / times[TIME_TO_NEXT]
+    def get_last_points(self, label_id: str = TRAJ_ID) -> DataFrame:
+        """
+        Returns the last point of each trajectory.
 
-        d_prev_next = dists[DIST_TO_PREV] + dists[DIST_TO_NEXT]
-        data[SPEED_PREV_TO_NEXT] = d_prev_next / times[TIME_PREV_TO_NEXT]
+        The result is the state used by append_dist_time_speed_features
+        to compute the features of new points without the whole history.
 
-        self._prepare_generate_data(
-            data, sort, label_id
+        Parameters
+        ----------
+        label_id : str, optional
+            Represents name of column of trajectories id, by default TRAJ_ID
+
+        Returns
+        -------
+        DataFrame
+            Last lat, lon, datetime and tid, when present, of each id,
+            with the row position of the point in this dataframe.
+
+        """
+        columns = [LATITUDE, LONGITUDE, DATETIME]
+        if TID in self:
+            columns.append(TID)
+
+        positions = np.flatnonzero(~self[label_id].duplicated(keep='last').values)
+        last_points = DataFrame(self).iloc[positions][columns]
+        last_points.index = self[label_id].values[positions]
+        last_points.index.name = label_id
+        last_points['position'] = positions
+
+        return last_points
+
+    def append_dist_time_speed_features(
+        self,
+        batch: DataFrame,
+        last_points: DataFrame | None = None,
+        label_id: str = TRAJ_ID,
+        label_dtype: type = np.float64,
+        columns: list[str] | None = None
+    ) -> DataFrame:
+        """
+        Appends new points computing only their distance, time and speed.
+
+        The features of the batch are computed against the last point of
+        each trajectory stored in last_points, and the features to next of
+        the points that were previously the last ones are updated.
+        The dataframe is expected to contain the features of the points
+        already ingested, and the batch is appended to it.
+
+        Parameters
+        ----------
+        batch : DataFrame
+            New points, ordered by time inside each trajectory
+        last_points : DataFrame, optional
+            State returned by a previous call or by get_last_points,
+            by default None, computes the state from this dataframe
+        label_id : str, optional
+            Represents name of column of trajectories id, by default TRAJ_ID
+        label_dtype : type, optional
+            Represents column id type, by default np.float64
+        columns : list of str, optional
+            Features to create, any of the distance, time and speed to prev
+            and to next features, by default
+            [DIST_TO_PREV, TIME_TO_PREV, SPEED_TO_PREV]
+
+        Returns
+        -------
+        DataFrame
+            Updated last points of each trajectory
+
+        Raises
+        ------
+        ValueError
+            If any of the columns is not supported
+
+        Notes
+        -----
+        The state refers to row positions of this dataframe, so it remains
+        valid while the dataframe only grows by appending batches.
+
+        """
+        operation = begin_operation('append_dist_time_speed_features')
+        if columns is None:
+            columns = [DIST_TO_PREV, TIME_TO_PREV, SPEED_TO_PREV]
+        supported = [
+            DIST_TO_PREV, DIST_TO_NEXT, TIME_TO_PREV,
+            TIME_TO_NEXT, SPEED_TO_PREV, SPEED_TO_NEXT
+        ]
+        unknown = [c for c in columns if c not in supported]
+        if unknown:
+            raise ValueError(f'Unknown features {unknown}')
+
+        if last_points is None:
+            last_points = self.get_last_points(label_id)
+
+        batch = DataFrame(PandasMoveDataFrame(batch))
+        batch.index = np.arange(self.shape[0], self.shape[0] + batch.shape[0])
+
+        ids = batch[label_id].values
+        order, first, last = self._group_boundaries(ids)
+        sorted_ids = ids[order]
+        previous = last_points.reindex(sorted_ids[first])
+        known = previous['position'].notna().values
+
+        curr_lat = batch[LATITUDE].values[order]
+        curr_lon = batch[LONGITUDE].values[order]
+        curr_time = batch[DATETIME].values[order].astype(label_dtype)
+
+        prev_lat, prev_lon = shift(curr_lat, 1), shift(curr_lon, 1)
+        prev_time = shift(curr_time, 1)
+        prev_lat[first] = previous[LATITUDE].values
+        prev_lon[first] = previous[LONGITUDE].values
+        prev_time[first] = np.where(
+            known, previous[DATETIME].values.astype(label_dtype), np.nan
         )
-        data.reset_index(inplace=True)
-        data.last_operation = end_operation(operation)
 
-        if not inplace:
-            return data
+        next_lat, next_lon = shift(curr_lat, -1), shift(curr_lon, -1)
+        next_time = shift(curr_time, -1)
+        next_lat[last], next_lon[last], next_time[last] = np.nan, np.nan, np.nan
+
+        features = {
+            DIST_TO_PREV: haversine(prev_lat, prev_lon, curr_lat, curr_lon),
+            DIST_TO_NEXT: haversine(curr_lat, curr_lon, next_lat, next_lon),
+            TIME_TO_PREV: (curr_time - prev_time) * (10 ** -9),
+            TIME_TO_NEXT: (next_time - curr_time) * (10 ** -9),
+        }
+        # trajectories with a single point keep the default value
+        single = np.zeros(order.size, dtype=np.bool_)
+        single[first] = ~known
+        single &= last
+        for label in features:
+            features[label] = features[label].astype(label_dtype, copy=False)
+            if label in [DIST_TO_NEXT, TIME_TO_NEXT]:
+                features[label][single] = label_dtype(-1.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            features[SPEED_TO_PREV] = features[DIST_TO_PREV] / features[TIME_TO_PREV]
+            features[SPEED_TO_NEXT] = features[DIST_TO_NEXT] / features[TIME_TO_NEXT]
+
+        for label in columns:
+            feature: ndarray = np.empty(order.size, dtype=label_dtype)
+            feature[order] = features[label]
+            batch[label] = feature
+
+        # previous last points now have a next point
+        positions = previous['position'].values[known].astype(np.int64)
+        updates = {
+            DIST_TO_NEXT: DIST_TO_PREV,
+            TIME_TO_NEXT: TIME_TO_PREV,
+            SPEED_TO_NEXT: SPEED_TO_PREV,
+        }
+        for label, source in updates.items():
+            if label in columns and label in self:
+                self.iloc[positions, self.columns.get_loc(label)] = (
+                    features[source][first][known]
+                )
+
+        _append = concat([DataFrame(self), batch])
+        self._mgr = _append._mgr
+        self._item_cache = dict()
+
+        new_points = DataFrame(
+            {
+                LATITUDE: curr_lat[last],
+                LONGITUDE: curr_lon[last],
+                DATETIME: batch[DATETIME].values[order][last],
+            },
+            index=sorted_ids[last]
+        )
+        if TID in batch:
+            new_points[TID] = batch[TID].values[order][last]
+        new_points['position'] = batch.index.values[order][last]
+        new_points.index.name = label_id
+
+        last_points = concat([
+            last_points[~last_points.index.isin(new_points.index)], new_points
+        ])
+
+        self.last_operation = end_operation(operation)
+        return last_points
 
     def generate_move_and_stop_by_radius(
         self,
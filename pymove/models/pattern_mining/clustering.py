@@ -3,7 +3,8 @@ Clustering operations.
 
 elbow_method,
 gap_statistic,
-dbscan_clustering
+dbscan_clustering,
+dbscan_trajectory_clustering
 
 """
 from __future__ import annotations
@@ -11,7 +12,9 @@ from __future__ import annotations
 from typing import Callable
 
 import numpy as np
-from pandas import DataFrame
+from numpy import ndarray
+from pandas import DataFrame, Series
+from scipy.sparse import csr_matrix
 from sklearn.cluster import DBSCAN, KMeans
 
 from pymove.utils.constants import EARTH_RADIUS, LATITUDE, LONGITUDE, N_CLUSTER
@@ -208,3 +211,76 @@ def dbscan_clustering(
 
     if not inplace:
         return move_data
+
+
+@timer_decorator
+def dbscan_trajectory_clustering(
+    distances: ndarray,
+    ids: ndarray | None = None,
+    eps: float = 0.01,
+    min_samples: int = 5,
+    chunk_size: int = 1024
+) -> Series:
+    """
+    Performs density based clustering of trajectories from their distance matrix.
+
+    The matrix, like the one returned by
+    pymove.query.query.pairwise_trajectory_distances, is read in chunks of
+    rows and only the distances within eps are kept, so memory mapped
+    matrices larger than the memory can be clustered.
+
+    Parameters
+    ----------
+    distances : ndarray
+        square matrix with the distance between each pair of trajectories
+    ids : ndarray, optional
+        the trajectory id of each row of the matrix, by default None
+    eps : float, optional
+        maximum distance between two neighbor trajectories, by default 0.01
+    min_samples : int, optional
+        the minimum number of trajectories to consider a cluster, by default 5
+    chunk_size : int, optional
+        number of rows of the matrix read at a time, by default 1024
+
+    Returns
+    -------
+    Series
+        the cluster of each trajectory, -1 for noise, indexed by ids
+
+    Example
+    -------
+    >>> from pymove.models.pattern_mining.clustering import (
+    >>>     dbscan_trajectory_clustering
+    >>> )
+    >>> from pymove.query.query import pairwise_trajectory_distances
+    >>> dbscan_trajectory_clustering(
+    >>>     *pairwise_trajectory_distances(move_df), eps=0.5, min_samples=2
+    >>> )
+    1    0
+    2    0
+    3   -1
+    Name: n_cluster, dtype: int64
+    """
+    size = len(distances)
+    counts, columns, values = [], [], []
+    for start in progress_bar(
+        range(0, size, chunk_size), desc='Reading distances'
+    ):
+        chunk = np.asarray(distances[start:start + chunk_size])
+        row, column = np.nonzero(chunk <= eps)
+        value = chunk[row, column]
+        order = np.lexsort((value, row))
+        counts.append(np.bincount(row, minlength=len(chunk)))
+        columns.append(column[order])
+        values.append(value[order])
+
+    indptr = np.concatenate([[0], np.cumsum(np.concatenate(counts))])
+    graph = csr_matrix(
+        (np.concatenate(values), np.concatenate(columns), indptr),
+        shape=(size, size)
+    )
+    labels = DBSCAN(
+        eps=eps, min_samples=min_samples, metric='precomputed'
+    ).fit(graph).labels_
+
+    return Series(labels, index=ids, name=N_CLUSTER)
@@ -7,7 +7,7 @@ compress_segment_stop_to_point
 from __future__ import annotations
 
 import numpy as np
-from pandas import DataFrame
+from pandas import DataFrame, factorize
 
 from pymove.preprocessing.stay_point_detection import (
     create_or_update_move_stop_by_dist_time,
@@ -21,7 +21,7 @@ from pymove.utils.constants import (
     STOP,
     TRAJ_ID,
 )
-from pymove.utils.log import logger, progress_bar, timer_decorator
+from pymove.utils.log import logger, timer_decorator
 
 
 @timer_decorator
@@ -103,50 +103,63 @@ def compress_segment_stop_to_point(
     logger.debug('...setting mean to lat and lon...')
     lat_mean = np.full(move_data.shape[0], -1.0, dtype=np.float64)
     lon_mean = np.full(move_data.shape[0], -1.0, dtype=np.float64)
+    stops = move_data[label_stop].to_numpy(dtype=bool)
 
     if drop_moves is False:
-        lat_mean[move_data[~move_data[label_stop]].index] = np.NaN
-        lon_mean[move_data[~move_data[label_stop]].index] = np.NaN
+        lat_mean[~stops] = np.NaN
+        lon_mean[~stops] = np.NaN
     else:
         logger.debug('...move segments will be dropped...')
 
     logger.debug('...get only segments stop...')
-    segments = move_data[move_data[label_stop]][label_segment].unique()
-
-    for idx in progress_bar(
-        segments, desc=f'Generating {label_segment} and {label_stop}'
-    ):
-        filter_ = move_data[label_segment] == idx
-
-        size_id = move_data[filter_].shape[0]
-        # verify if filter is None
-        if size_id > 1:
-            # get first and last point of each stop segment
-            ind_start = move_data[filter_].iloc[[0]].index
-            ind_end = move_data[filter_].iloc[[-1]].index
-
-            if point_mean == 'default':
-                p = (
-                    move_data[filter_]
-                    .groupby([LATITUDE, LONGITUDE], as_index=False)
-                    .agg({'id': 'count'})
-                    .sort_values(['id'])
-                    .tail(1)
-                )
-                lat_mean[ind_start] = p.iloc[0, 0]
-                lon_mean[ind_start] = p.iloc[0, 1]
-                lat_mean[ind_end] = p.iloc[0, 0]
-                lon_mean[ind_end] = p.iloc[0, 1]
-
-            elif point_mean == 'centroid':
-                # set lat and lon mean to first_point
-                # and last points to each segment
-                lat_mean[ind_start] = move_data.loc[filter_][LATITUDE].mean()
-                lon_mean[ind_start] = move_data.loc[filter_][LONGITUDE].mean()
-                lat_mean[ind_end] = move_data.loc[filter_][LATITUDE].mean()
-                lon_mean[ind_end] = move_data.loc[filter_][LONGITUDE].mean()
-        else:
-            logger.debug(f'There are segments with only one point: {idx}')
+    codes, uniques = factorize(move_data[label_segment])
+    grouped = codes >= 0
+    sizes = np.bincount(codes[grouped], minlength=len(uniques))
+    has_stop = np.zeros(len(uniques), dtype=bool)
+    has_stop[codes[stops & grouped]] = True
+    logger.debug(
+        'There are %s stop segments with only one point'
+        % np.count_nonzero(has_stop & (sizes == 1))
+    )
+
+    # get first and last point of each stop segment
+    in_segments = np.zeros(codes.size, dtype=bool)
+    in_segments[grouped] = (has_stop & (sizes > 1))[codes[grouped]]
+    positions = np.flatnonzero(in_segments)
+    segments = codes[positions]
+    order = np.argsort(segments, kind='stable')
+    segments = segments[order]
+    positions = positions[order]
+    first = np.ones(segments.size, dtype=bool)
+    first[1:] = segments[1:] != segments[:-1]
+    last = np.ones(segments.size, dtype=bool)
+    last[:-1] = first[1:]
+
+    points = DataFrame({
+        label_segment: segments,
+        LATITUDE: move_data[LATITUDE].to_numpy()[positions],
+        LONGITUDE: move_data[LONGITUDE].to_numpy()[positions],
+    })
+    if point_mean == 'default':
+        # the point that repeats the most, the greatest lat and lon on ties
+        counts = points.groupby(
+            [label_segment, LATITUDE, LONGITUDE], dropna=False
+        ).size()
+        means = (
+            counts.sort_values(kind='mergesort')
+            .groupby(level=0).tail(1)
+            .sort_index()
+            .index.to_frame(index=False)
+        )
+    elif point_mean == 'centroid':
+        means = points.groupby(label_segment, as_index=False).mean()
+    else:
+        means = None
+
+    if means is not None:
+        for ends in [first, last]:
+            lat_mean[positions[ends]] = means[LATITUDE].to_numpy()
+            lon_mean[positions[ends]] = means[LONGITUDE].to_numpy()
 
     move_data[LAT_MEAN] = lat_mean
     move_data[LON_MEAN] = lon_mean
@@ -22,26 +22,41 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Callable
 
 import numpy as np
-from pandas import DataFrame
+from numpy import ndarray
+from pandas import DataFrame, factorize
 
 from pymove.semantic.semantic import outliers
 from pymove.utils.constants import (
     DATETIME,
+    DIST_PREV_TO_NEXT,
+    DIST_TO_NEXT,
     DIST_TO_PREV,
+    DROPS_BY_ROUND,
     LATITUDE,
     LONGITUDE,
     OUTLIER,
+    SPEED_PREV_TO_NEXT,
+    SPEED_TO_NEXT,
     SPEED_TO_PREV,
     TID,
+    TIME_PREV_TO_NEXT,
+    TIME_TO_NEXT,
     TIME_TO_PREV,
     TRAJ_ID,
 )
+from pymove.utils.distances import haversine
 from pymove.utils.log import logger
 
 if TYPE_CHECKING:
     from pymove.core.dask import DaskMoveDataFrame
     from pymove.core.pandas import PandasMoveDataFrame
 
+_POINT_FEATURES = [
+    DIST_TO_PREV, DIST_TO_NEXT, DIST_PREV_TO_NEXT,
+    TIME_TO_PREV, TIME_TO_NEXT, TIME_PREV_TO_NEXT,
+    SPEED_TO_PREV, SPEED_TO_NEXT, SPEED_PREV_TO_NEXT,
+]
+
 
 def get_bbox_by_radius(
     coordinates: tuple[float, float], radius: float = 1000
@@ -333,108 +348,192 @@ def clean_consecutive_duplicates(
     return move_data.drop(index=move_data[~filter_].index, inplace=inplace)
 
 
-def _filter_single_by_max(move_data: DataFrame, **kwargs):
+def _filter_single_by_max(
+    move_data: DataFrame, previous: DataFrame, **kwargs
+) -> ndarray:
     """
     Filters from a dataframe rows with features below value.
 
     Parameters
     ----------
     move_data : dataframe
-        Dataframe to be filtered.
+        Features of the points to be tested.
+    previous : dataframe
+        Features of the row before each point.
     **kwargs : arguments
         - arg1 : feature
         - arg2 : value
 
     Returns
     -------
-    DataFrame
-        Filtered dataframe.
+    ndarray
+        Points to be dropped.
 
     """
-    return move_data[move_data[kwargs['arg1']] <= kwargs['arg2']]
+    return (move_data[kwargs['arg1']] <= kwargs['arg2']).to_numpy()
 
 
-def _filter_speed_max_radius(move_data: DataFrame, **kwargs):
+def _filter_speed_max_radius(
+    move_data: DataFrame, previous: DataFrame, **kwargs
+) -> ndarray:
     """
     Filters from a dataframe rows with current or previous row features exceeding value.
 
     Parameters
     ----------
     move_data : dataframe
-        Dataframe to be filtered.
+        Features of the points to be tested.
+    previous : dataframe
+        Features of the row before each point.
     **kwargs : arguments
         - arg1 : feature
         - arg2 : value
 
     Returns
     -------
-    DataFrame
-        Filtered dataframe.
+    ndarray
+        Points to be dropped.
 
     """
-    filter_ = (
-        (np.nan_to_num(move_data[kwargs['arg1']].shift(1)) > kwargs['arg2'])
-        | (np.nan_to_num(move_data[kwargs['arg1']]) > kwargs['arg2'])
+    return (
+        (np.nan_to_num(previous[kwargs['arg1']].to_numpy()) > kwargs['arg2'])
+        | (np.nan_to_num(move_data[kwargs['arg1']].to_numpy()) > kwargs['arg2'])
     )
-    return move_data[filter_]
 
 
-def _filter_data(move_data: DataFrame, f: Callable, kwargs: dict):
+def _filter_outliers(
+    move_data: DataFrame, previous: DataFrame, **kwargs
+) -> ndarray:
     """
-    Filter the dataframe using condition from given function.
+    Filters from a dataframe rows detected as outliers.
 
     Parameters
     ----------
     move_data : dataframe
-        Dataframe to be filtered.
-    f : function
-        Filtering function
+        Features of the points to be tested.
+    previous : dataframe
+        Features of the row before each point.
     **kwargs : arguments
-        - arg1 : feature
-        - arg2 : value
-        - outliers : special behavior if cleaning by outliers
+        - arg1 : jump coefficient
+        - arg2 : threshold
 
     Returns
     -------
-    dataframe
-        Filtered dataframe.
-    int
-        Number of rows to be dropped
+    ndarray
+        Points to be dropped.
 
     """
-    if kwargs['outliers']:
-        filter_data_points = f(
-            move_data,
-            jump_coefficient=kwargs['arg1'],
-            threshold=kwargs['arg2'],
-            inplace=False
-        )
-        filter_data_points = filter_data_points[filter_data_points[OUTLIER]]
-    else:
-        filter_data_points = f(
-            move_data,
-            arg1=kwargs['arg1'],
-            arg2=kwargs['arg2'],
-            inplace=False
+    return outliers(
+        move_data,
+        jump_coefficient=kwargs['arg1'],
+        threshold=kwargs['arg2'],
+        inplace=False
+    )[OUTLIER].to_numpy()
+
+
+def _alive_neighbours(alive: ndarray, positions: ndarray) -> tuple[ndarray, ndarray]:
+    """
+    Finds the closest alive positions before and after each position.
+
+    Parameters
+    ----------
+    alive : ndarray
+        Mask of the positions not dropped.
+    positions : ndarray
+        Positions to look around.
+
+    Returns
+    -------
+    ndarray, ndarray
+        Previous and next alive positions, -1 where there is none.
+
+    """
+    alive_positions = np.append(np.flatnonzero(alive), -1)
+    before = np.searchsorted(alive_positions[:-1], positions) - 1
+    after = np.searchsorted(alive_positions[:-1], positions, side='right')
+    return alive_positions[before], alive_positions[after]
+
+
+def _point_features(
+    points: dict[str, ndarray], positions: ndarray, prev_: ndarray, next_: ndarray
+) -> dict[str, ndarray]:
+    """
+    Computes the distance, time and speed features of some points.
+
+    Parameters
+    ----------
+    points : dict
+        Latitude, longitude and time in nanoseconds of all points.
+    positions : ndarray
+        Positions of the points.
+    prev_ : ndarray
+        Position of the previous point of the trajectory, -1 where there is none.
+    next_ : ndarray
+        Position of the next point of the trajectory, -1 where there is none.
+
+    Returns
+    -------
+    dict
+        Features of the points, computed as generate_dist_time_speed_features.
+
+    """
+    def _neighbours(values: ndarray) -> dict[str, ndarray]:
+        return {
+            'prev': np.where(prev_ >= 0, values[prev_], np.nan),
+            'curr': values[positions],
+            'next': np.where(next_ >= 0, values[next_], np.nan),
+        }
+
+    lat = _neighbours(points[LATITUDE])
+    lon = _neighbours(points[LONGITUDE])
+    time_ = _neighbours(points[DATETIME])
+    features = {}
+    for dist, time_label, (start, end) in [
+        (DIST_TO_PREV, TIME_TO_PREV, ('prev', 'curr')),
+        (DIST_TO_NEXT, TIME_TO_NEXT, ('curr', 'next')),
+        (DIST_PREV_TO_NEXT, TIME_PREV_TO_NEXT, ('prev', 'next')),
+    ]:
+        features[dist] = np.asarray(
+            haversine(lat[start], lon[start], lat[end], lon[end])
         )
-    rows_to_drop = filter_data_points.shape[0]
-    return filter_data_points, rows_to_drop
+        features[time_label] = (time_[end] - time_[start]) * (10 ** -9)
+
+    single = (prev_ < 0) & (next_ < 0)
+    for label in [DIST_TO_NEXT, DIST_PREV_TO_NEXT, TIME_TO_NEXT, TIME_PREV_TO_NEXT]:
+        features[label][single] = -1.0
 
+    with np.errstate(divide='ignore', invalid='ignore'):
+        features[SPEED_TO_PREV] = features[DIST_TO_PREV] / features[TIME_TO_PREV]
+        features[SPEED_TO_NEXT] = features[DIST_TO_NEXT] / features[TIME_TO_NEXT]
+        features[SPEED_PREV_TO_NEXT] = (
+            features[DIST_TO_PREV] + features[DIST_TO_NEXT]
+        ) / features[TIME_PREV_TO_NEXT]
+    return features
 
-def _clean_gps(move_data: DataFrame, f: Callable, **kwargs):
+
+def _clean_gps(move_data: DataFrame, f: Callable, label_id: str = TRAJ_ID, **kwargs):
     """
     Cleans gps points from a dataframe using condition from given function.
 
+    Points are dropped in rounds until no point satisfies the condition.
+    After each round the distance, time and speed features are updated only
+    at the neighbours of the dropped points, and only the points whose
+    features changed are tested again.
+    The number of points dropped in each round is stored in the attrs
+    of the dataframe, under DROPS_BY_ROUND.
+
     Parameters
     ----------
     move_data : dataframe
         Dataframe to be filtered.
     f : function
-        Filtering function
+        Filtering function, receiving the features of the points to be
+        tested and of the rows before them
+    label_id : str, optional
+         Indicates the label of the id column in the user dataframe, by default TRAJ_ID
     **kwargs : arguments
         - arg1 : feature
         - arg2 : value
-        - outliers : special behavior if cleaning by outliers
 
     Returns
     -------
@@ -446,22 +545,76 @@ def _clean_gps(move_data: DataFrame, f: Callable, **kwargs):
         logger.debug('...Reset index for filtering\n')
         move_data.reset_index(inplace=True)
 
-    filter_data_points, rows_to_drop = _filter_data(move_data, f, kwargs)
+    labels = [label for label in _POINT_FEATURES if label in move_data]
+    features = {
+        label: move_data[label].to_numpy(dtype=np.float64, copy=True)
+        for label in labels
+    }
+    points = {
+        LATITUDE: move_data[LATITUDE].to_numpy(dtype=np.float64),
+        LONGITUDE: move_data[LONGITUDE].to_numpy(dtype=np.float64),
+        DATETIME: move_data[DATETIME].to_numpy().astype(np.float64),
+    }
+
+    codes, _ = factorize(move_data[label_id])
+    order = np.argsort(codes, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    alive = np.ones(order.size, dtype=bool)
+    alive_ranked = np.ones(order.size, dtype=bool)
+
+    candidates = np.arange(order.size)
+    drops = []
+    while candidates.size > 0:
+        previous_rows, _ = _alive_neighbours(alive, candidates)
+        previous = DataFrame(
+            {
+                label: np.where(previous_rows >= 0, values[previous_rows], np.nan)
+                for label, values in features.items()
+            }
+        )
+        current = DataFrame(
+            {label: values[candidates] for label, values in features.items()}
+        )
+        dropped = candidates[f(current, previous, **kwargs)]
+        if dropped.size == 0:
+            break
 
-    sum_drop = 0
-    while rows_to_drop > 0:
-        logger.debug('...Dropping %s rows of gps points\n' % rows_to_drop)
-        shape_before = move_data.shape[0]
-        move_data.drop(index=filter_data_points.index, inplace=True)
-        sum_drop = sum_drop + rows_to_drop
+        drops.append(dropped.size)
         logger.debug(
-            '...Rows before: %s, Rows after:%s, Sum drop:%s\n'
-            % (shape_before, move_data.shape[0], sum_drop)
+            '...Round %s: dropping %s rows of gps points\n'
+            % (len(drops), dropped.size)
         )
-
-        filter_data_points, rows_to_drop = _filter_data(move_data, f, kwargs)
-
-    logger.debug('%s GPS points were dropped' % sum_drop)
+        alive[dropped] = False
+        alive_ranked[rank[dropped]] = False
+
+        prev_ranks, next_ranks = _alive_neighbours(alive_ranked, rank[dropped])
+        changed = np.unique(np.concatenate([prev_ranks, next_ranks]))
+        changed = order[changed[changed >= 0]]
+
+        prev_ranks, next_ranks = _alive_neighbours(alive_ranked, rank[changed])
+        prev_ = np.where(prev_ranks >= 0, order[prev_ranks], -1)
+        next_ = np.where(next_ranks >= 0, order[next_ranks], -1)
+        prev_[(prev_ >= 0) & (codes[prev_] != codes[changed])] = -1
+        next_[(next_ >= 0) & (codes[next_] != codes[changed])] = -1
+        updated = _point_features(points, changed, prev_, next_)
+        for label, values in features.items():
+            values[changed] = updated[label]
+
+        _, following = _alive_neighbours(alive, changed)
+        _, after_dropped = _alive_neighbours(alive, dropped)
+        candidates = np.union1d(changed, np.concatenate([following, after_dropped]))
+        candidates = candidates[candidates >= 0]
+
+    move_data.drop(index=move_data.index[~alive], inplace=True)
+    for label, values in features.items():
+        move_data[label] = values[alive]
+
+    move_data.attrs[DROPS_BY_ROUND] = drops
+    logger.info(
+        '%s GPS points were dropped in %s rounds: %s'
+        % (sum(drops), len(drops), drops)
+    )
 
     return move_data
 
@@ -471,7 +624,7 @@ def clean_gps_jumps_by_distance(
     label_id: str = TRAJ_ID,
     jump_coefficient: float = 3.0,
     threshold: float = 1,
-    label_dtype: Callable = np.float64,
+    label_dtype: type = np.float64,
     inplace: bool = False,
 ) -> 'PandasMoveDataFrame' | 'DaskMoveDataFrame' | None:
     """
@@ -498,6 +651,7 @@ def clean_gps_jumps_by_distance(
     -------
     DataFrame
         The filtered trajectories without the gps jumps or None
+        The points dropped in each round are counted in attrs[DROPS_BY_ROUND]
 
     """
     if not inplace:
@@ -514,10 +668,10 @@ def clean_gps_jumps_by_distance(
     )
     move_data = _clean_gps(
         move_data,
-        outliers,
+        _filter_outliers,
+        label_id=label_id,
         arg1=jump_coefficient,
-        arg2=threshold,
-        outliers=True
+        arg2=threshold
     )
 
     if not inplace:
@@ -528,7 +682,7 @@ def clean_gps_nearby_points_by_distances(
     move_data: 'PandasMoveDataFrame' | 'DaskMoveDataFrame',
     label_id: str = TRAJ_ID,
     radius_area: float = 10.0,
-    label_dtype: Callable = np.float64,
+    label_dtype: type = np.float64,
     inplace: bool = False,
 ) -> 'PandasMoveDataFrame' | 'DaskMoveDataFrame' | None:
     """
@@ -553,6 +707,7 @@ def clean_gps_nearby_points_by_distances(
     -------
     DataFrame
         The filtered trajectories without the gps nearby points by distance or None
+        The points dropped in each round are counted in attrs[DROPS_BY_ROUND]
 
     """
     if not inplace:
@@ -571,9 +726,9 @@ def clean_gps_nearby_points_by_distances(
     move_data = _clean_gps(
         move_data,
         _filter_single_by_max,
+        label_id=label_id,
         arg1=DIST_TO_PREV,
-        arg2=radius_area,
-        outliers=False
+        arg2=radius_area
     )
     if not inplace:
         return move_data
@@ -583,7 +738,7 @@ def clean_gps_nearby_points_by_speed(
     move_data: 'PandasMoveDataFrame' | 'DaskMoveDataFrame',
     label_id: str = TRAJ_ID,
     speed_radius: float = 0.0,
-    label_dtype: Callable = np.float64,
+    label_dtype: type = np.float64,
     inplace: bool = False,
 ) -> 'PandasMoveDataFrame' | 'DaskMoveDataFrame' | None:
     """
@@ -608,6 +763,7 @@ def clean_gps_nearby_points_by_speed(
     -------
     DataFrame
         The filtered trajectories without the gps nearby points by speed or None
+        The points dropped in each round are counted in attrs[DROPS_BY_ROUND]
 
     """
     if not inplace:
@@ -626,9 +782,9 @@ def clean_gps_nearby_points_by_speed(
     move_data = _clean_gps(
         move_data,
         _filter_single_by_max,
+        label_id=label_id,
         arg1=SPEED_TO_PREV,
-        arg2=speed_radius,
-        outliers=False
+        arg2=speed_radius
     )
     if not inplace:
         return move_data
@@ -638,7 +794,7 @@ def clean_gps_speed_max_radius(
     move_data: 'PandasMoveDataFrame' | 'DaskMoveDataFrame',
     label_id: str = TRAJ_ID,
     speed_max: float = 50.0,
-    label_dtype: Callable = np.float64,
+    label_dtype: type = np.float64,
     inplace: bool = False,
 ) -> 'PandasMoveDataFrame' | 'DaskMoveDataFrame' | None:
     """
@@ -672,6 +828,7 @@ def clean_gps_speed_max_radius(
     -------
     DataFrame
         The filtered trajectories without the gps nearby points or None
+        The points dropped in each round are counted in attrs[DROPS_BY_ROUND]
 
     """
     if not inplace:
@@ -690,9 +847,9 @@ def clean_gps_speed_max_radius(
     move_data = _clean_gps(
         move_data,
         _filter_speed_max_radius,
+        label_id=label_id,
         arg1=SPEED_TO_PREV,
-        arg2=speed_max,
-        outliers=False
+        arg2=speed_max
     )
     if not inplace:
         return move_data
@@ -780,7 +937,7 @@ def clean_trajectories_short_and_few_points(
     label_id: str = TID,
     min_trajectory_distance: float = 100,
     min_points_per_trajectory: int = 2,
-    label_dtype: Callable = np.float64,
+    label_dtype: type = np.float64,
     inplace: bool = False,
 ) -> 'PandasMoveDataFrame' | 'DaskMoveDataFrame' | None:
     """
@@ -867,7 +1024,7 @@ def clean_id_by_time_max(
     move_data: 'PandasMoveDataFrame' | 'DaskMoveDataFrame',
     label_id: str = TRAJ_ID,
     time_max: float = 3600,
-    label_dtype: Callable = np.float64,
+    label_dtype: type = np.float64,
     inplace: bool = False,
 ) -> 'PandasMoveDataFrame' | 'DaskMoveDataFrame' | None:
     """
@@ -27,7 +27,7 @@ from pymove.utils.constants import (
     TIME_TO_PREV,
     TRAJ_ID,
 )
-from pymove.utils.log import logger, progress_bar, timer_decorator
+from pymove.utils.log import logger, timer_decorator
 
 if TYPE_CHECKING:
     from pymove.core.dask import DaskMoveDataFrame
@@ -82,7 +82,7 @@ def bbox_split(bbox: tuple[int, int, int, int], number_grids: int) -> DataFrame:
 
 def _drop_single_point(move_data: DataFrame, label_new_tid: str, label_id: str):
     """
-    Removes trajectory with single point.
+    Removes the segments with a single point.
 
     Parameters
     ----------
@@ -96,9 +96,10 @@ def _drop_single_point(move_data: DataFrame, label_new_tid: str, label_id: str):
 
     """
     shape_before_drop = move_data.shape
-    idx = move_data[move_data[label_new_tid] == -1].index
+    sizes = move_data.groupby(label_new_tid)[label_new_tid].transform('size')
+    idx = move_data.index[sizes.to_numpy() == 1]
     if idx.shape[0] > 0:
-        logger.debug('...Drop Trajectory with a unique GPS point\n')
+        logger.debug('...Drop segments with a unique GPS point\n')
         ids_before_drop = move_data[label_id].unique().shape[0]
         move_data.drop(index=idx, inplace=True)
         logger.debug(
@@ -116,7 +117,7 @@ def _drop_single_point(move_data: DataFrame, label_new_tid: str, label_id: str):
 
 
 def _filter_and_dist_time_speed(
-    move_data: DataFrame, idx: int, max_dist: float, max_time: float, max_speed: float
+    move_data: DataFrame, max_dist: float, max_time: float, max_speed: float
 ) -> ndarray:
     """
     Filters the dataframe considering thresholds for time, dist and speed.
@@ -125,8 +126,6 @@ def _filter_and_dist_time_speed(
     ----------
     move_data : dataframe
         Dataframe to be filtered
-    idx : int
-        row to compare
     max_dist : float
         maximum dist diference
     max_time : float
@@ -137,18 +136,18 @@ def _filter_and_dist_time_speed(
     Returns
     -------
     numpy.ndarray of booleans
-        filtered indexes from the dataframe
+        points that start a new segment
 
     """
     return (
-        (np.nan_to_num(move_data.at[idx, DIST_TO_PREV]) > max_dist)
-        | (np.nan_to_num(move_data.at[idx, TIME_TO_PREV]) > max_time)
-        | (np.nan_to_num(move_data.at[idx, SPEED_TO_PREV]) > max_speed)
+        (np.nan_to_num(move_data[DIST_TO_PREV].to_numpy(dtype=np.float64)) > max_dist)
+        | (np.nan_to_num(move_data[TIME_TO_PREV].to_numpy(dtype=np.float64)) > max_time)
+        | (np.nan_to_num(move_data[SPEED_TO_PREV].to_numpy(dtype=np.float64)) > max_speed)
     )
 
 
 def _filter_or_dist_time_speed(
-    move_data: DataFrame, idx: int, feature: str, max_between_adj_points: float
+    move_data: DataFrame, feature: str, max_between_adj_points: float
 ) -> ndarray:
     """
     Filters the dataframe considering thresholds for time, dist and speed.
@@ -157,20 +156,52 @@ def _filter_or_dist_time_speed(
     ----------
     move_data : dataframe
         Dataframe to be filtered
-    idx : int
-        row to compare
     feature : str
         feature to compare
     max_between_adj_points : float
         maximum points diference
 
+    Returns
+    -------
+    numpy.ndarray of booleans
+        points that start a new segment
+
+    """
+    return np.nan_to_num(
+        move_data[feature].to_numpy(dtype=np.float64)
+    ) > max_between_adj_points
+
+
+def _generate_tids(keys: ndarray, filter_: ndarray) -> ndarray:
+    """
+    Generates the segment ids of every point at once.
+
+    Segments are numbered from 1 in order of the first appearance of their
+    key, and a new one starts at every filtered point of a key with more
+    than one point.
+
+    Parameters
+    ----------
+    keys : numpy.ndarray
+        trajectory id of each point
+    filter_ : numpy.ndarray
+        points that start a new segment
+
     Returns
     -------
     numpy.ndarray
-        filtered indexes from the dataframe
+        segment id of each point
 
     """
-    return np.nan_to_num(move_data.at[idx, feature]) > max_between_adj_points
+    codes, _ = pd.factorize(keys)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    starts = np.ones(len(codes), dtype=np.int64)
+    starts[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    breaks = filter_[order] & (np.bincount(codes)[sorted_codes] > 1)
+    tids = np.empty(len(codes), dtype=np.int64)
+    tids[order] = np.cumsum(starts + breaks)
+    return tids
 
 
 def _prepare_segmentation(move_data: DataFrame, label_id: str, label_new_tid: str):
@@ -244,12 +275,8 @@ def _update_curr_tid_count(
         move_data.at[idx, label_new_tid] = curr_tid
         count += 1
     else:
-        tids = np.empty(filter_.shape[0], dtype=np.int64)
-        tids.fill(curr_tid)
-        for i, has_problem in enumerate(filter_):
-            if has_problem:
-                curr_tid += 1
-                tids[i:] = curr_tid
+        tids = curr_tid + np.cumsum(filter_.astype(bool).ravel(), dtype=np.int64)
+        curr_tid = int(tids[-1])
         count += tids.shape[0]
         move_data.at[idx, label_new_tid] = tids
     return curr_tid, count
@@ -293,30 +320,23 @@ def _filter_by(
     Time, distance and speed features must be updated after split.
 
     """
-    curr_tid, ids, count = _prepare_segmentation(
-        move_data, label_id, label_new_tid
-    )
-
-    for idx in progress_bar(ids, desc='Generating %s' % label_new_tid):
-        if kwargs['all']:
-            filter_ = _filter_and_dist_time_speed(
-                move_data,
-                idx,
-                kwargs['max_dist'],
-                kwargs['max_time'],
-                kwargs['max_speed']
-            )
-        else:
-            filter_ = _filter_or_dist_time_speed(
-                move_data,
-                idx,
-                kwargs['feature'],
-                kwargs['max_between_adj_points']
-            )
-
-        curr_tid, count = _update_curr_tid_count(
-            filter_, move_data, idx, label_new_tid, curr_tid, count
+    _prepare_segmentation(move_data, label_id, label_new_tid)
+
+    logger.debug('Generating %s' % label_new_tid)
+    if kwargs['all']:
+        filter_ = _filter_and_dist_time_speed(
+            move_data,
+            kwargs['max_dist'],
+            kwargs['max_time'],
+            kwargs['max_speed']
+        )
+    else:
+        filter_ = _filter_or_dist_time_speed(
+            move_data,
+            kwargs['feature'],
+            kwargs['max_between_adj_points']
         )
+    move_data[label_new_tid] = _generate_tids(move_data.index, filter_)
 
     if label_id == label_new_tid:
         move_data.reset_index(drop=True, inplace=True)
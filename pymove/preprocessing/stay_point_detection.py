@@ -2,18 +2,28 @@
 Stop point detection operations.
 
 create_or_update_move_stop_by_dist_time,
-create_or_update_move_and_stop_by_radius
+create_or_update_move_and_stop_by_radius,
+detect_stay_points
 
 """
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import TYPE_CHECKING
 
 import numpy as np
+from numpy import ndarray
+from pandas import DataFrame, factorize
 
 from pymove.preprocessing.segmentation import by_max_dist
 from pymove.utils.constants import (
+    ARRIVAL,
+    DATETIME,
+    DEPARTURE,
     DIST_TO_PREV,
+    LATITUDE,
+    LONGITUDE,
     MOVE,
     SEGMENT_STOP,
     SITUATION,
@@ -21,6 +31,7 @@ from pymove.utils.constants import (
     TIME_TO_PREV,
     TRAJ_ID,
 )
+from pymove.utils.distances import haversine
 from pymove.utils.log import logger, timer_decorator
 
 if TYPE_CHECKING:
@@ -81,6 +92,7 @@ def create_or_update_move_stop_by_dist_time(
         move_data,
         label_id=label_id,
         max_dist_between_adj_points=dist_radius,
+        drop_single_points=False,
         label_new_tid=new_label,
         inplace=True
     )
@@ -94,17 +106,8 @@ def create_or_update_move_stop_by_dist_time(
         '...Creating stop features as True or False using %s to time in seconds'
         % time_radius
     )
-    move_data[STOP] = False
-    move_dataagg_tid = (
-        move_data.groupby(by=new_label)
-        .agg({TIME_TO_PREV: 'sum'})
-        .query(f'{TIME_TO_PREV} > {time_radius}')
-        .index
-    )
-    idx = move_data[
-        move_data[new_label].isin(move_dataagg_tid)
-    ].index
-    move_data.at[idx, STOP] = True
+    segment_time = move_data.groupby(by=new_label)[TIME_TO_PREV].transform('sum')
+    move_data[STOP] = (segment_time > time_radius).to_numpy()
     logger.debug(move_data[STOP].value_counts())
 
     if not inplace:
@@ -173,3 +176,203 @@ def create_or_update_move_and_stop_by_radius(
 
     if not inplace:
         return move_data
+
+
+def _window_ends(
+    lat: ndarray,
+    lon: ndarray,
+    start: int,
+    stop: int,
+    dist_radius: float,
+    width: int = 8
+) -> ndarray:
+    """Returns the end of the window anchored at each point from start to stop."""
+    size = lat.size
+    ends = np.full(stop - start, size, dtype=np.int64)
+    anchors = np.arange(start, stop)
+    offset = 1
+    while anchors.size:
+        others = anchors[:, None] + np.arange(offset, offset + width)
+        inside = others < size
+        others = np.minimum(others, size - 1)
+        far = inside & (haversine(
+            lat[anchors, None], lon[anchors, None], lat[others], lon[others],
+            to_radians=False
+        ) > dist_radius)
+        found = far.any(axis=1)
+        ends[anchors[found] - start] = others[found, far[found].argmax(axis=1)]
+        anchors = anchors[~found & inside[:, -1]]
+        offset, width = offset + width, width * 2
+    return ends
+
+
+def _trajectory_stay_points(
+    lat: ndarray,
+    lon: ndarray,
+    times: ndarray,
+    dist_radius: float,
+    time_radius: float,
+    max_block: int = 256
+) -> tuple[list[int], list[int]]:
+    """Returns the first and last positions of the stay points of a trajectory."""
+    size = lat.size
+    lat, lon = np.radians(lat), np.radians(lon)
+    times = times.tolist()
+    ends = np.full(size, -1, dtype=np.int64)
+
+    # the windows are computed for blocks of anchors, growing while
+    # the scan moves one point at a time and reset after a stay point
+    firsts, lasts = [], []
+    i, block = 0, 1
+    while i < size:
+        if ends[i] < 0:
+            stop = min(i + block, size)
+            ends[i:stop] = _window_ends(lat, lon, i, stop, dist_radius)
+            block = min(block * 2, max_block)
+        j = int(ends[i])
+        if times[j - 1] - times[i] >= time_radius:
+            firsts.append(i)
+            lasts.append(j - 1)
+            i, block = j, 1
+        elif j == size:
+            # the windows of the next anchors are shorter than this one
+            break
+        else:
+            i += 1
+    return firsts, lasts
+
+
+def _chunk_stay_points(
+    lat: ndarray,
+    lon: ndarray,
+    times: ndarray,
+    bounds: list[tuple[int, int]],
+    dist_radius: float,
+    time_radius: float
+) -> tuple[ndarray, ndarray]:
+    """Returns the first and last positions of the stay points of a chunk."""
+    firsts, lasts = [], []
+    for start, stop in bounds:
+        first, last = _trajectory_stay_points(
+            lat[start:stop], lon[start:stop], times[start:stop],
+            dist_radius, time_radius
+        )
+        firsts.append(np.asarray(first, dtype=np.int64) + start)
+        lasts.append(np.asarray(last, dtype=np.int64) + start)
+    if not firsts:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    return np.concatenate(firsts), np.concatenate(lasts)
+
+
+@timer_decorator
+def detect_stay_points(
+    move_data: DataFrame,
+    dist_radius: float = 200,
+    time_radius: float = 1200,
+    label_id: str = TRAJ_ID,
+    n_jobs: int | None = 1,
+) -> DataFrame:
+    """
+    Detects the stay points of the trajectories.
+
+    Each point of a trajectory anchors a window extended while the points
+    are within dist_radius of it. If the user stayed in the window for at
+    least time_radius, the window is a stay point and the scan continues
+    after it, otherwise it continues from the next point. The window of the
+    last points is closed by the end of the trajectory.
+
+    Parameters
+    ----------
+    move_data : dataframe
+       The input trajectory data
+    dist_radius : float, optional
+        The maximum distance in meters between the anchor and the points
+        of a stay point, by default 200
+    time_radius : float, optional
+        The minimum time in seconds spent in a stay point, by default 1200
+    label_id : str, optional
+         Indicates the label of the id column in the user dataframe, by default TRAJ_ID
+    n_jobs : int, optional
+        Number of processes scanning the trajectories, None using all processors,
+        by default 1
+
+    Returns
+    -------
+    DataFrame
+        One row per stay point, with the trajectory id, the centroid lat and lon
+        of its points and the arrival and departure datetimes
+
+    References
+    ----------
+    Li, Q., Zheng, Y., Xie, X., Chen, Y., Liu, W. and Ma, W. Mining user
+    similarity based on location history. In Proceedings of the 16th ACM
+    SIGSPATIAL international conference on Advances in geographic information
+    systems, 2008.
+
+    Examples
+    --------
+    >>> from pymove.preprocessing.stay_point_detection import detect_stay_points
+    >>> move_df
+          lat          lon             datetime  id
+    0   39.984094   116.319236   2008-10-23 05:53:05   1
+    1   39.984198   116.319322   2008-10-23 05:53:06   1
+    2   39.984224   116.319402   2008-10-23 05:53:11   1
+    3   39.994224   116.319402   2008-10-23 05:53:15   1
+    >>> detect_stay_points(move_df, dist_radius=50, time_radius=5)
+       id        lat        lon             arrival           departure
+    0   1  39.984172  116.31932 2008-10-23 05:53:05 2008-10-23 05:53:11
+    """
+    codes, ids = factorize(move_data[label_id], sort=True)
+    datetimes = move_data[DATETIME].to_numpy(dtype='datetime64[ns]')
+    order = np.lexsort((datetimes, codes))
+    order = order[codes[order] >= 0]
+    codes = codes[order]
+    datetimes = datetimes[order]
+    lat = move_data[LATITUDE].to_numpy(dtype=np.float64)[order]
+    lon = move_data[LONGITUDE].to_numpy(dtype=np.float64)[order]
+    times = datetimes.astype(np.int64) / 1e9
+
+    breaks = np.flatnonzero(np.diff(codes)) + 1
+    bounds: list[tuple[int, int]] = list(zip(
+        np.r_[0, breaks].tolist(), np.r_[breaks, codes.size].tolist()
+    )) if codes.size else []
+
+    logger.debug(f'Detecting stay points of {len(bounds)} trajectories')
+    if n_jobs == 1 or len(bounds) < 2:
+        firsts, lasts = _chunk_stay_points(
+            lat, lon, times, bounds, dist_radius, time_radius
+        )
+    else:
+        workers = n_jobs or os.cpu_count() or 1
+        chunks = np.array_split(
+            np.arange(len(bounds)), min(len(bounds), workers * 4)
+        )
+        starts = [bounds[chunk[0]][0] for chunk in chunks]
+
+        def arguments(chunk, start):
+            stop = bounds[chunk[-1]][1]
+            return (
+                lat[start:stop], lon[start:stop], times[start:stop],
+                [(b[0] - start, b[1] - start) for b in bounds[chunk[0]:chunk[-1] + 1]],
+                dist_radius, time_radius
+            )
+
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(
+                _chunk_stay_points, *zip(*map(arguments, chunks, starts))
+            ))
+        firsts = np.concatenate([r[0] + s for r, s in zip(results, starts)])
+        lasts = np.concatenate([r[1] + s for r, s in zip(results, starts)])
+
+    # the padding keeps the limits of a stay point ending the data valid
+    limits = np.column_stack([firsts, lasts + 1]).ravel()
+    sizes = (lasts - firsts + 1).astype(np.float64)
+    stay_points = DataFrame({
+        label_id: ids.take(codes[firsts]),
+        LATITUDE: np.add.reduceat(np.r_[lat, 0], limits)[::2] / sizes,
+        LONGITUDE: np.add.reduceat(np.r_[lon, 0], limits)[::2] / sizes,
+        ARRIVAL: datetimes[firsts],
+        DEPARTURE: datetimes[lasts],
+    })
+    logger.debug(f'...There are {stay_points.shape[0]} stay points')
+    return stay_points
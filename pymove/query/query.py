@@ -1,22 +1,417 @@
 """
 Query operations.
 
+TrajectoryIndex,
+SpatioTemporalIndex,
 range_query,
+range_query_batch,
 knn_query,
+pairwise_trajectory_distances,
 query_all_points_by_range,
 
 """
+from __future__ import annotations
+
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from datetime import timedelta
+from itertools import chain
+from typing import Any, Callable, Generator
 
 import numpy as np
 import pandas as pd
+from numpy import ndarray
 from pandas import DataFrame
+from scipy.spatial import cKDTree
 
 from pymove.utils import distances
 from pymove.utils.constants import DATETIME, LATITUDE, LONGITUDE, MEDP, MEDT, TRAJ_ID
+from pymove.utils.conversions import lat_to_y_spherical, lon_to_x_spherical
 from pymove.utils.log import logger, progress_bar
 
 
+class TrajectoryIndex:
+    """PyMove class indexing the trajectories of a dataframe for queries."""
+
+    def __init__(
+        self,
+        move_df: DataFrame,
+        id_: str = TRAJ_ID,
+        latitude: str = LATITUDE,
+        longitude: str = LONGITUDE,
+        datetime: str = DATETIME
+    ):
+        """
+        Groups the trajectories of a dataframe.
+
+        The index keeps a reference to move_df, so it must be rebuilt
+        if the dataframe changes.
+
+        Parameters
+        ----------
+        move_df: dataframe
+            The input trajectory data.
+        id_: str, optional
+            Label of the trajectories dataframe user id, by default TRAJ_ID
+        latitude: string, optional
+            Label of the trajectories dataframe referring to the latitude,
+            by default LATITUDE
+        longitude: string, optional
+            Label of the trajectories dataframe referring to the longitude,
+            by default LONGITUDE
+        datetime: string, optional
+            Label of the trajectories dataframe referring to the timestamp,
+            by default DATETIME
+        """
+        self.data = move_df
+        self.id_ = id_
+        self.latitude = latitude
+        self.longitude = longitude
+        self.datetime = datetime
+
+        codes, self.ids = pd.factorize(move_df[id_])
+        self.order = np.argsort(codes, kind='stable')
+        self.lengths = np.bincount(codes, minlength=len(self.ids))
+        self.starts = np.cumsum(self.lengths) - self.lengths
+        self.ends = self.starts + self.lengths
+
+        self.points = _trajectory_points(
+            move_df.iloc[self.order], latitude, longitude, datetime
+        )
+        self.trajectories = [
+            self.points[start:end] for start, end in zip(self.starts, self.ends)
+        ]
+
+    def __len__(self) -> int:
+        """Returns the number of indexed trajectories."""
+        return len(self.ids)
+
+    def get_trajectory(self, traj_id: Any) -> DataFrame:
+        """
+        Returns the rows of a trajectory in their original order.
+
+        Parameters
+        ----------
+        traj_id: Any
+            Id of the trajectory
+
+        Returns
+        -------
+        DataFrame
+            rows of move_df belonging to the trajectory
+        """
+        position = self.ids.get_loc(traj_id)
+        start, end = self.starts[position], self.ends[position]
+        return self.data.iloc[self.order[start:end]]
+
+    def lower_bounds(
+        self, traj: DataFrame, distance: str = MEDP, **kwargs
+    ) -> ndarray:
+        """
+        Returns a lower bound of the distance between traj and each trajectory.
+
+        Parameters
+        ----------
+        traj: dataframe
+            The input of one trajectory.
+        distance: string, optional
+            Name of a distance measure registered in pymove.utils.distances,
+            by default MEDP
+        kwargs: optional
+            Parameters of the distance measure
+
+        Returns
+        -------
+        ndarray
+            lower bound for each indexed trajectory
+
+        Raises
+        ------
+            ValueError: if distance measure is invalid
+        """
+        measure = distances.get_distance(distance)
+        query = _trajectory_points(
+            traj, self.latitude, self.longitude, self.datetime
+        )
+        return measure.lower_bound(query, self.trajectories, **kwargs)
+
+    def exact_distances(
+        self, traj: DataFrame, positions: ndarray, distance: str = MEDP, **kwargs
+    ) -> ndarray:
+        """
+        Returns the exact distances between traj and some trajectories.
+
+        Parameters
+        ----------
+        traj: dataframe
+            The input of one trajectory.
+        positions: ndarray
+            Positions of the trajectories in the index
+        distance: string, optional
+            Name of a distance measure registered in pymove.utils.distances,
+            by default MEDP
+        kwargs: optional
+            Parameters of the distance measure
+
+        Returns
+        -------
+        ndarray
+            distance to each trajectory
+
+        Raises
+        ------
+            ValueError: if distance measure is invalid
+        """
+        measure = distances.get_distance(distance)
+        query = _trajectory_points(
+            traj, self.latitude, self.longitude, self.datetime
+        )
+        others = [self.trajectories[p] for p in positions]
+        if len(others) == 0:
+            return np.empty(0)
+        return measure.distance(query, others, **kwargs)
+
+    def range(
+        self, traj: DataFrame, min_dist: float, distance: str = MEDP, **kwargs
+    ) -> tuple[ndarray, ndarray]:
+        """
+        Returns the trajectories whose distance to traj is less than min_dist.
+
+        Only the trajectories whose lower bound is less than min_dist
+        have their exact distance computed.
+
+        Parameters
+        ----------
+        traj: dataframe
+            The input of one trajectory.
+        min_dist: float
+            Minimum distance measure
+        distance: string, optional
+            Name of a distance measure registered in pymove.utils.distances,
+            by default MEDP
+        kwargs: optional
+            Parameters of the distance measure
+
+        Returns
+        -------
+        ndarray, ndarray
+            positions in the index of the trajectories found and their distances
+
+        Raises
+        ------
+            ValueError: if distance measure is invalid
+        """
+        bounds = self.lower_bounds(traj, distance, **kwargs) * (1 - 1e-6)
+        candidates = np.flatnonzero(bounds < min_dist)
+        candidate_distances = self.exact_distances(
+            traj, candidates, distance, **kwargs
+        )
+        found = candidate_distances < min_dist
+        return candidates[found], candidate_distances[found]
+
+    def knn(
+        self,
+        traj: DataFrame,
+        k: int = 5,
+        distance: str = MEDP,
+        exclude: list | None = None,
+        **kwargs
+    ) -> list[tuple[float, Any]]:
+        """
+        Returns the k trajectories closest to traj.
+
+        Trajectories are visited in increasing order of their lower bounds,
+        and the search stops when the next lower bound is greater than the
+        k-th smallest distance found.
+
+        Parameters
+        ----------
+        traj: dataframe
+            The input of one trajectory.
+        k: int, optional
+            neighboring trajectories, by default 5
+        distance: string, optional
+            Name of a distance measure registered in pymove.utils.distances,
+            by default MEDP
+        exclude: list, optional
+            Ids of trajectories that are not returned, by default None
+        kwargs: optional
+            Parameters of the distance measure
+
+        Returns
+        -------
+        list of tuples
+            (distance, id) of the nearest trajectories, in increasing distance
+
+        Raises
+        ------
+            ValueError: if distance measure is invalid
+        """
+        bounds = self.lower_bounds(traj, distance, **kwargs) * (1 - 1e-6)
+        if exclude is not None:
+            bounds[self.ids.isin(exclude)] = np.inf
+
+        heap: list[tuple[float, int]] = []
+        for position in np.argsort(bounds, kind='stable'):
+            bound = bounds[position]
+            if bound == np.inf or (len(heap) == k and bound > -heap[0][0]):
+                break
+            this_distance = self.exact_distances(
+                traj, np.array([position]), distance, **kwargs
+            )[0]
+            item = (-this_distance, -position)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        return [
+            (-d, self.ids[-p]) for d, p in sorted(heap, reverse=True)
+        ]
+
+
+class SpatioTemporalIndex:
+    """PyMove class indexing points by time and position for range queries."""
+
+    def __init__(
+        self,
+        move_df: DataFrame,
+        latitude: str = LATITUDE,
+        longitude: str = LONGITUDE,
+        datetime: str = DATETIME
+    ):
+        """
+        Sorts the points by time and builds a tree over their positions.
+
+        Positions are projected with the spherical mercator projection, where
+        euclidean_distance_in_meters is the euclidean distance. The index keeps
+        a reference to move_df, so it must be rebuilt if the dataframe changes.
+
+        Parameters
+        ----------
+        move_df: dataframe
+            The input trajectory data.
+        latitude: string, optional
+            Label of the trajectories dataframe referring to the latitude,
+            by default LATITUDE
+        longitude: string, optional
+            Label of the trajectories dataframe referring to the longitude,
+            by default LONGITUDE
+        datetime: string, optional
+            Label of the trajectories dataframe referring to the timestamp,
+            by default DATETIME
+        """
+        self.data = move_df
+        self.latitude = move_df[latitude].to_numpy(dtype=np.float64)
+        self.longitude = move_df[longitude].to_numpy(dtype=np.float64)
+        self.times = pd.to_datetime(move_df[datetime]).to_numpy().astype(np.int64)
+        self.time_order = np.argsort(self.times, kind='stable')
+        self.sorted_times = self.times[self.time_order]
+        self.tree = cKDTree(_mercator_points(self.latitude, self.longitude))
+
+    def __len__(self) -> int:
+        """Returns the number of indexed points."""
+        return len(self.times)
+
+    def query(
+        self,
+        latitude: ndarray,
+        longitude: ndarray,
+        datetime: ndarray,
+        meters: float,
+        time: timedelta
+    ) -> tuple[ndarray, ndarray]:
+        """
+        Finds the indexed points within a distance and a time of each query point.
+
+        Candidates come from the time slices found by binary search or from
+        the tree radius queries, whichever yields fewer pairs, and are then
+        filtered by both conditions.
+
+        Parameters
+        ----------
+        latitude: ndarray
+            Latitude of the query points
+        longitude: ndarray
+            Longitude of the query points
+        datetime: ndarray
+            Timestamp of the query points
+        meters: float
+            Spatial distance, exclusive, in meters
+        time: timedelta
+            Temporal distance, exclusive
+
+        Returns
+        -------
+        ndarray, ndarray
+            position of the query point and of the indexed point of each pair,
+            sorted by query point and indexed point
+        """
+        latitude = np.asarray(latitude, dtype=np.float64)
+        longitude = np.asarray(longitude, dtype=np.float64)
+        times = pd.to_datetime(np.asarray(datetime)).to_numpy().astype(np.int64)
+        window = pd.Timedelta(time).value
+        if len(self) == 0 or len(times) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        lower = np.searchsorted(self.sorted_times, times - window, side='right')
+        upper = np.searchsorted(self.sorted_times, times + window, side='left')
+        time_lengths = np.maximum(upper - lower, 0)
+
+        points = _mercator_points(latitude, longitude)
+        radius = meters * (1 + 1e-9)
+        space_lengths = self.tree.query_ball_point(
+            points, radius, return_length=True
+        )
+
+        if time_lengths.sum() <= space_lengths.sum():
+            queries = np.repeat(np.arange(len(times)), time_lengths)
+            offsets = np.arange(queries.size) - np.repeat(
+                np.cumsum(time_lengths) - time_lengths, time_lengths
+            )
+            found = self.time_order[np.repeat(lower, time_lengths) + offsets]
+        else:
+            neighbors = self.tree.query_ball_point(points, radius)
+            queries = np.repeat(np.arange(len(times)), space_lengths)
+            found = np.fromiter(
+                chain.from_iterable(neighbors), dtype=np.int64, count=queries.size
+            )
+
+        inside = (
+            (np.abs(self.times[found] - times[queries]) < window)
+            & (distances.euclidean_distance_in_meters(
+                latitude[queries], longitude[queries],
+                self.latitude[found], self.longitude[found]
+            ) < meters)
+        )
+        queries, found = queries[inside], found[inside]
+        order = np.lexsort((found, queries))
+        return queries[order], found[order]
+
+
+def _trajectory_points(
+    traj: DataFrame,
+    latitude: str = LATITUDE,
+    longitude: str = LONGITUDE,
+    datetime: str = DATETIME
+) -> ndarray:
+    """Returns an array with lat, lon and the timestamp in milliseconds of each point."""
+    nanos = pd.to_datetime(traj[datetime]).to_numpy().astype(np.int64)
+    return np.column_stack([
+        traj[latitude].to_numpy(dtype=np.float64),
+        traj[longitude].to_numpy(dtype=np.float64),
+        (nanos // 1000000).astype(np.float64),
+    ])
+
+
+def _mercator_points(latitude: ndarray, longitude: ndarray) -> ndarray:
+    """Returns the spherical mercator x, y coordinates of the points."""
+    return np.column_stack([
+        lon_to_x_spherical(longitude), lat_to_y_spherical(latitude)
+    ])
+
+
 def range_query(
     traj: DataFrame,
     move_df: DataFrame,
@@ -25,7 +420,9 @@ def range_query(
     distance: str = MEDP,
     latitude: str = LATITUDE,
     longitude: str = LONGITUDE,
-    datetime: str = DATETIME
+    datetime: str = DATETIME,
+    index: TrajectoryIndex | None = None,
+    **kwargs
 ) -> DataFrame:
     """
     Returns all trajectories that have a distance equal to or less than the trajectory.
@@ -43,7 +440,8 @@ def range_query(
     min_dist: float, optional
         Minimum distance measure, by default 1000
     distance: string, optional
-        Distance measure type, by default MEDP
+        Name of a distance measure registered in pymove.utils.distances,
+        by default MEDP
     latitude: string, optional
         Label of the trajectories dataframe referring to the latitude,
         by default LATITUDE
@@ -53,6 +451,10 @@ def range_query(
     datetime: string, optional
         Label of the trajectories dataframe referring to the timestamp,
         by default DATETIME
+    index: TrajectoryIndex, optional
+        Index of move_df, reused between queries, by default None
+    kwargs: optional
+        Parameters of the distance measure
 
     Returns
     -------
@@ -83,30 +485,113 @@ def range_query(
     1   32.8	-77.1	2012-05-19 06:00:00	  3
     2	32.5	-77.3	2012-05-19 12:00:00	  4
     """
-    result = traj.copy()
-    result.drop(result.index, inplace=True)
+    distances.get_distance(distance)
+    if index is None:
+        index = TrajectoryIndex(move_df, _id, latitude, longitude, datetime)
 
-    if (distance == MEDP):
-        def dist_measure(traj, this, latitude, longitude, datetime):
-            return distances.medp(
-                traj, this, latitude, longitude
-            )
-    elif (distance == MEDT):
-        def dist_measure(traj, this, latitude, longitude, datetime):
-            return distances.medt(
-                traj, this, latitude, longitude, datetime
-            )
-    else:
-        raise ValueError('Unknown distance measure. Use MEDP or MEDT')
+    logger.debug(f'Querying range by {distance}')
+    positions, _ = index.range(traj, min_dist, distance, **kwargs)
+    return pd.concat(
+        [traj.iloc[:0]]
+        + [index.get_trajectory(index.ids[p]) for p in positions]
+    )
+
+
+def range_query_batch(
+    trajs: DataFrame,
+    move_df: DataFrame,
+    _id: str = TRAJ_ID,
+    min_dist: float = 1000,
+    distance: str = MEDP,
+    latitude: str = LATITUDE,
+    longitude: str = LONGITUDE,
+    datetime: str = DATETIME,
+    index: TrajectoryIndex | None = None,
+    **kwargs
+) -> DataFrame:
+    """
+    Returns the pairs of trajectories closer than a distance.
+
+    Given several query trajectories and a DataFrame with several trajectories,
+    finds for each query the trajectories with distance less than min_dist.
 
-    for traj_id in progress_bar(
-        move_df[_id].unique(), desc=f'Querying range by {distance}'
+    Parameters
+    ----------
+    trajs: dataframe
+        The query trajectories.
+    move_df: dataframe
+        The input trajectory data.
+    _id: str, optional
+        Label of the trajectories dataframe user id, by default TRAJ_ID
+    min_dist: float, optional
+        Minimum distance measure, by default 1000
+    distance: string, optional
+        Name of a distance measure registered in pymove.utils.distances,
+        by default MEDP
+    latitude: string, optional
+        Label of the trajectories dataframe referring to the latitude,
+        by default LATITUDE
+    longitude: string, optional
+        Label of the trajectories dataframe referring to the longitude,
+        by default LONGITUDE
+    datetime: string, optional
+        Label of the trajectories dataframe referring to the timestamp,
+        by default DATETIME
+    index: TrajectoryIndex, optional
+        Index of move_df, reused between queries, by default None
+    kwargs: optional
+        Parameters of the distance measure
+
+    Returns
+    -------
+    DataFrame
+        dataframe with the columns query_id, match_id and distance
+
+    Raises
+    ------
+        ValueError: if distance measure is invalid
+
+    Examples
+    --------
+    >>> from pymove.query.query import range_query_batch
+    >>> traj_df
+         lat      lon              datetime  id
+    0   16.4    -54.9   2014-10-11 18:00:00   1
+    1   16.4    -55.9   2014-10-12 00:00:00   1
+    2   33.1    -77.0   2012-05-19 00:00:00   2
+    >>> move_df
+         lat      lon              datetime  id
+    0   33.1    -77.0   2012-05-19 00:00:00   3
+    1   32.8    -77.1   2012-05-19 06:00:00   3
+    2   16.4    -55.0   2012-05-19 12:00:00   4
+    >>> range_query_batch(traj_df, move_df, min_dist=1.5)
+       query_id  match_id  distance
+    0         1         4       1.0
+    1         2         3       0.0
+    """
+    distances.get_distance(distance)
+    if index is None:
+        index = TrajectoryIndex(move_df, _id, latitude, longitude, datetime)
+    queries = TrajectoryIndex(trajs, _id, latitude, longitude, datetime)
+
+    query_ids: list = []
+    match_ids: list = []
+    match_distances: list[float] = []
+    for query_id in progress_bar(
+        queries.ids, desc=f'Querying range by {distance}'
     ):
-        this = move_df.loc[move_df[_id] == traj_id]
-        if dist_measure(traj, this, latitude, longitude, datetime) < min_dist:
-            result = result.append(this)
+        positions, found = index.range(
+            queries.get_trajectory(query_id), min_dist, distance, **kwargs
+        )
+        query_ids.extend([query_id] * len(found))
+        match_ids.extend(index.ids[positions])
+        match_distances.extend(found)
 
-    return result
+    return DataFrame({
+        'query_id': query_ids,
+        'match_id': match_ids,
+        'distance': np.array(match_distances, dtype=np.float64),
+    })
 
 
 def knn_query(
@@ -117,7 +602,9 @@ def knn_query(
     distance: str = MEDP,
     latitude: str = LATITUDE,
     longitude: str = LONGITUDE,
-    datetime: str = DATETIME
+    datetime: str = DATETIME,
+    index: TrajectoryIndex | None = None,
+    **kwargs
 ) -> DataFrame:
     """
     Returns the k neighboring trajectories closest to the trajectory.
@@ -135,7 +622,8 @@ def knn_query(
     id_: str, optional
         Label of the trajectories dataframe user id, by default TRAJ_ID
     distance: string, optional
-        Distance measure type, by default MEDP
+        Name of a distance measure registered in pymove.utils.distances,
+        by default MEDP
     latitude: string, optional
         Label of the trajectories dataframe referring to the latitude,
         by default LATITUDE
@@ -145,6 +633,10 @@ def knn_query(
     datetime: string, optional
         Label of the trajectories dataframe referring to the timestamp,
         by default DATETIME
+    index: TrajectoryIndex, optional
+        Index of move_df, reused between queries, by default None
+    kwargs: optional
+        Parameters of the distance measure
 
     Returns
     -------
@@ -178,45 +670,244 @@ def knn_query(
     2	16.4	-56.9	2014-10-12 06:00:00	  1
     2	32.5	-77.3	2012-05-19 12:00:00	  4
     """
-    k_list = pd.DataFrame([[np.Inf, 'empty']] * k, columns=['distance', TRAJ_ID])
+    distances.get_distance(distance)
+    if index is None:
+        index = TrajectoryIndex(move_df, id_, latitude, longitude, datetime)
 
-    if (distance == MEDP):
-        def dist_measure(traj, this, latitude, longitude, datetime):
-            return distances.medp(
-                traj, this, latitude, longitude
-            )
-    elif (distance == MEDT):
-        def dist_measure(traj, this, latitude, longitude, datetime):
-            return distances.medt(
-                traj, this, latitude, longitude, datetime
+    logger.debug(f'Querying knn by {distance}')
+    neighbors = index.knn(
+        traj, k, distance, exclude=[traj[id_].values[0]], **kwargs
+    )
+
+    logger.debug('Generating DataFrame with k nearest trajectories.')
+    return pd.concat(
+        [traj] + [index.get_trajectory(traj_id) for _, traj_id in neighbors]
+    )
+
+
+def _distance_tile(
+    rows: tuple[int, int],
+    cols: tuple[int, int],
+    row_trajectories: list[ndarray],
+    col_trajectories: list[ndarray],
+    distance: str,
+    kwargs: dict
+) -> ndarray:
+    """Returns the distances of a tile of the upper triangle of the matrix."""
+    measure = distances.get_distance(distance)
+    tile = np.zeros((rows[1] - rows[0], cols[1] - cols[0]), dtype=np.float32)
+    for i, points in enumerate(row_trajectories):
+        first = max(rows[0] + i + 1 - cols[0], 0)
+        if first < len(col_trajectories):
+            tile[i, first:] = measure.distance(
+                points, col_trajectories[first:], **kwargs
             )
-    else:
-        raise ValueError('Unknown distance measure. Use MEDP or MEDT')
+    return tile
 
-    for traj_id in progress_bar(
-        move_df[id_].unique(), desc=f'Querying knn by {distance}'
-    ):
-        if (traj_id != traj[id_].values[0]):
-            this = move_df.loc[move_df[id_] == traj_id]
-            this_distance = dist_measure(
-                traj, this, latitude, longitude, datetime
+
+def _open_matrix(
+    filename: str | None, size: int, n_tiles: int
+) -> tuple[ndarray, ndarray]:
+    """Returns the distance matrix and the mask of the tiles already computed."""
+    if filename is None:
+        return (
+            np.zeros((size, size), dtype=np.float32),
+            np.zeros((n_tiles, n_tiles), dtype=bool)
+        )
+
+    progress_file = filename + '.tiles.npy'
+    if os.path.exists(filename) and os.path.exists(progress_file):
+        matrix = np.lib.format.open_memmap(filename, mode='r+')
+        done = np.lib.format.open_memmap(progress_file, mode='r+')
+        if matrix.shape != (size, size) or done.shape != (n_tiles, n_tiles):
+            raise ValueError(
+                'File %s holds a matrix computed with other trajectories '
+                'or tile size' % filename
             )
-            n = 0
-            for n in range(k):
-                if (this_distance < k_list.loc[n, 'distance']):
-                    k_list.loc[n, 'distance'] = this_distance
-                    k_list.loc[n, 'traj_id'] = traj_id
-                    break
-                n = n + 1
-
-    result = traj.copy()
-    logger.debug('Generating DataFrame with k nearest trajectories.')
-    for n in range(k):
-        result = result.append(
-            move_df.loc[move_df[id_] == k_list.loc[n, 'traj_id']]
+        logger.debug('Resuming with %s of %s tiles computed' % (
+            done.sum(), n_tiles * (n_tiles + 1) // 2
+        ))
+        return matrix, done
+
+    matrix = np.lib.format.open_memmap(
+        filename, mode='w+', dtype=np.float32, shape=(size, size)
+    )
+    done = np.lib.format.open_memmap(
+        progress_file, mode='w+', dtype=bool, shape=(n_tiles, n_tiles)
+    )
+    return matrix, done
+
+
+def pairwise_trajectory_distances(
+    move_df: DataFrame,
+    id_: str = TRAJ_ID,
+    distance: str = MEDP,
+    latitude: str = LATITUDE,
+    longitude: str = LONGITUDE,
+    datetime: str = DATETIME,
+    filename: str | None = None,
+    tile_size: int = 256,
+    n_jobs: int | None = 1,
+    index: TrajectoryIndex | None = None,
+    **kwargs
+) -> tuple[ndarray, ndarray]:
+    """
+    Computes the distance between every pair of trajectories.
+
+    The upper triangle of the matrix is split in tiles of tile_size
+    trajectories, computed by n_jobs processes and mirrored to the lower
+    triangle. Measures that are not symmetric, like MEDP, are computed
+    from the trajectory that comes first in the matrix.
+
+    When filename is given the matrix is written to a float32 .npy memory
+    mapped file, with the computed tiles recorded in filename + '.tiles.npy'.
+    Calling the function again with the same data and filename resumes an
+    interrupted computation.
+
+    Parameters
+    ----------
+    move_df: dataframe
+        The input trajectory data.
+    id_: str, optional
+        Label of the trajectories dataframe user id, by default TRAJ_ID
+    distance: string, optional
+        Name of a distance measure registered in pymove.utils.distances,
+        by default MEDP
+    latitude: string, optional
+        Label of the trajectories dataframe referring to the latitude,
+        by default LATITUDE
+    longitude: string, optional
+        Label of the trajectories dataframe referring to the longitude,
+        by default LONGITUDE
+    datetime: string, optional
+        Label of the trajectories dataframe referring to the timestamp,
+        by default DATETIME
+    filename: string, optional
+        Path of the file storing the matrix, by default None,
+        keeping the matrix in memory
+    tile_size: int, optional
+        Number of trajectories in each side of a tile, by default 256
+    n_jobs: int, optional
+        Number of processes computing tiles, None using all processors,
+        by default 1
+    index: TrajectoryIndex, optional
+        Index of move_df, by default None
+    kwargs: optional
+        Parameters of the distance measure
+
+    Returns
+    -------
+    ndarray, ndarray
+        the distance matrix and the trajectory ids of its rows
+
+    Raises
+    ------
+        ValueError: if distance measure is invalid
+        ValueError: if filename holds a matrix of another shape
+
+    Examples
+    --------
+    >>> from pymove.query.query import pairwise_trajectory_distances
+    >>> move_df
+         lat      lon              datetime  id
+    0   33.1    -77.0   2012-05-19 00:00:00   1
+    1   32.8    -77.1   2012-05-19 06:00:00   2
+    2   32.5    -77.3   2012-05-19 12:00:00   3
+    >>> matrix, ids = pairwise_trajectory_distances(move_df)
+    >>> matrix
+    array([[0.        , 0.31622776, 0.6708204 ],
+           [0.31622776, 0.        , 0.36055514],
+           [0.6708204 , 0.36055514, 0.        ]], dtype=float32)
+    """
+    distances.get_distance(distance)
+    if index is None:
+        index = TrajectoryIndex(move_df, id_, latitude, longitude, datetime)
+
+    size = len(index)
+    bounds = [
+        (start, min(start + tile_size, size)) for start in range(0, size, tile_size)
+    ]
+    matrix, done = _open_matrix(filename, size, len(bounds))
+
+    tiles = [
+        (i, j) for i in range(len(bounds))
+        for j in range(i, len(bounds)) if not done[i, j]
+    ]
+
+    def arguments(tile):
+        rows, cols = bounds[tile[0]], bounds[tile[1]]
+        return (
+            rows, cols,
+            index.trajectories[rows[0]:rows[1]],
+            index.trajectories[cols[0]:cols[1]],
+            distance, kwargs
         )
 
-    return result
+    def store(tile, values):
+        (r0, r1), (c0, c1) = bounds[tile[0]], bounds[tile[1]]
+        if tile[0] == tile[1]:
+            values = values + values.T
+        matrix[r0:r1, c0:c1] = values
+        matrix[c0:c1, r0:r1] = values.T
+        if filename is not None:
+            matrix.flush()
+        done[tile] = True
+        if filename is not None:
+            done.flush()
+
+    logger.debug(f'Computing {len(tiles)} tiles of {distance} distances')
+    if n_jobs == 1:
+        for tile in progress_bar(tiles, desc='Computing distances'):
+            store(tile, _distance_tile(*arguments(tile)))
+    else:
+        workers = n_jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for tile, values in progress_bar(
+                _bounded_tiles(executor, tiles, arguments, 2 * workers),
+                desc='Computing distances', total=len(tiles)
+            ):
+                store(tile, values)
+
+    return matrix, index.ids.to_numpy()
+
+
+def _bounded_tiles(
+    executor: ProcessPoolExecutor,
+    tiles: list[tuple[int, int]],
+    arguments: Callable,
+    in_flight: int
+) -> Generator[tuple[tuple[int, int], ndarray], None, None]:
+    """
+    Computes tiles in the executor, keeping a bounded number in flight.
+
+    Parameters
+    ----------
+    executor: ProcessPoolExecutor
+        Executor computing the tiles.
+    tiles: list of tuples
+        Row and column of the tiles to compute.
+    arguments: callable
+        Returns the arguments of _distance_tile for a tile.
+    in_flight: int
+        Maximum number of tiles submitted and not yet returned.
+
+    Returns
+    -------
+    generator
+        The tiles and their distances, in the order they finish
+    """
+    pending = iter(tiles)
+    futures: dict[Future, tuple[int, int]] = {}
+    while True:
+        for tile in pending:
+            futures[executor.submit(_distance_tile, *arguments(tile))] = tile
+            if len(futures) >= in_flight:
+                break
+        if not futures:
+            return
+        finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in finished:
+            yield futures.pop(future), future.result()
 
 
 def _datetime_filter(
@@ -349,7 +1040,8 @@ def query_all_points_by_range(
     traj1: DataFrame,
     move_df: DataFrame,
     minimum_meters: float = 100,
-    minimum_time: timedelta = None
+    minimum_time: timedelta | None = None,
+    index: SpatioTemporalIndex | None = None
 ) -> DataFrame:
     """
     Queries closest point within a spatial range based on meters and a temporal range.
@@ -368,8 +1060,8 @@ def query_all_points_by_range(
         the minimum spatial distance, based in meters, between the points, by default 100
     minimum_time: datetime.timedelta, optional
         the minimum temporal distance between the points, by default timedelta(minutes=2)
-    datetime_label: string, optional
-        the label that refers to the datetime label of the dataframes, by default DATETIME
+    index: SpatioTemporalIndex, optional
+        Index of move_df, reused between queries, by default None
 
     Returns
     -------
@@ -402,15 +1094,31 @@ def query_all_points_by_range(
     if minimum_time is None:
         minimum_time = timedelta(minutes=2)
 
-    result = DataFrame([])
-    total = traj1.shape[0]
-    for _, row in progress_bar(
-        traj1.iterrows(),
-        desc='Querying all points by temporal and spatial distance',
-        total=total
-    ):
-        coinc_points = _meters_filter(row, move_df, minimum_meters)
-        coinc_points = _datetime_filter(row, coinc_points, minimum_time)
-        result = coinc_points.append(result)
+    if index is None:
+        index = SpatioTemporalIndex(move_df)
+
+    logger.debug('Querying all points by temporal and spatial distance')
+    targets, found = index.query(
+        traj1[LATITUDE], traj1[LONGITUDE], traj1[DATETIME],
+        minimum_meters, minimum_time
+    )
+    # matches of the last points of traj1 come first
+    order = np.lexsort((found, -targets))
+    targets, found = targets[order], found[order]
+
+    result = DataFrame(move_df).iloc[found].copy()
+    result['spatial_distance'] = distances.euclidean_distance_in_meters(
+        lat1=traj1[LATITUDE].to_numpy()[targets],
+        lon1=traj1[LONGITUDE].to_numpy()[targets],
+        lat2=result[LATITUDE].to_numpy(),
+        lon2=result[LONGITUDE].to_numpy()
+    )
+    result['target_id'] = traj1[TRAJ_ID].to_numpy()[targets]
+    result['target_lat'] = traj1[LATITUDE].to_numpy()[targets]
+    result['target_lon'] = traj1[LONGITUDE].to_numpy()[targets]
+    result['target_datetime'] = traj1[DATETIME].to_numpy()[targets]
+    result['temporal_distance'] = (
+        result[DATETIME] - result['target_datetime']
+    ).abs()
 
     return result
@@ -381,6 +381,7 @@ def create_or_update_short_trajectory(
         max_dist_between_adj_points=max_dist_between_adj_points,
         max_time_between_adj_points=max_time_between_adj_points,
         max_speed_between_adj_points=max_speed_between_adj_points,
+        drop_single_points=False,
         label_new_tid=label_tid,
         inplace=True
     )
@@ -440,6 +441,7 @@ def create_or_update_gps_block_signal(
     segmentation.by_max_dist(
         move_data,
         max_dist_between_adj_points=0.0,
+        drop_single_points=False,
         label_new_tid=label_tid,
         inplace=True
     )
@@ -8,7 +8,7 @@ from pandas.testing import assert_frame_equal
 from shapely.geometry import Polygon
 
 from pymove import MoveDataFrame
-from pymove.core.grid import Grid
+from pymove.core.grid import Grid, GridPyramid
 from pymove.utils.constants import DATETIME, LATITUDE, LONGITUDE, TRAJ_ID
 
 list_data = [
@@ -221,6 +221,81 @@ def test_create_one_polygon_to_point_on_grid():
     assert_array_almost_equal(polygon_coordinates, expected)
 
 
+def test_create_polygons_to_cells_on_grid():
+    expected = [
+        [116.31937134, 39.984094],
+        [116.31937134, 39.98422934],
+        [116.31950668, 39.98422934],
+        [116.31950668, 39.984094],
+        [116.31937134, 39.984094],
+    ]
+
+    grid = _default_grid()
+
+    polygons = grid.create_polygons_to_cells_on_grid(
+        index_grid_lat=[0, 1, 0], index_grid_lon=[1, 1, 1]
+    )
+
+    assert len(polygons) == 3
+    assert polygons[0] is polygons[2]
+    assert_array_almost_equal(array(polygons[0].exterior.coords), expected)
+    assert_array_almost_equal(
+        array(polygons[1].exterior.coords)[:, 1] - array(expected)[:, 1],
+        [grid.cell_size_by_degree] * 5
+    )
+
+
+def test_create_all_polygons_on_grid():
+    grid = _default_grid()
+
+    grid.create_all_polygons_on_grid()
+    assert grid.grid_polygon.shape == (5, 5)
+    assert grid.grid_cells is None
+
+    grid.create_all_polygons_on_grid(_default_move_df())
+    assert grid.grid_polygon is None
+    assert_equal(grid.grid_cells, [0, 5, 18, 24])
+
+    grid.create_all_polygons_on_grid()
+    assert grid.grid_polygon.shape == (5, 5)
+    assert grid.grid_cells is None
+    assert grid.get_cells_bounds().shape == (25, 4)
+    assert len(grid.get_cells_polygons()) == 25
+
+
+def test_get_cells_polygons():
+    expected = [
+        [116.31937134, 39.984094],
+        [116.31937134, 39.98422934],
+        [116.31950668, 39.98422934],
+        [116.31950668, 39.984094],
+        [116.31937134, 39.984094],
+    ]
+
+    grid = _default_grid()
+    grid.create_all_polygons_on_grid(_default_move_df())
+
+    assert_array_almost_equal(
+        grid.get_cells_bounds(),
+        [
+            [116.319236, 39.984094, 116.31937134, 39.98422934],
+            [116.31937134, 39.984094, 116.31950668, 39.98422934],
+            [116.31964202, 39.98450002, 116.31977736, 39.98463536],
+            [116.31977736, 39.98463536, 116.3199127, 39.9847707],
+        ]
+    )
+
+    polygons = grid.get_cells_polygons()
+    assert len(polygons) == 4
+    assert_array_almost_equal(array(polygons[1].exterior.coords), expected)
+
+    features = list(grid.get_cells_geojson(cells=[5], chunk_size=1))
+    assert len(features) == 1
+    assert features[0]['properties'] == {'index_grid': 5}
+    assert_array_almost_equal(features[0]['geometry']['coordinates'][0], expected)
+    assert len(list(grid.get_cells_geojson(chunk_size=3))) == 4
+
+
 def test_create_all_polygons_to_all_point_on_grid():
     expected = DataFrame(
         data=[
@@ -247,6 +322,11 @@ def test_create_all_polygons_to_all_point_on_grid():
     b = expected.iloc[0]['polygon'].exterior.xy
     assert_array_almost_equal(a, b)
 
+    all_cells = grid.create_all_polygons_to_all_point_on_grid(
+        move_df, create_polygons=False
+    )
+    assert_frame_equal(all_cells, expected.drop(columns='polygon'))
+
 
 def test_point_to_index_grid():
     grid = _default_grid()
@@ -308,3 +388,41 @@ def read_grid_pkl(tmpdir):
     saved_grid = saved_grid.get_grid()
 
     assert_equal(saved_grid, expected)
+
+
+def test_grid_pyramid():
+    move_df = _default_move_df()
+    move_df.generate_speed_features()
+    pyramid = GridPyramid(move_df, cell_size=15, levels=3)
+
+    expected = DataFrame({
+        'index_grid': [0, 5, 18, 24],
+        'index_grid_lat': [0, 0, 3, 4],
+        'index_grid_lon': [0, 1, 3, 4],
+        'count': [2, 3, 3, 2],
+        'distinct_ids': [1.0019582262108968] * 4,
+        'mean_speed': [
+            13.690153134343692, 0.8076361631920191,
+            1.0760829782748815, 17.255297864820253
+        ],
+    })
+    assert_frame_equal(pyramid.get_level_statistics(0), expected)
+
+    expected = DataFrame({
+        'index_grid': [0, 4],
+        'index_grid_lat': [0, 1],
+        'index_grid_lon': [0, 1],
+        'count': [5, 3],
+        'distinct_ids': [1.0019582262108968] * 2,
+        'mean_speed': [4.028265405979937, 1.0760829782748815],
+    })
+    assert_frame_equal(
+        pyramid.get_level_statistics(
+            1, bbox=(39.984094, 116.319236, 39.9845, 116.3197)
+        ),
+        expected
+    )
+
+    statistics = pyramid.get_level_statistics(2)
+    assert_equal(statistics['count'].to_numpy(), [8, 2])
+    assert_equal(pyramid.get_level_grid(2).grid_cells, [0, 3])
@@ -20,6 +20,7 @@ from pymove.utils.constants import (
     DATETIME,
     DAY,
     DIST_PREV_TO_NEXT,
+    DIST_TO_NEXT,
     DIST_TO_PREV,
     HOUR,
     HOUR_SIN,
@@ -29,8 +30,10 @@ from pymove.utils.constants import (
     PERIOD,
     SITUATION,
     SPEED_PREV_TO_NEXT,
+    SPEED_TO_PREV,
     TID,
     TIME_PREV_TO_NEXT,
+    TIME_TO_NEXT,
     TRAJ_ID,
     TYPE_DASK,
     TYPE_PANDAS,
@@ -896,6 +899,56 @@ def test_generate_dist_time_speed_features():
     assert_frame_equal(move_df, expected)
 
 
+def test_generate_dist_time_speed_features_engines():
+    move_df = MoveDataFrame(
+        data=[
+            [39.984094, 116.319236, '2008-10-23 05:53:05', 1],
+            [39.984559, 116.326696, '2008-10-23 10:37:26', 2],
+            [39.984198, 116.319322, '2008-10-23 05:53:06', 1],
+            [40.002899, 116.321520, '2008-10-23 10:50:16', 3],
+            [39.984224, 116.319402, '2008-10-23 05:53:11', 1],
+            [40.016238, 116.307691, '2008-10-23 11:03:06', 2],
+        ]
+    )
+
+    vectorized = move_df.generate_dist_time_speed_features(inplace=False)
+    loop = move_df.generate_dist_time_speed_features(
+        inplace=False, engine='loop'
+    )
+    assert_frame_equal(vectorized, loop)
+
+    try:
+        move_df.generate_dist_time_speed_features(engine='unknown')
+        raise AssertionError('ValueError not raised by PandasMoveDataFrame')
+    except ValueError:
+        pass
+
+
+def test_generate_dist_time_speed_features_columns():
+    move_df = _default_move_df()
+
+    columns = [SPEED_PREV_TO_NEXT, DIST_TO_NEXT, TIME_PREV_TO_NEXT]
+    new_move_df = move_df.generate_dist_time_speed_features(
+        inplace=False, columns=columns
+    )
+    dists = move_df.generate_dist_features(inplace=False)
+    times = move_df.generate_time_features(inplace=False)
+    speeds = move_df.generate_speed_features(inplace=False)
+
+    assert list(new_move_df.columns) == [
+        TRAJ_ID, LATITUDE, LONGITUDE, DATETIME, *columns
+    ]
+    assert_series_equal(new_move_df[DIST_TO_NEXT], dists[DIST_TO_NEXT])
+    assert_series_equal(new_move_df[TIME_PREV_TO_NEXT], times[TIME_PREV_TO_NEXT])
+    assert_series_equal(new_move_df[SPEED_PREV_TO_NEXT], speeds[SPEED_PREV_TO_NEXT])
+
+    try:
+        move_df.generate_dist_time_speed_features(columns=['unknown'])
+        raise AssertionError('ValueError not raised by PandasMoveDataFrame')
+    except ValueError:
+        pass
+
+
 def test_generate_dist_features():
     move_df = _default_move_df()
 
@@ -1082,6 +1135,54 @@ def test_generate_speed_features():
     assert_frame_equal(move_df, expected)
 
 
+def test_get_last_points():
+    move_df = _default_move_df()
+
+    expected = DataFrame(
+        data=[
+            [39.984198, 116.319322, Timestamp('2008-10-23 05:53:06'), 1],
+            [39.984224, 116.319402, Timestamp('2008-10-23 05:53:11'), 3],
+        ],
+        columns=['lat', 'lon', 'datetime', 'position'],
+        index=Series([1, 2], name='id'),
+    )
+    assert_frame_equal(move_df.get_last_points(), expected)
+
+
+def test_append_dist_time_speed_features():
+    columns = [DIST_TO_PREV, DIST_TO_NEXT, SPEED_TO_PREV, TIME_TO_NEXT]
+    data = [
+        [39.984094, 116.319236, '2008-10-23 05:53:05', 1],
+        [39.984559, 116.326696, '2008-10-23 10:37:26', 2],
+        [39.984198, 116.319322, '2008-10-23 10:53:06', 1],
+        [40.002899, 116.321520, '2008-10-23 10:50:16', 3],
+        [39.984224, 116.319402, '2008-10-23 10:55:11', 1],
+        [40.016238, 116.307691, '2008-10-23 11:03:06', 2],
+        [40.013814, 116.306525, '2008-10-23 11:58:33', 4],
+    ]
+    expected = MoveDataFrame(data).generate_dist_time_speed_features(
+        inplace=False, columns=columns
+    )
+    expected = expected[[LATITUDE, LONGITUDE, DATETIME, TRAJ_ID, *columns]]
+
+    move_df = MoveDataFrame(data[:3])
+    move_df.generate_dist_time_speed_features(columns=columns)
+    move_df = MoveDataFrame(move_df[[LATITUDE, LONGITUDE, DATETIME, TRAJ_ID, *columns]])
+
+    last_points = move_df.append_dist_time_speed_features(
+        DataFrame(data[3:5], columns=[LATITUDE, LONGITUDE, DATETIME, TRAJ_ID]),
+        columns=columns
+    )
+    last_points = move_df.append_dist_time_speed_features(
+        DataFrame(data[5:], columns=[LATITUDE, LONGITUDE, DATETIME, TRAJ_ID]),
+        last_points,
+        columns=columns
+    )
+    assert_frame_equal(move_df, expected)
+    assert_array_equal(last_points.index, [3, 1, 2, 4])
+    assert_array_equal(last_points['position'], [3, 4, 5, 6])
+
+
 def test_generate_move_and_stop_by_radius():
     move_df = _default_move_df()
 
@@ -1,4 +1,7 @@
+import numpy as np
 from numpy.testing import assert_almost_equal, assert_equal
+from pandas import Series
+from pandas.testing import assert_series_equal
 
 from pymove import MoveDataFrame, clustering
 from pymove.utils.constants import DATETIME, LATITUDE, LONGITUDE, N_CLUSTER, TRAJ_ID
@@ -75,3 +78,23 @@ def test_dbscan_clustering():
     clustering.dbscan_clustering(move_df, 'day', min_sample=3, inplace=True)
     clusters = move_df[N_CLUSTER].unique()
     assert_equal(expected, clusters)
+
+
+def test_dbscan_trajectory_clustering():
+    distances = np.array([
+        [0., 1., 2., 9., 9.],
+        [1., 0., 1., 9., 9.],
+        [2., 1., 0., 9., 8.],
+        [9., 9., 9., 0., 1.],
+        [9., 9., 8., 1., 0.]
+    ])
+
+    result = clustering.dbscan_trajectory_clustering(
+        distances, ids=['a', 'b', 'c', 'd', 'e'], eps=1, min_samples=2, chunk_size=2
+    )
+    expected = Series([0, 0, 0, 1, 1], index=['a', 'b', 'c', 'd', 'e'], name=N_CLUSTER)
+    assert_series_equal(result, expected)
+
+    result = clustering.dbscan_trajectory_clustering(distances, eps=1, min_samples=3)
+    expected = Series([0, 0, 0, -1, -1], name=N_CLUSTER)
+    assert_series_equal(result, expected)
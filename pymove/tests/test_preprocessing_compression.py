@@ -233,3 +233,82 @@ def test_compress_segment_to_stop_point():
     )
     assert_frame_equal(move_df, expected)
     assert move_df.len() == 2
+
+
+def test_compress_segment_to_stop_point_repeated_points():
+    move_df = MoveDataFrame(
+        data=[
+            [39.984093, 116.319237, '2008-10-23 05:53:05', 1],
+            [39.984200, 116.319321, '2008-10-23 05:53:06', 1],
+            [39.984211, 116.319389, '2008-10-23 05:53:11', 1],
+            [39.984222, 116.319405, '2008-10-23 05:53:16', 1],
+            [39.984211, 116.319389, '2008-10-23 05:53:21', 1],
+            [39.984222, 116.319405, '2008-10-23 05:53:26', 1],
+            [39.984219, 116.319420, '2008-10-23 05:53:31', 1],
+            [39.984250, 116.319450, '2008-10-23 05:53:36', 2],
+            [39.984240, 116.319460, '2008-10-23 05:53:41', 2],
+            [39.984240, 116.319460, '2008-10-23 05:53:46', 2],
+            [39.984300, 116.319500, '2008-10-23 05:53:51', 2],
+        ],
+        latitude=LATITUDE,
+        longitude=LONGITUDE,
+        datetime=DATETIME,
+        traj_id=TRAJ_ID,
+    )
+    move_df[SEGMENT_STOP] = [1, 2, 3, 3, 3, 3, 3, 4, 4, 4, 5]
+    move_df[STOP] = [
+        True, False, True, True, True, True, True, True, True, True, True
+    ]
+    move_df.index = [30, 20, 10, 90, 80, 70, 60, 50, 40, 35, 5]
+    cols = [
+        'lat',
+        'lon',
+        'datetime',
+        'id',
+        'segment_stop',
+        'stop',
+        'lat_mean',
+        'lon_mean',
+    ]
+
+    # stop segments with a single point are dropped, and segment 3 has
+    # two points repeated twice, the greatest one is used
+    compressed_trajs_mean = compression.compress_segment_stop_to_point(move_df)
+    expected = DataFrame(
+        data=[
+            [39.9842, 116.319321, Timestamp('2008-10-23 05:53:06'),
+             1, 2, False, nan, nan],
+            [39.984211, 116.319389, Timestamp('2008-10-23 05:53:11'),
+             1, 3, True, 39.984222, 116.319405],
+            [39.984219, 116.31942, Timestamp('2008-10-23 05:53:31'),
+             1, 3, True, 39.984222, 116.319405],
+            [39.98425, 116.31945, Timestamp('2008-10-23 05:53:36'),
+             2, 4, True, 39.98424, 116.31946],
+            [39.98424, 116.31946, Timestamp('2008-10-23 05:53:46'),
+             2, 4, True, 39.98424, 116.31946],
+        ],
+        columns=cols,
+        index=[20, 10, 60, 50, 35],
+    )
+    assert_frame_equal(compressed_trajs_mean, expected)
+    assert move_df.len() == 11
+
+    compressed_trajs_centroid = compression.compress_segment_stop_to_point(
+        move_df, point_mean='centroid', drop_moves=True
+    )
+    expected = DataFrame(
+        data=[
+            [39.984211, 116.319389, Timestamp('2008-10-23 05:53:11'),
+             1, 3, True, 39.984217, 116.3194016],
+            [39.984219, 116.31942, Timestamp('2008-10-23 05:53:31'),
+             1, 3, True, 39.984217, 116.3194016],
+            [39.98425, 116.31945, Timestamp('2008-10-23 05:53:36'),
+             2, 4, True, 39.98424333333333, 116.31945666666667],
+            [39.98424, 116.31946, Timestamp('2008-10-23 05:53:46'),
+             2, 4, True, 39.98424333333333, 116.31945666666667],
+        ],
+        columns=cols,
+        index=[10, 60, 50, 35],
+    )
+    assert_frame_equal(compressed_trajs_centroid, expected)
+    assert move_df.len() == 11
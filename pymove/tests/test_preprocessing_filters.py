@@ -9,6 +9,7 @@ from pymove.utils.constants import (
     DIST_PREV_TO_NEXT,
     DIST_TO_NEXT,
     DIST_TO_PREV,
+    DROPS_BY_ROUND,
     LATITUDE,
     LONGITUDE,
     SPEED_TO_PREV,
@@ -634,18 +635,18 @@ def test_clean_gps_jumps_by_distance():
                 39.9842,
                 116.319321,
                 Timestamp('2008-10-23 05:53:06'),
-                13.884481484192932,
-                140454.64510608764,
-                140440.86267282354,
+                13.884481484192934,
+                7.56333599994185,
+                20.26409954543268,
             ],
             [
                 1,
                 39.984222,
                 116.319405,
                 Timestamp('2008-10-23 05:53:16'),
-                140460.97747220137,
-                1.3208180727070074,
-                140461.50100279532,
+                7.56333599994185,
+                1.3208180727070076,
+                8.695359970695334,
             ],
             [
                 1,
@@ -662,6 +663,7 @@ def test_clean_gps_jumps_by_distance():
     )
     assert_frame_equal(not_jumps, expected)
     assert move_df.len() == 5
+    assert not_jumps.attrs[DROPS_BY_ROUND] == [1]
 
     filters.clean_gps_jumps_by_distance(
         move_data=move_df, jump_coefficient=1, inplace=True
@@ -684,7 +686,7 @@ def test_clean_gps_nearby_points_by_distances():
                 116.319237,
                 Timestamp('2008-10-23 05:53:05'),
                 nan,
-                13.884481484192932,
+                140440.86267282354,
                 nan,
             ],
             [
@@ -692,9 +694,9 @@ def test_clean_gps_nearby_points_by_distances():
                 38.984211,
                 115.319389,
                 Timestamp('2008-10-23 05:53:11'),
-                140454.64510608764,
+                140440.86267282354,
                 140460.97747220137,
-                7.563335999941849,
+                20.26409954543268,
             ],
             [
                 1,
@@ -702,8 +704,8 @@ def test_clean_gps_nearby_points_by_distances():
                 116.319405,
                 Timestamp('2008-10-23 05:53:16'),
                 140460.97747220137,
-                1.3208180727070074,
-                140461.50100279532,
+                nan,
+                nan,
             ],
         ],
         columns=cols,
@@ -719,6 +721,54 @@ def test_clean_gps_nearby_points_by_distances():
     assert move_df.len() == 3
 
 
+def test_clean_gps_nearby_points_by_distances_updates_neighbours():
+    move_df = MoveDataFrame(
+        data=[
+            [39.984, 116.319, '2008-10-23 05:53:05', 1],
+            [39.984072, 116.319, '2008-10-23 05:53:06', 1],
+            [39.983928, 116.319, '2008-10-23 05:53:07', 1],
+            [39.994, 116.319, '2008-10-23 05:53:08', 1],
+        ],
+        latitude=LATITUDE,
+        longitude=LONGITUDE,
+        datetime=DATETIME,
+        traj_id=TRAJ_ID,
+    )
+    move_df.generate_dist_features()
+
+    not_nearby = filters.clean_gps_nearby_points_by_distances(
+        move_df, radius_area=10
+    )
+    expected = DataFrame(
+        data=[
+            [
+                1,
+                39.984,
+                116.319,
+                Timestamp('2008-10-23 05:53:05'),
+                nan,
+                1111.949266445518,
+                nan,
+            ],
+            [
+                1,
+                39.994,
+                116.319,
+                Timestamp('2008-10-23 05:53:08'),
+                1111.949266445518,
+                nan,
+                nan,
+            ],
+        ],
+        columns=['id', 'lat', 'lon', 'datetime', DIST_TO_PREV,
+                 DIST_TO_NEXT, DIST_PREV_TO_NEXT],
+        index=[0, 3],
+    )
+    assert_frame_equal(not_nearby, expected)
+    assert not_nearby.attrs[DROPS_BY_ROUND] == [1, 1]
+    assert DROPS_BY_ROUND not in move_df.attrs
+
+
 def test_clean_gps_nearby_points_by_speed():
     move_df, cols = _prepare_df_with_dist_time_speed()
 
@@ -117,7 +117,8 @@ def test_by_max_dist():
     move_df, cols = _prepare_df_tid(TID_DIST)
 
     segmented_dist = segmentation.by_max_dist(
-        move_df, max_dist_between_adj_points=0.5, inplace=False
+        move_df, max_dist_between_adj_points=0.5,
+        drop_single_points=False, inplace=False
     )
     expected = DataFrame(
         data=[
@@ -169,17 +170,59 @@ def test_by_max_dist():
     assert move_df.shape[1] == 4
 
     segmentation.by_max_dist(
-        move_df, max_dist_between_adj_points=0.5, inplace=True
+        move_df, max_dist_between_adj_points=0.5,
+        drop_single_points=False, inplace=True
     )
     assert_frame_equal(move_df, expected)
     assert move_df.shape[1] == 8
 
 
+def test_by_max_dist_drop_single_points():
+    move_df, cols = _prepare_df_tid(TID_DIST)
+
+    segmented_dist = segmentation.by_max_dist(
+        move_df, max_dist_between_adj_points=0.5
+    )
+    expected = DataFrame(
+        data=[
+            [
+                2,
+                39.984224,
+                116.319402,
+                Timestamp('2008-10-23 05:53:11'),
+                nan,
+                nan,
+                nan,
+                3,
+            ],
+            [
+                2,
+                39.984224,
+                116.319402,
+                Timestamp('2008-10-23 05:53:15'),
+                0.0,
+                4.0,
+                0.000000,
+                3,
+            ],
+        ],
+        columns=cols,
+        index=[0, 1],
+    )
+    assert_frame_equal(segmented_dist, expected)
+
+    segmented_time = segmentation.by_max_time(
+        move_df, max_time_between_adj_points=0
+    )
+    assert segmented_time.shape == (0, 8)
+
+
 def test_by_max_time():
     move_df, cols = _prepare_df_tid(TID_TIME)
 
     segmented_time = segmentation.by_max_time(
-        move_df, max_time_between_adj_points=0, inplace=False
+        move_df, max_time_between_adj_points=0,
+        drop_single_points=False, inplace=False
     )
 
     expected = DataFrame(
@@ -232,7 +275,8 @@ def test_by_max_time():
     assert move_df.shape[1] == 4
 
     segmentation.by_max_time(
-        move_df, max_time_between_adj_points=0, inplace=True
+        move_df, max_time_between_adj_points=0,
+        drop_single_points=False, inplace=True
     )
     assert_frame_equal(move_df, expected)
     assert move_df.shape[1] == 8
@@ -242,7 +286,8 @@ def test_by_max_speed():
     move_df, cols = _prepare_df_tid(TID_SPEED)
 
     segmented_speed = segmentation.by_max_speed(
-        move_df, max_speed_between_adj_points=10, inplace=False
+        move_df, max_speed_between_adj_points=10,
+        drop_single_points=False, inplace=False
     )
     expected = DataFrame(
         data=[
@@ -294,7 +339,8 @@ def test_by_max_speed():
     assert move_df.shape[1] == 4
 
     segmentation.by_max_speed(
-        move_df, max_speed_between_adj_points=0, inplace=True
+        move_df, max_speed_between_adj_points=0,
+        drop_single_points=False, inplace=True
     )
     assert_frame_equal(move_df, expected)
     assert move_df.shape[1] == 8
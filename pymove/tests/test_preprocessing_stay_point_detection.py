@@ -167,3 +167,56 @@ def test_create_or_update_move_and_stop_by_radius():
         index=[0, 1, 2, 3],
     )
     assert_frame_equal(move_df, expected)
+
+
+def test_detect_stay_points():
+    move_df = MoveDataFrame(
+        data=list_data_test + [
+            [39.994219, 116.319420, '2008-10-23 05:53:25', 1],
+            [39.984094, 116.319236, '2008-10-23 05:53:05', 2],
+            [39.984198, 116.319322, '2008-10-23 05:53:06', 2],
+        ],
+        latitude=LATITUDE,
+        longitude=LONGITUDE,
+        datetime=DATETIME,
+        traj_id=TRAJ_ID,
+    )
+    expected = DataFrame(
+        data=[
+            [
+                1,
+                39.984189,
+                116.3193544,
+                Timestamp('2008-10-23 05:53:05'),
+                Timestamp('2008-10-23 05:53:21'),
+            ],
+        ],
+        columns=['id', 'lat', 'lon', 'arrival', 'departure'],
+    )
+
+    stay_points = stay_point_detection.detect_stay_points(
+        move_df, dist_radius=50, time_radius=10
+    )
+    assert_frame_equal(stay_points, expected)
+
+    stay_points = stay_point_detection.detect_stay_points(
+        move_df, dist_radius=50, time_radius=10, n_jobs=2
+    )
+    assert_frame_equal(stay_points, expected)
+
+    stay_points = stay_point_detection.detect_stay_points(
+        move_df, dist_radius=50, time_radius=1
+    )
+    assert_frame_equal(stay_points.iloc[1:], DataFrame(
+        data=[
+            [
+                2,
+                39.984146,
+                116.319279,
+                Timestamp('2008-10-23 05:53:05'),
+                Timestamp('2008-10-23 05:53:06'),
+            ],
+        ],
+        columns=['id', 'lat', 'lon', 'arrival', 'departure'],
+        index=[1],
+    ))
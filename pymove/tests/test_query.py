@@ -1,6 +1,9 @@
+import os
 from datetime import timedelta
 
-from pandas import DataFrame, Timedelta, Timestamp
+import numpy as np
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+from pandas import DataFrame, Timedelta, Timestamp, concat
 from pandas.testing import assert_frame_equal
 
 from pymove import MoveDataFrame
@@ -505,6 +508,44 @@ def test_range_query():
     assert_frame_equal(medt_move_df, expected_medt)
 
 
+def test_range_query_batch():
+    traj_df = _default_traj_df()
+    move_df = _default_move_df()
+    trajs = concat([traj_df, move_df.loc[30:38]])
+
+    result = query.range_query_batch(trajs, move_df, min_dist=100, distance='MEDP')
+    expected = DataFrame({
+        'query_id': ['            GONZALO', '            GONZALO',
+                     '             HELENE', '             HELENE'],
+        'match_id': ['            ERNESTO', '             HELENE',
+                     '            ERNESTO', '             HELENE'],
+        'distance': [32.182511, 33.516565, 9.49338, 0.0],
+    })
+    assert_frame_equal(result, expected)
+
+    index = query.TrajectoryIndex(move_df)
+    result = query.range_query_batch(
+        traj_df, move_df, min_dist=700, distance='MEDT', index=index
+    )
+    expected = DataFrame({
+        'query_id': ['            GONZALO', '            GONZALO'],
+        'match_id': ['            ERNESTO', '             HELENE'],
+        'distance': [695.236451, 619.941704],
+    })
+    assert_frame_equal(result, expected)
+
+    result = query.range_query_batch(traj_df, move_df, min_dist=10)
+    assert result.shape == (0, 3)
+
+    try:
+        query.range_query_batch(traj_df, move_df, distance='UNKNOWN')
+        raise AssertionError(
+            'ValueError error not raised by range_query_batch'
+        )
+    except ValueError:
+        pass
+
+
 def test_knn_query():
     traj_df = _default_traj_df()
     move_df = _default_move_df()
@@ -516,9 +557,10 @@ def test_knn_query():
                30, 31, 32, 33, 34, 35, 36, 37, 38]
     )
     expected_medt = DataFrame(
-        data=expected_knn_medt_data,
+        data=expected_knn_medt_data + expected_knn_medp_data[10:20],
         columns=['lat', 'lon', 'datetime', 'id'],
-        index=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 30, 31, 32, 33, 34, 35, 36, 37, 38]
+        index=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 30, 31, 32, 33, 34, 35, 36, 37, 38,
+               20, 21, 22, 23, 24, 25, 26, 27, 28, 29]
     )
 
     medp_move_df = query.knn_query(traj_df, move_df, k=2, distance='MEDP')
@@ -527,6 +569,134 @@ def test_knn_query():
     medt_move_df = query.knn_query(traj_df, move_df, k=2, distance='MEDT')
     assert_frame_equal(medt_move_df, expected_medt)
 
+
+def test_trajectory_index():
+    traj_df = _default_traj_df()
+    move_df = _default_move_df()
+    index = query.TrajectoryIndex(move_df)
+
+    assert len(index) == 4
+    assert_frame_equal(
+        index.get_trajectory('             HELENE'), move_df.loc[30:38]
+    )
+
+    for distance in ['MEDP', 'MEDT']:
+        exact = index.exact_distances(traj_df, range(len(index)), distance)
+        bounds = index.lower_bounds(traj_df, distance)
+        assert (bounds <= exact).all()
+
+    assert_array_almost_equal(
+        index.exact_distances(traj_df, range(len(index)), 'MEDP'),
+        [241.919237, 149.667549, 32.182511, 33.516565]
+    )
+    assert_array_almost_equal(
+        index.exact_distances(traj_df, range(len(index)), 'MEDT'),
+        [796.005884, 755.902036, 695.236451, 619.941704]
+    )
+
+    neighbors = index.knn(traj_df, k=3, distance='MEDP')
+    assert [traj_id for _, traj_id in neighbors] == [
+        '            ERNESTO', '             HELENE', '              CHRIS'
+    ]
+    neighbors = index.knn(
+        traj_df, k=3, distance='MEDP', exclude=['            ERNESTO']
+    )
+    assert [traj_id for _, traj_id in neighbors] == [
+        '             HELENE', '              CHRIS', '            ALBERTO'
+    ]
+
+    for distance, kwargs in [
+        ('DTW', {'window': 2}), ('FRECHET', {}), ('HAUSDORFF', {}),
+        ('EDR', {'epsilon': 5}), ('LCSS', {'epsilon': 5}),
+    ]:
+        exact = index.exact_distances(traj_df, range(len(index)), distance, **kwargs)
+        bounds = index.lower_bounds(traj_df, distance, **kwargs)
+        assert (bounds <= exact).all()
+        neighbors = index.knn(traj_df, k=2, distance=distance, **kwargs)
+        assert [d for d, _ in neighbors] == sorted(exact)[:2]
+
+    medp_move_df = query.knn_query(traj_df, move_df, k=2, index=index)
+    assert_frame_equal(medp_move_df, query.knn_query(traj_df, move_df, k=2))
+
+    try:
+        index.knn(traj_df, distance='UNKNOWN')
+        raise AssertionError('ValueError error not raised by TrajectoryIndex.knn')
+    except ValueError:
+        pass
+
+def test_pairwise_trajectory_distances(tmpdir):
+    move_df = _default_move_df()
+    expected = np.array([
+        [0., 102.401184, 236.39932, 251.22629],
+        [102.401184, 0., 205.17769, 209.75229],
+        [236.39932, 205.17769, 0., 9.906163],
+        [251.22629, 209.75229, 9.906163, 0.]
+    ])
+
+    matrix, ids = query.pairwise_trajectory_distances(move_df)
+    assert matrix.dtype == np.float32
+    assert_array_almost_equal(matrix, expected, decimal=4)
+    assert_array_equal(
+        ids, ['            ALBERTO', '              CHRIS',
+              '            ERNESTO', '             HELENE']
+    )
+
+    matrix, _ = query.pairwise_trajectory_distances(
+        move_df, tile_size=3, n_jobs=2
+    )
+    assert_array_almost_equal(matrix, expected, decimal=4)
+
+    d = tmpdir.mkdir('query')
+    filename = os.path.join(d, 'distances.npy')
+    query.pairwise_trajectory_distances(move_df, filename=filename, tile_size=3)
+    assert_array_almost_equal(np.load(filename), expected, decimal=4)
+
+    matrix = np.load(filename, mmap_mode='r+')
+    matrix[0, 1] = matrix[1, 0] = -1
+    matrix[:3, 3] = matrix[3, :3] = -1
+    matrix.flush()
+    done = np.load(filename + '.tiles.npy', mmap_mode='r+')
+    done[0, 1] = False
+    done.flush()
+    del matrix, done
+
+    matrix, _ = query.pairwise_trajectory_distances(
+        move_df, filename=filename, tile_size=3
+    )
+    expected[0, 1] = expected[1, 0] = -1
+    assert_array_almost_equal(matrix, expected, decimal=4)
+
+    # more tiles than the ones kept in flight by the workers
+    expected[0, 1] = expected[1, 0] = 102.401184
+    filename = os.path.join(d, 'tiles.npy')
+    matrix, _ = query.pairwise_trajectory_distances(
+        move_df, filename=filename, tile_size=1, n_jobs=2
+    )
+    assert_array_almost_equal(matrix, expected, decimal=4)
+
+    matrix[2, 3] = matrix[3, 2] = -1
+    matrix[0, 0] = -1
+    matrix.flush()
+    done = np.load(filename + '.tiles.npy', mmap_mode='r+')
+    done[0, 0] = False
+    done.flush()
+    del matrix, done
+
+    matrix, _ = query.pairwise_trajectory_distances(
+        move_df, filename=filename, tile_size=1, n_jobs=2
+    )
+    expected[2, 3] = expected[3, 2] = -1
+    assert_array_almost_equal(matrix, expected, decimal=4)
+
+    try:
+        query.pairwise_trajectory_distances(move_df, filename=filename, tile_size=3)
+        raise AssertionError(
+            'ValueError error not raised by pairwise_trajectory_distances'
+        )
+    except ValueError:
+        pass
+
+
 def test__datetime_filter():
     traj_df = _default_traj_df()
     firstpoint = traj_df.iloc[0]
@@ -571,3 +741,40 @@ def test_query_all_points_by_range():
 
     result = query.query_all_points_by_range(traj_df, move_df, minimum_meters=1900000, minimum_time=timedelta(hours=19000))
     assert_frame_equal(result, expected)
+
+
+def test_query_all_points_by_range_does_not_change_data():
+    traj_df = _default_traj_df()
+    move_df = _default_move_df()
+    index = query.SpatioTemporalIndex(move_df)
+
+    result = query.query_all_points_by_range(
+        traj_df, move_df, minimum_meters=1900000,
+        minimum_time=timedelta(hours=19000), index=index
+    )
+    assert list(move_df.columns) == ['lat', 'lon', 'datetime', 'id']
+    assert list(result.index) == [38, 37, 38, 36, 37, 38, 35, 36, 37, 38]
+
+    result = query.query_all_points_by_range(traj_df, move_df, index=index)
+    assert result.shape == (0, 10)
+
+
+def test_spatio_temporal_index():
+    traj_df = _default_traj_df()
+    move_df = _default_move_df()
+    index = query.SpatioTemporalIndex(move_df)
+
+    assert len(index) == 39
+    targets, found = index.query(
+        traj_df['lat'], traj_df['lon'], traj_df['datetime'],
+        meters=1900000, time=timedelta(hours=19000)
+    )
+    assert list(targets) == [0, 0, 0, 0, 1, 1, 1, 2, 2, 3]
+    assert list(found) == [35, 36, 37, 38, 36, 37, 38, 37, 38, 38]
+
+    targets, found = index.query(
+        traj_df['lat'], traj_df['lon'], traj_df['datetime'],
+        meters=1900000, time=timedelta(hours=10)
+    )
+    assert targets.size == 0
+    assert found.size == 0
@@ -43,6 +43,14 @@ def test_lat_meters():
     assert_almost_equal(lat_in_meters, expected)
 
 
+def test_meters_to_chord():
+
+    expected = 0.00015696123041492158
+
+    assert_almost_equal(conversions.meters_to_chord(1000), expected)
+    assert_almost_equal(conversions.meters_to_chord(0), 0)
+
+
 def test_list_to_str():
 
     expected = 'banana,maca,laranja'
@@ -88,6 +96,17 @@ def test_y_to_lat_spherical():
     assert_almost_equal(conversions.y_to_lat_spherical(-4285978.17), expected)
 
 
+def test_lat_lon_to_unit_sphere():
+
+    expected = [
+        [0.78048988, -0.62179553, -0.0648526],
+        [0, 0, 1],
+    ]
+
+    points = conversions.lat_lon_to_unit_sphere([-3.71839, 90], [-38.5434, 0])
+    assert_almost_equal(points, expected)
+
+
 def test_geometry_points_to_lat_and_lon():
     move_df = DataFrame(
         data=[['1', Point(116.36184, 39.77529)],
@@ -1,6 +1,7 @@
 from numpy import array
 from numpy.testing import assert_almost_equal
-from pandas import Timestamp
+from pandas import DataFrame, Timestamp
+from pandas.testing import assert_frame_equal
 
 from pymove import MoveDataFrame, distances
 
@@ -92,6 +93,39 @@ def test_euclidean_distance_in_meters():
     assert_almost_equal(dists, expected)
 
 
+def test_nearest_points():
+    traj1 = DataFrame(
+        data=[[0., 0., 1], [0., 3., 1], [10., 10., 1]],
+        columns=['lat', 'lon', 'id']
+    )
+    traj2 = DataFrame(
+        data=[[0., 1., 2], [0., 2., 2], [0., 4., 2], [0., 1., 2], [9., 9., 2]],
+        columns=['lat', 'lon', 'id'],
+        index=[10, 11, 12, 13, 14]
+    )
+    expected = traj2.loc[[10, 11, 14]]
+
+    assert_frame_equal(distances.nearest_points(traj1, traj2), expected)
+
+    traj1 = DataFrame(data=[[60., 0.]], columns=['lat', 'lon'])
+    traj2 = DataFrame(
+        data=[[60., 3.], [62.9, 0.]], columns=['lat', 'lon'], index=[10, 11]
+    )
+    assert_frame_equal(
+        distances.nearest_points(traj1, traj2), traj2.loc[[11]]
+    )
+    assert_frame_equal(
+        distances.nearest_points(traj1, traj2, metric='haversine'),
+        traj2.loc[[10]]
+    )
+
+    try:
+        distances.nearest_points(traj1, traj2, metric='manhattan')
+        raise AssertionError('ValueError error not raised by nearest_points')
+    except ValueError:
+        pass
+
+
 def test_medp():
     expected = 241.91923668814994
 
@@ -110,3 +144,156 @@ def test_medt():
 
     medt = distances.medt(move_df1, move_df2)
     assert_almost_equal(medt, expected)
+
+
+def test_medp_array():
+    coords1 = array([[0., 0.], [0., 1.], [5., 5.]])
+    coords2 = array([[0., 0.5], [3., 4.]])
+    assert_almost_equal(distances.medp_array(coords1, coords2), 3.2360679)
+
+    move_df1 = MoveDataFrame(data=traj_example1)
+    move_df2 = MoveDataFrame(data=traj_example2)
+    medp = distances.medp_array(
+        move_df1[['lat', 'lon']].values, move_df2[['lat', 'lon']].values
+    )
+    assert_almost_equal(medp, 241.91923668814994)
+
+
+def test_medt_array():
+    coords1 = array([[0., 0.], [0., 1.]])
+    coords2 = array([[0., 0.], [0., 2.], [1., 1.], [2., 2.]])
+    times1 = array([0, 3000000000])
+    times2 = array([0, 0, 1000000000, 2000000000])
+    assert_almost_equal(
+        distances.medt_array(coords1, times1, coords2, times2), 5.1622777
+    )
+    assert_almost_equal(
+        distances.medt_array(coords2, times2, coords1, times1), 5.1622777
+    )
+
+
+def test_medp_batch():
+    coords = array([[0., 0.], [0., 1.]])
+    others = [array([[0., 0.5]]), array([[3., 0.], [3., 1.]]), coords]
+    expected = [distances.medp_array(coords, other) for other in others]
+
+    assert_almost_equal(distances.medp_batch(coords, others), expected)
+    assert_almost_equal(distances.medp_batch(coords, others, chunk_size=1), expected)
+    assert distances.medp_batch(coords, []).shape == (0,)
+
+
+def test_medt_batch():
+    coords = array([[0., 0.], [0., 1.], [1., 1.]])
+    times = array([0, 1000000000, 2000000000])
+    others_coords = [
+        array([[0., 1.]]),
+        array([[3., 0.], [3., 1.], [3., 2.], [3., 3.], [3., 4.]]),
+        coords,
+    ]
+    others_times = [
+        array([0]),
+        array([0, 0, 1000000000, 2000000000, 3000000000]),
+        times,
+    ]
+    expected = [
+        distances.medt_array(coords, times, other_coords, other_times)
+        for other_coords, other_times in zip(others_coords, others_times)
+    ]
+
+    assert_almost_equal(
+        distances.medt_batch(coords, times, others_coords, others_times), expected
+    )
+    assert_almost_equal(expected, [3.0, 11.6117674, 0.0])
+
+
+def test_dtw():
+    coords1 = array([[0., 0.], [0., 1.], [0., 2.], [0., 3.]])
+    coords2 = array([[0., 3.], [0., 0.], [0., 1.], [0., 2.]])
+
+    assert_almost_equal(distances.dtw(coords1, coords2), 4.0)
+    assert_almost_equal(distances.dtw(coords1, coords2, window=0), 6.0)
+    assert_almost_equal(distances.dtw(coords1, coords2, window=1), 4.0)
+    assert_almost_equal(distances.dtw(coords1, coords2[:2], window=0), 9.0)
+
+
+def test_frechet():
+    coords1 = array([[0., 0.], [0., 1.], [0., 2.], [0., 3.]])
+    coords2 = array([[0., 0.], [1., 2.], [0., 3.]])
+
+    assert_almost_equal(distances.frechet(coords1, coords2), 1.0)
+    assert_almost_equal(distances.frechet(coords2, coords1), 1.0)
+    assert_almost_equal(distances.frechet(coords1, coords2[::-1]), 3.0)
+
+
+def test_hausdorff():
+    coords1 = array([[0., 0.], [0., 1.], [0., 2.]])
+    coords2 = array([[0., 0.], [0., 5.]])
+
+    assert_almost_equal(distances.hausdorff(coords1, coords2), 3.0)
+    assert_almost_equal(distances.hausdorff(coords2, coords1), 3.0)
+
+
+def test_edr():
+    coords1 = array([[0., 0.], [0., 1.], [0., 2.], [0., 3.]])
+    coords2 = array([[0., 0.05], [0., 2.], [0., 3.]])
+
+    assert_almost_equal(distances.edr(coords1, coords2, epsilon=0.1), 1.0)
+    assert_almost_equal(distances.edr(coords1, coords2, epsilon=0.01), 2.0)
+
+
+def test_lcss():
+    coords1 = array([[0., 0.], [0., 1.], [0., 2.], [0., 3.]])
+    coords2 = array([[0., 0.05], [0., 2.], [0., 3.]])
+
+    assert_almost_equal(distances.lcss(coords1, coords2, epsilon=0.1), 0.0)
+    assert_almost_equal(distances.lcss(coords1, coords2, epsilon=0.01), 1 / 3)
+    assert_almost_equal(
+        distances.lcss(coords1, coords2, epsilon=0.1, delta=0), 2 / 3
+    )
+
+
+def test_get_distance():
+    points = array([[0., 0., 0.], [0., 1., 0.], [0., 2., 0.]])
+    others = [
+        array([[0., 0., 0.], [0., 2., 0.]]),
+        array([[3., 0., 0.], [3., 1., 0.], [3., 2., 0.]]),
+        array([[1., 5., 0.]]),
+    ]
+    params = {
+        'DTW': {'window': 1},
+        'EDR': {'epsilon': 0.1},
+        'LCSS': {'epsilon': 0.1},
+    }
+
+    for name in ['MEDP', 'MEDT', 'DTW', 'FRECHET', 'HAUSDORFF', 'EDR', 'LCSS']:
+        measure = distances.get_distance(name)
+        kwargs = params.get(name, {})
+        exact = measure.distance(points, others, **kwargs)
+        bounds = measure.lower_bound(points, others, **kwargs)
+        assert exact.shape == (3,)
+        assert (bounds <= exact + 1e-9).all()
+
+    assert_almost_equal(
+        distances.get_distance('DTW').distance(points, others, window=1),
+        [1.0, 9.0, 12.3844028]
+    )
+
+    try:
+        distances.get_distance('UNKNOWN')
+        raise AssertionError('ValueError error not raised by get_distance')
+    except ValueError:
+        pass
+
+
+def test_register_distance():
+    distances.register_distance(
+        'FIRST_POINT',
+        lambda points, others: array([
+            distances.hausdorff(points[:1, :2], other[:1, :2]) for other in others
+        ]),
+        lambda points, others: array([0.] * len(others))
+    )
+    measure = distances.get_distance('FIRST_POINT')
+    assert_almost_equal(
+        measure.distance(array([[0., 0., 0.]]), [array([[3., 4., 0.]])]), [5.0]
+    )
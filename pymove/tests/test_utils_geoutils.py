@@ -54,6 +54,67 @@ def test_decode():
     assert_equal(expected5, geoutils._decode('7pkdg4vqrg6020q'))
 
 
+def test_encode_geohash_array():
+    lat = [-3.777736, -3.793388, -3.783605, -3.774056, -3.719155]
+    lon = [-38.547792, -38.517722, -38.521962, -38.482056, -38.532494]
+
+    expected = np.array([
+        '7pkddb6356fyzxq',
+        '7pkd7t2mbj0z1v7',
+        '7pkd7rjnvhzjp90',
+        '7pkds2fnx0gr1c0',
+        '7pkdg4vqrg6020q',
+    ], dtype=object)
+    assert_array_equal(geoutils.encode_geohash_array(lat, lon), expected)
+
+    expected = np.array(
+        [b'7pkddb63', b'7pkd7t2m', b'7pkd7rjn', b'7pkds2fn', b'7pkdg4vq']
+    )
+    assert_array_equal(
+        geoutils.encode_geohash_array(lat, lon, precision=8, dtype='bytes'),
+        expected
+    )
+
+    expected = np.array([
+        263683713219, 263683564627, 263683563060, 263684098516, 263683806070
+    ], dtype=np.uint64)
+    assert_array_equal(
+        geoutils.encode_geohash_array(lat, lon, precision=8, dtype='int'),
+        expected
+    )
+
+    try:
+        geoutils.encode_geohash_array(lat, lon, precision=13, dtype='int')
+        raise AssertionError(
+            'ValueError error not raised by encode_geohash_array'
+        )
+    except ValueError:
+        pass
+
+
+def test_decode_geohash_array():
+    lat, lon = geoutils.decode_geohash_array(
+        ['7pkddb6356fyzxq', '7pkd7t2mbj0z1v7', '7pkd']
+    )
+    assert_array_equal(lat, [-3.777736, -3.793388, -4])
+    assert_array_equal(lon, [-38.547792, -38.517722, -38])
+
+    lat, lon = geoutils.decode_geohash_array(
+        np.array([263683713219, 263683564627], dtype=np.uint64), precision=8
+    )
+    assert_array_equal(lat, [-3.778, -3.793])
+    assert_array_equal(lon, [-38.548, -38.518])
+
+    for geohash in [[263683713219], ['7pkdi']]:
+        try:
+            geoutils.decode_geohash_array(geohash)
+            raise AssertionError(
+                'ValueError error not raised by decode_geohash_array'
+            )
+        except ValueError:
+            pass
+
+
 def test_bin_geohash():
     lat1, lon1 = -3.777736, -38.547792
     lat2, lon2 = -3.793388, -38.517722
@@ -183,6 +244,46 @@ def test_create_bin_geohash_df():
 
     assert_frame_equal(df_, expected)
 
+    df_ = DataFrame(
+        data=[
+            [-3.777736, -38.547792],
+            [-3.793388, -38.517722],
+            [-3.783605, -38.521962],
+        ],
+        columns=[LATITUDE, LONGITUDE],
+        index=[3, 4, 5]
+    )
+
+    expected = DataFrame(
+        data=[
+            [-3.777736, -38.547792, 263683713219],
+            [-3.793388, -38.517722, 263683564627],
+            [-3.783605, -38.521962, 263683563060],
+        ],
+        columns=[LATITUDE, LONGITUDE, BIN_GEOHASH],
+        index=[0, 1, 2]
+    ).astype({BIN_GEOHASH: np.uint64})
+
+    geoutils.create_bin_geohash_df(df_, precision=8, packed=True)
+
+    assert_frame_equal(df_, expected)
+
+    geoutils.create_bin_geohash_df(df_, packed=True)
+
+    expected[BIN_GEOHASH] = np.array(
+        [276492413272496606, 276492257462666271, 276492255820104689],
+        dtype=np.uint64
+    )
+    assert_frame_equal(df_, expected)
+
+    try:
+        geoutils.create_bin_geohash_df(df_, precision=13, packed=True)
+        raise AssertionError(
+            'ValueError error not raised by create_bin_geohash_df'
+        )
+    except ValueError:
+        pass
+
 
 def test_decode_geohash_to_latlon():
     df_ = DataFrame(
@@ -212,3 +313,58 @@ def test_decode_geohash_to_latlon():
     geoutils.decode_geohash_to_latlon(df_)
 
     assert_frame_equal(df_, expected)
+
+
+def test_bin_geohash_to_bits():
+    bin_geohash = np.array([263683713219, 263683564627], dtype=np.uint64)
+
+    expected = np.array([
+        [0, 0, 1, 1, 1, 1, 0, 1, 0, 1, 1, 0, 0, 1, 0, 0, 1, 1, 0, 0,
+         0, 1, 1, 0, 0, 0, 1, 0, 1, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 1],
+        [0, 0, 1, 1, 1, 1, 0, 1, 0, 1, 1, 0, 0, 1, 0, 0, 1, 1, 0, 0,
+         0, 0, 1, 1, 1, 1, 1, 0, 0, 1, 0, 0, 0, 1, 0, 1, 0, 0, 1, 1],
+    ], dtype=np.uint8)
+
+    assert_array_equal(geoutils.bin_geohash_to_bits(bin_geohash, 8), expected)
+
+    assert_array_equal(
+        geoutils.bin_geohash_to_bits(bin_geohash >> np.uint64(20), 4),
+        expected[:, :20]
+    )
+
+
+def test_bin_geohash_common_prefix():
+    bin_geohash = np.array(
+        [263683713219, 263683564627, 263683563060], dtype=np.uint64
+    )
+
+    prefix = geoutils.bin_geohash_common_prefix(bin_geohash, bin_geohash[0], 8)
+    assert_array_equal(prefix, [40, 21, 21])
+    assert prefix.dtype == np.int64
+    assert_array_equal(
+        geoutils.bin_geohash_common_prefix(bin_geohash, bin_geohash[::-1], 8),
+        [21, 40, 21]
+    )
+
+
+def test_bin_geohash_neighbors():
+    bin_geohash = np.array([263683713219], dtype=np.uint64)
+
+    expected = np.array([[
+        263683713222, 263683713228, 263683713225, 263683713224,
+        263683713218, 263683713216, 263683713217, 263683713220
+    ]], dtype=np.uint64)
+
+    assert_array_equal(
+        geoutils.bin_geohash_neighbors(bin_geohash, 8), expected
+    )
+
+    bin_geohash = geoutils.encode_geohash_array([89.99], [179.99], 2, 'int')
+
+    expected = np.array(
+        [[1023, 341, 341, 340, 1022, 1020, 1021, 1021]], dtype=np.uint64
+    )
+
+    assert_array_equal(
+        geoutils.bin_geohash_neighbors(bin_geohash, 2), expected
+    )
@@ -4,6 +4,7 @@ from numpy import inf, nan
 from numpy.testing import assert_array_almost_equal, assert_array_equal
 from pandas import DataFrame, Series, Timestamp
 from pandas.testing import assert_frame_equal, assert_series_equal
+from shapely.geometry import Polygon
 from shapely.geometry.point import Point
 
 from pymove import MoveDataFrame
@@ -266,6 +267,41 @@ def test_join_colletive_areas():
     assert_frame_equal(move_df, expected)
 
 
+def test_join_colletive_areas_with_polygons_and_lat_lon():
+    move_df = MoveDataFrame(
+        data=list_move,
+    )
+    area_c = DataFrame({
+        'geometry': [
+            Polygon([
+                (116.319, 39.984), (116.320, 39.984),
+                (116.320, 39.985), (116.319, 39.985)
+            ]),
+            Polygon([
+                (116.306, 40.013), (116.308, 40.013),
+                (116.308, 40.017), (116.306, 40.017)
+            ]),
+            Polygon([
+                (116.310769, 39.981668), (116.311, 39.981), (116.311, 39.982)
+            ]),
+            Point(116.315069, 40.009735),
+        ]
+    })
+    expected = move_df.copy()
+    expected[VIOLATING] = [True, False, False, True, True, True, False, False, True]
+
+    new_move_df = integration.join_collective_areas(
+        move_df, area_c, use_lat_lon=True
+    )
+    assert_frame_equal(new_move_df, expected)
+
+    move_df['geometry'] = move_df.apply(lambda x: Point(x['lon'], x['lat']), axis=1)
+    expected['geometry'] = move_df['geometry']
+    expected = expected[['lat', 'lon', 'datetime', 'id', 'geometry', VIOLATING]]
+    integration.join_collective_areas(move_df, area_c, inplace=True)
+    assert_frame_equal(move_df, expected)
+
+
 def test__reset_and_creates_id_and_lat_lon():
     move_df = MoveDataFrame(list_move)
     pois = DataFrame(
@@ -451,6 +487,14 @@ def test_reset_set_window_and_creates_event_id_type_all():
     assert_array_equal(event_type, type_expected)
 
 
+def test__time_window_pairs():
+    windows, instants = integration._time_window_pairs(
+        np.array([5, 1, 3, 9]), np.array([0, 4, 10]), np.array([3, 9, 12])
+    )
+    assert_array_equal(windows, [0, 0, 1, 1])
+    assert_array_equal(instants, [1, 2, 0, 3])
+
+
 def test_join_with_pois():
     move_df = MoveDataFrame(list_move)
 
@@ -488,6 +532,60 @@ def test_join_with_pois():
     integration.join_with_pois(move_df, pois, inplace=True)
     assert_frame_equal(move_df, expected, check_dtype=False)
 
+    # points and pois without location are skipped
+    move_df = DataFrame(
+        data=list_move + [[nan, 116.319236, Timestamp('2008-10-24 02:00:00'), 3]],
+        columns=[LATITUDE, LONGITUDE, DATETIME, TRAJ_ID],
+    )
+    pois = DataFrame(
+        data=list_pois + [[40.0, nan, 8, 'show', 'no_location']],
+        columns=[LATITUDE, LONGITUDE, TRAJ_ID, TYPE_POI, NAME_POI],
+    )
+
+    joined = integration.join_with_pois(move_df, pois)
+    assert_frame_equal(joined[:9], expected, check_dtype=False)
+    assert joined.loc[9, [ID_POI, DIST_POI, NAME_POI]].tolist() == ['', inf, '']
+
+
+def test_create_poi_index():
+    pois = DataFrame(
+        data=list_pois + [[39.984094, 116.319236, 8, 'show', 'repeated']],
+        columns=[LATITUDE, LONGITUDE, TRAJ_ID, TYPE_POI, NAME_POI],
+    )
+
+    tree, positions = integration.create_poi_index(pois)
+    assert_array_equal(positions, [0, 1, 2, 3, 4, 5, 6])
+    assert tree.n == 7
+
+    pois = DataFrame(
+        data=[[nan, 116.319236, 8, 'show', 'no_location']] + list_pois,
+        columns=[LATITUDE, LONGITUDE, TRAJ_ID, TYPE_POI, NAME_POI],
+    )
+
+    tree, positions = integration.create_poi_index(pois)
+    assert_array_equal(positions, [1, 2, 3, 4, 5, 6, 7])
+    assert tree.n == 7
+
+
+def test_join_with_pois_reusing_index():
+    move_df = MoveDataFrame(list_move)
+    pois = DataFrame(
+        data=list_pois,
+        columns=[LATITUDE, LONGITUDE, TRAJ_ID, TYPE_POI, NAME_POI],
+        index=[0, 1, 2, 3, 4, 5, 6]
+    )
+    poi_index = integration.create_poi_index(pois)
+
+    expected = integration.join_with_pois(move_df, pois)
+    first = integration.join_with_pois(
+        move_df[:4], pois, poi_index=poi_index
+    )
+    second = integration.join_with_pois(
+        move_df[4:], pois, poi_index=poi_index
+    )
+    assert_frame_equal(first, expected[:4])
+    assert_frame_equal(second, expected[4:].reset_index(drop=True))
+
 
 def test_join_with_pois_by_category():
     move_df = MoveDataFrame(list_move)
@@ -537,6 +635,45 @@ def test_join_with_pois_by_category():
     integration.join_with_pois_by_category(move_df, pois, inplace=True)
     assert_frame_equal(move_df, expected, check_dtype=False)
 
+    # points and pois without location are skipped
+    move_df = DataFrame(
+        data=list_move + [[nan, 116.319236, Timestamp('2008-10-24 02:00:00'), 3]],
+        columns=[LATITUDE, LONGITUDE, DATETIME, TRAJ_ID],
+    )
+    pois = DataFrame(
+        data=list_pois + [[40.0, nan, 8, 'show', 'no_location']],
+        columns=[LATITUDE, LONGITUDE, TRAJ_ID, TYPE_POI, NAME_POI],
+    )
+
+    joined = integration.join_with_pois_by_category(move_df, pois)
+    assert_frame_equal(joined[:9], expected, check_dtype=False)
+    assert_series_equal(
+        joined.loc[9, expected.columns[4:]],
+        Series([nan, inf] * 5, index=expected.columns[4:], name=9),
+        check_dtype=False
+    )
+
+
+def test_join_with_pois_by_category_max_distance():
+    move_df = MoveDataFrame(list_move)
+    pois = DataFrame(
+        data=list_pois,
+        columns=[LATITUDE, LONGITUDE, TRAJ_ID, TYPE_POI, NAME_POI],
+        index=[0, 1, 2, 3, 4, 5, 6]
+    )
+
+    expected = integration.join_with_pois_by_category(move_df, pois)
+    new_move_df = integration.join_with_pois_by_category(
+        move_df, pois, max_distance=1000
+    )
+
+    for c in pois[TYPE_POI].unique():
+        far = expected['dist_%s' % c] > 1000
+        expected.loc[far, 'dist_%s' % c] = inf
+        expected.loc[far, 'id_%s' % c] = nan
+    assert_frame_equal(new_move_df, expected)
+    assert (new_move_df['dist_comercio'] < inf).sum() == 3
+
 
 def test_join_with_events():
     list_events = [
@@ -582,6 +719,11 @@ def test_join_with_events():
         index=[0, 1, 2, 3, 4, 5, 6, 7, 8]
     )
 
+    new_move_df = integration.join_with_events(
+        move_df, pois, time_window=45000, chunk_size=1
+    )
+    assert_frame_equal(new_move_df, expected, check_dtype=False)
+
     integration.join_with_events(move_df, pois, time_window=45000, inplace=True)
     assert_frame_equal(move_df, expected, check_dtype=False)
 
@@ -657,6 +799,62 @@ def test_join_with_event_by_dist_and_time():
 
     assert_frame_equal(move_df, expected, check_dtype=False)
 
+    # wide windows with far away events take the candidates from the tree
+    list_events += [
+        [-3.744340, -38.536110, 5, Timestamp('2008-10-23 11:00:00'), 'forro'],
+        [-3.797450, -38.497490, 6, Timestamp('2008-10-24 00:00:00'), 'feira'],
+    ]
+
+    pois = DataFrame(
+        data=list_events,
+        columns=[LATITUDE, LONGITUDE, EVENT_ID, DATETIME, EVENT_TYPE],
+        index=[0, 1, 2, 3, 4, 5]
+    )
+
+    expected = DataFrame(
+        data=[
+            [39.984094, 116.319236, Timestamp('2008-10-23 05:53:05'),
+             1, [1, 2], [0.0, 981.2070220979601],
+             ['show do tropykalia', 'evento da prefeitura']],
+            [39.984559000000004, 116.326696, Timestamp('2008-10-23 10:37:26'),
+             1, [1, 2], [637.6902157810678, 718.144152295024],
+             ['show do tropykalia', 'evento da prefeitura']],
+            [40.002899, 116.32151999999999, Timestamp('2008-10-23 10:50:16'),
+             1, [3], [1094.8606633486438], ['show do seu joao']],
+            [40.016238, 116.30769099999999, Timestamp('2008-10-23 11:03:06'),
+             1, [3, 4], [810.5429984051405, 286.3387434682032],
+             ['show do seu joao', 'missa']],
+            [40.013814, 116.306525, Timestamp('2008-10-23 11:58:33'),
+             2, [3, 4], [669.9731550451877, 0.9311014399622559],
+             ['show do seu joao', 'missa']],
+            [40.009735, 116.315069, Timestamp('2008-10-23 23:50:45'),
+             2, [3, 4], [211.06912863495495, 857.4175399672415],
+             ['show do seu joao', 'missa']],
+            [39.993527, 116.32648300000001, Timestamp('2008-10-24 00:02:14'),
+             2, [2], [279.6712398549538], ['evento da prefeitura']],
+            [39.978575, 116.326975, Timestamp('2008-10-24 00:22:01'),
+             3, [1], [900.7798955139456], ['show do tropykalia']],
+            [39.981668, 116.310769, Timestamp('2008-10-24 01:57:57'),
+             3, [1], [770.1887545178132], ['show do tropykalia']]
+        ],
+
+        columns=[
+            LATITUDE, LONGITUDE, DATETIME, TRAJ_ID,
+            EVENT_ID, DIST_EVENT, EVENT_TYPE
+        ],
+
+        index=[0, 1, 2, 3, 4, 5, 6, 7, 8]
+    )
+
+    for chunk_size in [1, 4, 10000]:
+        move_df = MoveDataFrame(list_move)
+        integration.join_with_event_by_dist_and_time(
+            move_df, pois, radius=1000, time_window=259200,
+            inplace=True, chunk_size=chunk_size
+        )
+
+        assert_frame_equal(move_df, expected, check_dtype=False)
+
 
 def test_join_with_home_by_id():
     list_home = [
@@ -729,6 +927,28 @@ def test_join_with_home_by_id():
     assert_frame_equal(move_df, expected, check_dtype=False)
 
 
+def test_join_with_home_by_id_single_point():
+    list_home = [
+        [39.984094, 116.319236, 1, 'rua da mae', 'quixiling'],
+        [40.013821, 116.306531, 1, 'rua da familia', 'quixeramoling']
+    ]
+    move_df = MoveDataFrame(list_move[:1])
+    home_df = DataFrame(
+        data=list_home,
+        columns=[LATITUDE, LONGITUDE, TRAJ_ID, ADDRESS, CITY]
+    )
+    expected = DataFrame(
+        data=[
+            [1, 39.984094, 116.319236, Timestamp('2008-10-23 05:53:05'), 0.0,
+             'rua da mae', 'quixiling'],
+        ],
+        columns=[TRAJ_ID, LATITUDE, LONGITUDE, DATETIME, DIST_HOME, HOME, CITY]
+    )
+
+    integration.join_with_home_by_id(move_df, home_df, inplace=True)
+    assert_frame_equal(move_df, expected, check_dtype=False)
+
+
 def test_merge_home_with_poi():
     list_move4merge = [
         [39.984094, 116.319236, Timestamp('2008-10-23 05:53:05'), 1],
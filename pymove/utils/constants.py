@@ -94,6 +94,8 @@ POLYGON = 'polygon'
 
 LAT_MEAN = 'lat_mean'
 LON_MEAN = 'lon_mean'
+ARRIVAL = 'arrival'
+DEPARTURE = 'departure'
 
 OUTLIER = 'outlier'
 OUT_BBOX = 'out_bbox'
@@ -101,6 +103,7 @@ DEACTIVATED = 'deactivated_signal'
 JUMP = 'gps_jump'
 BLOCK = 'block_signal'
 SHORT = 'short_traj'
+DROPS_BY_ROUND = 'drops_by_round'
 
 TB = 'TB'
 GB = 'GB'
@@ -108,6 +111,8 @@ MB = 'MG'
 KB = 'KB'
 B = 'bytes'
 COUNT = 'count'
+DISTINCT_IDS = 'distinct_ids'
+MEAN_SPEED = 'mean_speed'
 
 COLORS = {
     0: '#000000',  # black
@@ -164,6 +169,11 @@ EVENT_POINT = 'purple'
 
 MEDP = 'MEDP'
 MEDT = 'MEDT'
+DTW = 'DTW'
+FRECHET = 'FRECHET'
+HAUSDORFF = 'HAUSDORFF'
+EDR = 'EDR'
+LCSS = 'LCSS'
 
 LOCAL_LABEL = 'local_label'
 PREV_LOCAL = 'prev_local'
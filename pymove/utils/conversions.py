@@ -3,6 +3,7 @@ Unit conversion operations.
 
 lat_meters,
 meters_to_eps,
+meters_to_chord,
 list_to_str,
 list_to_csv_str,
 list_to_svm_line,
@@ -10,6 +11,7 @@ lon_to_x_spherical,
 lat_to_y_spherical,
 x_to_lon_spherical,
 y_to_lat_spherical,
+lat_lon_to_unit_sphere,
 geometry_points_to_lat_and_lon,
 lat_and_lon_decimal_degrees_to_decimal,
 ms_to_kmh,
@@ -109,6 +111,37 @@ def meters_to_eps(
     return radius_meters / earth_radius
 
 
+def meters_to_chord(
+    meters: float | ndarray, earth_radius: float = EARTH_RADIUS
+) -> float | ndarray:
+    """
+    Converts a great circle distance in meters to a chord of the unit sphere.
+
+    The chord is the euclidean distance between points in the coordinates
+    returned by lat_lon_to_unit_sphere, and grows with the distance in meters.
+
+    Parameters
+    ----------
+    meters : float or array
+        great circle distance in meters
+    earth_radius : float, optional
+        radius of the earth in kilometers, by default EARTH_RADIUS
+
+    Returns
+    -------
+    float or array
+        chord length in the unit sphere
+
+    Example
+    -------
+    >>> from pymove.utils.conversions import meters_to_chord
+    >>> meters_to_chord(1000)
+    0.00015696123041492158
+    """
+    angle = np.minimum(np.asarray(meters) / (earth_radius * 1000), np.pi)
+    return 2 * np.sin(angle / 2)
+
+
 def list_to_str(input_list: list, delimiter: str = ',') -> str:
     """
     Concatenates a list elements, joining them by the separator `delimiter`.
@@ -310,6 +343,38 @@ def y_to_lat_spherical(y: float | ndarray) -> float | ndarray:
     return np.degrees(np.arctan(np.sinh(y / 6378137.0)))
 
 
+def lat_lon_to_unit_sphere(
+    lat: float | ndarray, lon: float | ndarray
+) -> ndarray:
+    """
+    Convert latitude and longitude to cartesian coordinates in the unit sphere.
+
+    Parameters
+    ----------
+    lat : float or array
+        Represents latitude.
+    lon : float or array
+        Represents longitude.
+
+    Returns
+    -------
+    array
+        Array of shape (n, 3) with x, y and z coordinates.
+
+    Examples
+    --------
+    >>> from pymove.utils.conversions import lat_lon_to_unit_sphere
+    >>> lat_lon_to_unit_sphere(-3.71839, -38.5434)
+    array([[ 0.78048988, -0.62179553, -0.0648526 ]])
+    """
+    lat = np.radians(np.atleast_1d(lat).astype(np.float64))
+    lon = np.radians(np.atleast_1d(lon).astype(np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack(
+        (cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat))
+    )
+
+
 def geometry_points_to_lat_and_lon(
     move_data: DataFrame,
     geometry_label: str = GEOMETRY,
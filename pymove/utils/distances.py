@@ -5,19 +5,47 @@ haversine,
 euclidean_distance_in_meters,
 nearest_points,
 medp,
-medt
+medt,
+medp_array,
+medt_array,
+medp_batch,
+medt_batch,
+dtw,
+frechet,
+hausdorff,
+edr,
+lcss,
+register_distance,
+get_distance
 
 """
 from __future__ import annotations
 
+from collections import namedtuple
+from typing import Callable, Sequence
+
 import numpy as np
 import pandas as pd
 from numpy import ndarray
+from pandas import Series
 from pandas.core.frame import DataFrame
-from scipy.spatial import distance
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+from scipy.spatial import cKDTree
 
 from pymove import utils
-from pymove.utils.constants import DATETIME, EARTH_RADIUS, LATITUDE, LONGITUDE
+from pymove.utils.constants import (
+    DATETIME,
+    DTW,
+    EARTH_RADIUS,
+    EDR,
+    FRECHET,
+    HAUSDORFF,
+    LATITUDE,
+    LCSS,
+    LONGITUDE,
+    MEDP,
+    MEDT,
+)
 
 
 def haversine(
@@ -132,9 +160,10 @@ def nearest_points(
     traj2: DataFrame,
     latitude: str = LATITUDE,
     longitude: str = LONGITUDE,
+    metric: str = 'euclidean'
 ) -> DataFrame:
     """
-    Returns the point closest to another trajectory based on the Euclidean distance.
+    Returns the points of traj2 closest to each point of traj1.
 
     Parameters
     ----------
@@ -148,12 +177,20 @@ def nearest_points(
     longitude: str, optional
         Label of the trajectories dataframe referring to the longitude,
         by default LONGITUDE
+    metric: str, optional
+        'euclidean' to compare latitude and longitude as plane coordinates,
+        or 'haversine' to use the great-circle distance, by default 'euclidean'
 
     Returns
     -------
     DataFrame
         dataframe with closest points
 
+    Raises
+    ------
+    ValueError
+        If the metric is invalid
+
     Example
     -------
     >>> from pymove.utils.distances import nearest_points
@@ -170,22 +207,35 @@ def nearest_points(
     0   39.984211   116.319389   2008-10-23 05:53:16     1
     1   39.984211   116.319389   2008-10-23 05:53:16     1
     """
-    result = pd.DataFrame(columns=traj1.columns)
-
-    for _, t1 in traj1.iterrows():
-        round_result = np.Inf
-        round_traj = []
-        for _, t2 in traj2.iterrows():
-            this_distance = distance.euclidean(
-                (t1[latitude], t1[longitude]),
-                (t2[latitude], t2[longitude]),
+    if metric == 'euclidean':
+        def to_points(traj):
+            return traj[[latitude, longitude]].to_numpy(dtype=np.float64)
+    elif metric == 'haversine':
+        def to_points(traj):
+            return utils.conversions.lat_lon_to_unit_sphere(
+                traj[latitude].to_numpy(dtype=np.float64),
+                traj[longitude].to_numpy(dtype=np.float64)
             )
-            if this_distance < round_result:
-                round_result = this_distance
-                round_traj = t2
-        result = result.append(round_traj)
+    else:
+        raise ValueError('Unknown metric. Use euclidean or haversine')
 
-    return result
+    columns = traj1.columns.append(traj2.columns.difference(traj1.columns, sort=False))
+    traj2 = DataFrame(traj2)
+    if traj1.shape[0] == 0 or traj2.shape[0] == 0:
+        return traj2.iloc[:0].reindex(columns=columns)
+
+    points, first = np.unique(to_points(traj2), axis=0, return_index=True)
+    query = to_points(traj1)
+    k = min(8, len(points))
+    _, nearest = cKDTree(points).query(query, k=k)
+    nearest = nearest.reshape(-1, k)
+
+    # among points at the same distance, keeps the first one of traj2
+    dists = np.sqrt(((points[nearest] - query[:, np.newaxis]) ** 2).sum(axis=2))
+    positions = np.where(
+        dists == dists.min(axis=1, keepdims=True), first[nearest], len(traj2)
+    ).min(axis=1)
+    return traj2.iloc[positions].reindex(columns=columns)
 
 
 def medp(
@@ -229,15 +279,10 @@ def medp(
     >>> medp(traj_1, traj_2)
     6.573431370981577e-05
     """
-    soma = 0
-    traj2 = nearest_points(traj1, traj2, latitude, longitude)
-    for (_, t1), (_, t2) in zip(traj1.iterrows(), traj2.iterrows()):
-        this_distance = distance.euclidean(
-            (t1[latitude], t1[longitude]),
-            (t2[latitude], t2[longitude])
-        )
-        soma = soma + this_distance
-    return soma
+    return medp_array(
+        traj1[[latitude, longitude]].to_numpy(dtype=np.float64),
+        traj2[[latitude, longitude]].to_numpy(dtype=np.float64)
+    )
 
 
 def medt(
@@ -286,28 +331,800 @@ def medt(
     >>> medt(traj_1, traj_2)
     6.592419887747872e-05
     """
-    soma = 0.
+    return medt_array(
+        traj1[[latitude, longitude]].to_numpy(dtype=np.float64),
+        _datetime_to_millis(traj1[datetime]),
+        traj2[[latitude, longitude]].to_numpy(dtype=np.float64),
+        _datetime_to_millis(traj2[datetime])
+    )
+
+
+def _datetime_to_millis(datetimes: Series) -> ndarray:
+    """Returns the timestamps of a series in milliseconds since the epoch."""
+    nanos = pd.to_datetime(datetimes).to_numpy().astype(np.int64)
+    return (nanos // 1000000).astype(np.float64)
+
+
+def _nearest_distances(
+    coords1: ndarray, coords2: ndarray, chunk_size: int = 1000000
+) -> ndarray:
+    """Returns the distance of each point of coords1 to its closest in coords2."""
+    step = max(1, chunk_size // max(len(coords2), 1))
+    nearest = np.empty(len(coords1))
+    for start in range(0, len(coords1), step):
+        diff = coords1[start:start + step, np.newaxis] - coords2[np.newaxis]
+        nearest[start:start + step] = np.sqrt((diff ** 2).sum(axis=2)).min(axis=1)
+    return nearest
+
+
+def medp_array(coords1: ndarray, coords2: ndarray) -> float:
+    """
+    Returns the Mean Euclidian Distance Predictive between two coordinate arrays.
+
+    Parameters
+    ----------
+    coords1: ndarray
+        Array with the latitude and longitude of the points of one trajectory.
+    coords2: ndarray
+        Array with the latitude and longitude of the points of another trajectory.
+
+    Returns
+    -------
+    float
+        total distance
+
+    Example
+    -------
+    >>> from pymove.utils.distances import medp_array
+    >>> medp_array(
+    >>>     np.array([[39.98471, 116.319865]]), np.array([[39.984674, 116.31981]])
+    >>> )
+    6.573431370981577e-05
+    """
+    return _nearest_distances(coords1, coords2).sum()
+
+
+def medt_array(
+    coords1: ndarray, times1: ndarray, coords2: ndarray, times2: ndarray
+) -> float:
+    """
+    Returns the Mean Euclidian Distance Trajectory between two trajectory arrays.
+
+    Parameters
+    ----------
+    coords1: ndarray
+        Array with the latitude and longitude of the points of one trajectory.
+    times1: ndarray
+        Timestamps of the points of one trajectory, in milliseconds.
+    coords2: ndarray
+        Array with the latitude and longitude of the points of another trajectory.
+    times2: ndarray
+        Timestamps of the points of another trajectory, in milliseconds.
+
+    Returns
+    -------
+    float
+        total distance
+
+    Example
+    -------
+    >>> from pymove.utils.distances import medt_array
+    >>> medt_array(
+    >>>     np.array([[39.98471, 116.319865]]), np.array([1224741203000]),
+    >>>     np.array([[39.984674, 116.31981]]), np.array([1224741208000])
+    >>> )
+    6.592419887747872e-05
+    """
+    proportion = 1000000000
+    points1 = np.column_stack([coords1, np.asarray(times1) / proportion])
+    points2 = np.column_stack([coords2, np.asarray(times2) / proportion])
+    if len(points2) < len(points1):
+        points1, points2 = points2, points1
+
+    size = len(points1)
+    paired = np.sqrt(((points1 - points2[:size]) ** 2).sum(axis=1)).sum()
+    return paired + points2[size + 1:, 2].sum()
+
+
+def _concatenate_trajectories(
+    others: Sequence[ndarray]
+) -> tuple[ndarray, ndarray, ndarray]:
+    """Returns the concatenated points, owner and offset of each point."""
+    lengths = np.array([len(other) for other in others], dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    owner = np.repeat(np.arange(len(others)), lengths)
+    offset = np.arange(lengths.sum()) - starts[owner]
+    return np.concatenate(others), owner, offset
+
+
+def medp_batch(
+    coords: ndarray, others: Sequence[ndarray], chunk_size: int = 1000000
+) -> ndarray:
+    """
+    Returns the MEDP between one coordinate array and many others.
+
+    Parameters
+    ----------
+    coords: ndarray
+        Array with the latitude and longitude of the points of one trajectory.
+    others: sequence of ndarray
+        Arrays with the latitude and longitude of the points of other trajectories.
+    chunk_size: int, optional
+        Maximum number of point distances computed at once, by default 1000000
+
+    Returns
+    -------
+    ndarray
+        distance to each of the other trajectories
+
+    Example
+    -------
+    >>> from pymove.utils.distances import medp_batch
+    >>> medp_batch(
+    >>>     np.array([[0., 0.], [0., 1.]]),
+    >>>     [np.array([[0., 0.5]]), np.array([[3., 0.], [3., 1.]])]
+    >>> )
+    array([1., 6.])
+    """
+    if len(others) == 0:
+        return np.empty(0)
+    points, owner, offset = _concatenate_trajectories(others)
+    starts = np.flatnonzero(offset == 0)
+
+    total = np.zeros(len(others))
+    step = max(1, chunk_size // len(points))
+    for start in range(0, len(coords), step):
+        diff = coords[start:start + step, np.newaxis] - points[np.newaxis]
+        pairwise = np.sqrt((diff ** 2).sum(axis=2))
+        total += np.minimum.reduceat(pairwise, starts, axis=1).sum(axis=0)
+    return total
+
+
+def medt_batch(
+    coords: ndarray,
+    times: ndarray,
+    others_coords: Sequence[ndarray],
+    others_times: Sequence[ndarray]
+) -> ndarray:
+    """
+    Returns the MEDT between one trajectory array and many others.
+
+    Parameters
+    ----------
+    coords: ndarray
+        Array with the latitude and longitude of the points of one trajectory.
+    times: ndarray
+        Timestamps of the points of one trajectory, in milliseconds.
+    others_coords: sequence of ndarray
+        Arrays with the latitude and longitude of the points of other trajectories.
+    others_times: sequence of ndarray
+        Timestamps of the points of other trajectories, in milliseconds.
+
+    Returns
+    -------
+    ndarray
+        distance to each of the other trajectories
+
+    Example
+    -------
+    >>> from pymove.utils.distances import medt_batch
+    >>> medt_batch(
+    >>>     np.array([[0., 0.]]), np.array([0]),
+    >>>     [np.array([[0., 1.]]), np.array([[3., 4.]])],
+    >>>     [np.array([0]), np.array([0])]
+    >>> )
+    array([1., 5.])
+    """
+    if len(others_coords) == 0:
+        return np.empty(0)
     proportion = 1000000000
-    if(len(traj2) < len(traj1)):
-        traj1, traj2 = traj2, traj1
-
-    for i in range(0, len(traj1)):
-        this_distance = distance.euclidean(
-            (traj1[latitude].iloc[i],
-                traj1[longitude].iloc[i],
-                float(utils.datetime.timestamp_to_millis(
-                    traj1[datetime].iloc[i]
-                )) / proportion),
-            (traj2[latitude].iloc[i],
-                traj2[longitude].iloc[i],
-                float(utils.datetime.timestamp_to_millis(
-                    traj2[datetime].iloc[i]
-                )) / proportion),
+    query = np.column_stack([coords, np.asarray(times) / proportion])
+    others = [
+        np.column_stack([c, np.asarray(t) / proportion])
+        for c, t in zip(others_coords, others_times)
+    ]
+    points, owner, offset = _concatenate_trajectories(others)
+    size = len(query)
+    lengths = np.bincount(owner, minlength=len(others))
+
+    paired = offset < size
+    paired_distances = np.sqrt(
+        ((points[paired] - query[offset[paired]]) ** 2).sum(axis=1)
+    )
+    total = np.bincount(owner[paired], weights=paired_distances, minlength=len(others))
+
+    unpaired = offset > size
+    total += np.bincount(
+        owner[unpaired], weights=points[unpaired, 2], minlength=len(others)
+    )
+
+    query_times = np.concatenate([[0.], np.cumsum(query[:, 2])])
+    shorter = lengths + 1 < size
+    total[shorter] += query_times[-1] - query_times[lengths[shorter] + 1]
+    return total
+
+
+def _diagonal_dp(
+    cost: ndarray,
+    fill: float,
+    first_row: ndarray,
+    first_column: ndarray,
+    step: Callable[[ndarray, ndarray, ndarray, ndarray], ndarray],
+    window: int | None = None
+) -> ndarray:
+    """
+    Fills a dynamic programming table one anti-diagonal at a time.
+
+    Cell (i, j) of the table depends on cells (i - 1, j - 1), (i - 1, j)
+    and (i, j - 1), so all cells of an anti-diagonal are computed together.
+
+    Parameters
+    ----------
+    cost: ndarray
+        Matrix with the cost of pairing each point of two trajectories
+    fill: float
+        Value of the cells outside the window
+    first_row: ndarray
+        Values of the first row of the table, of size m + 1
+    first_column: ndarray
+        Values of the first column of the table, of size n + 1
+    step: Callable
+        Function receiving the costs and the diagonal, upper and left
+        neighbours of the cells, returning their values
+    window: int, optional
+        Maximum difference between the positions of paired points,
+        by default None
+
+    Returns
+    -------
+    ndarray
+        table of size (n + 1, m + 1)
+    """
+    n, m = cost.shape
+    table = np.full((n + 1, m + 1), fill, dtype=np.float64)
+    table[0, :] = first_row
+    table[:, 0] = first_column
+    for k in range(2, n + m + 1):
+        low, high = max(1, k - m), min(n, k - 1)
+        if window is not None:
+            low, high = max(low, (k - window + 1) // 2), min(high, (k + window) // 2)
+        if low > high:
+            continue
+        rows = np.arange(low, high + 1)
+        cols = k - rows
+        table[rows, cols] = step(
+            cost[rows - 1, cols - 1],
+            table[rows - 1, cols - 1],
+            table[rows - 1, cols],
+            table[rows, cols - 1]
         )
-        soma = soma + this_distance
-    for j in range(len(traj1) + 1, len(traj2)):
-        soma = soma + \
-            float(
-                utils.datetime.timestamp_to_millis(traj2[datetime].iloc[j])
-            ) / proportion
-    return soma
+    return table
+
+
+def _pairwise_distances(coords1: ndarray, coords2: ndarray) -> ndarray:
+    """Returns the euclidean distance between every pair of points."""
+    diff = coords1[:, np.newaxis] - coords2[np.newaxis]
+    return np.sqrt((diff ** 2).sum(axis=2))
+
+
+def _pairwise_matches(coords1: ndarray, coords2: ndarray, epsilon: float) -> ndarray:
+    """Returns whether each pair of points is closer than epsilon in every dimension."""
+    diff = np.abs(coords1[:, np.newaxis] - coords2[np.newaxis])
+    return (diff <= epsilon).all(axis=2)
+
+
+def dtw(coords1: ndarray, coords2: ndarray, window: int | None = None) -> float:
+    """
+    Returns the Dynamic Time Warping distance between two coordinate arrays.
+
+    Parameters
+    ----------
+    coords1: ndarray
+        Array with the latitude and longitude of the points of one trajectory.
+    coords2: ndarray
+        Array with the latitude and longitude of the points of another trajectory.
+    window: int, optional
+        Width of the Sakoe-Chiba band, the maximum difference between the
+        positions of paired points. It is widened to the difference between
+        the sizes of the trajectories, by default None
+
+    Returns
+    -------
+    float
+        total distance
+
+    Example
+    -------
+    >>> from pymove.utils.distances import dtw
+    >>> a = np.array([[0., 0.], [0., 1.], [0., 2.]])
+    >>> b = np.array([[0., 0.], [0., 2.]])
+    >>> dtw(a, b)
+    1.0
+    """
+    n, m = len(coords1), len(coords2)
+    if window is not None:
+        window = max(window, abs(n - m))
+    first = np.full(max(n, m) + 1, np.inf)
+    first[0] = 0
+    table = _diagonal_dp(
+        _pairwise_distances(coords1, coords2),
+        np.inf,
+        first[:m + 1],
+        first[:n + 1],
+        lambda cost, diag, up, left: cost + np.minimum(np.minimum(diag, up), left),
+        window
+    )
+    return table[n, m]
+
+
+def frechet(coords1: ndarray, coords2: ndarray) -> float:
+    """
+    Returns the discrete Fréchet distance between two coordinate arrays.
+
+    Parameters
+    ----------
+    coords1: ndarray
+        Array with the latitude and longitude of the points of one trajectory.
+    coords2: ndarray
+        Array with the latitude and longitude of the points of another trajectory.
+
+    Returns
+    -------
+    float
+        total distance
+
+    Example
+    -------
+    >>> from pymove.utils.distances import frechet
+    >>> a = np.array([[0., 0.], [0., 1.], [0., 2.]])
+    >>> b = np.array([[0., 0.], [0., 2.]])
+    >>> frechet(a, b)
+    1.0
+    """
+    n, m = len(coords1), len(coords2)
+    first = np.full(max(n, m) + 1, np.inf)
+    first[0] = 0
+    table = _diagonal_dp(
+        _pairwise_distances(coords1, coords2),
+        np.inf,
+        first[:m + 1],
+        first[:n + 1],
+        lambda cost, diag, up, left: np.maximum(
+            cost, np.minimum(np.minimum(diag, up), left)
+        )
+    )
+    return table[n, m]
+
+
+def hausdorff(coords1: ndarray, coords2: ndarray) -> float:
+    """
+    Returns the Hausdorff distance between two coordinate arrays.
+
+    Parameters
+    ----------
+    coords1: ndarray
+        Array with the latitude and longitude of the points of one trajectory.
+    coords2: ndarray
+        Array with the latitude and longitude of the points of another trajectory.
+
+    Returns
+    -------
+    float
+        total distance
+
+    Example
+    -------
+    >>> from pymove.utils.distances import hausdorff
+    >>> a = np.array([[0., 0.], [0., 1.], [0., 2.]])
+    >>> b = np.array([[0., 0.], [0., 2.]])
+    >>> hausdorff(a, b)
+    1.0
+    """
+    return max(
+        _nearest_distances(coords1, coords2).max(),
+        _nearest_distances(coords2, coords1).max()
+    )
+
+
+def edr(coords1: ndarray, coords2: ndarray, epsilon: float = 0.001) -> float:
+    """
+    Returns the Edit Distance on Real sequences between two coordinate arrays.
+
+    Two points match when they are closer than epsilon in every dimension,
+    and each unmatched point costs one edit.
+
+    Parameters
+    ----------
+    coords1: ndarray
+        Array with the latitude and longitude of the points of one trajectory.
+    coords2: ndarray
+        Array with the latitude and longitude of the points of another trajectory.
+    epsilon: float, optional
+        Matching threshold, in degrees, by default 0.001
+
+    Returns
+    -------
+    float
+        number of edits
+
+    Example
+    -------
+    >>> from pymove.utils.distances import edr
+    >>> a = np.array([[0., 0.], [0., 1.], [0., 2.]])
+    >>> b = np.array([[0., 0.], [0., 2.]])
+    >>> edr(a, b)
+    1.0
+    """
+    n, m = len(coords1), len(coords2)
+    table = _diagonal_dp(
+        (~_pairwise_matches(coords1, coords2, epsilon)).astype(np.float64),
+        np.inf,
+        np.arange(m + 1),
+        np.arange(n + 1),
+        lambda cost, diag, up, left: np.minimum(
+            diag + cost, np.minimum(up, left) + 1
+        )
+    )
+    return table[n, m]
+
+
+def lcss(
+    coords1: ndarray,
+    coords2: ndarray,
+    epsilon: float = 0.001,
+    delta: int | None = None
+) -> float:
+    """
+    Returns the Longest Common Subsequence distance between two coordinate arrays.
+
+    Two points match when they are closer than epsilon in every dimension
+    and their positions differ by at most delta. The distance is one minus
+    the size of the longest common subsequence over the size of the
+    shortest trajectory.
+
+    Parameters
+    ----------
+    coords1: ndarray
+        Array with the latitude and longitude of the points of one trajectory.
+    coords2: ndarray
+        Array with the latitude and longitude of the points of another trajectory.
+    epsilon: float, optional
+        Matching threshold, in degrees, by default 0.001
+    delta: int, optional
+        Maximum difference between the positions of matched points,
+        by default None
+
+    Returns
+    -------
+    float
+        distance between 0 and 1
+
+    Example
+    -------
+    >>> from pymove.utils.distances import lcss
+    >>> a = np.array([[0., 0.], [0., 1.], [0., 2.]])
+    >>> b = np.array([[0., 0.], [0., 2.]])
+    >>> lcss(a, b)
+    0.0
+    """
+    n, m = len(coords1), len(coords2)
+    matches = _pairwise_matches(coords1, coords2, epsilon)
+    if delta is not None:
+        positions = np.arange(n)[:, np.newaxis] - np.arange(m)[np.newaxis]
+        matches &= np.abs(positions) <= delta
+    table = _diagonal_dp(
+        matches.astype(np.float64),
+        0.,
+        np.zeros(m + 1),
+        np.zeros(n + 1),
+        lambda match, diag, up, left: np.where(
+            match > 0, diag + 1, np.maximum(up, left)
+        )
+    )
+    return 1 - table[n, m] / min(n, m)
+
+
+def _reduce_box_gaps(
+    points: ndarray,
+    mins: ndarray,
+    maxs: ndarray,
+    reduce: Callable[[ndarray, slice], ndarray],
+    chunk_size: int = 1000000
+) -> ndarray:
+    """
+    Reduces the gaps between each point and chunks of bounding boxes.
+
+    Parameters
+    ----------
+    points: ndarray
+        Points of one trajectory
+    mins: ndarray
+        Minimum corner of each box
+    maxs: ndarray
+        Maximum corner of each box
+    reduce: Callable
+        Function receiving the gaps, of shape (points, boxes, dimensions),
+        and the slice of the boxes, returning a value for each box
+    chunk_size: int, optional
+        Maximum number of point-box gaps computed at once, by default 1000000
+
+    Returns
+    -------
+    ndarray
+        reduced value for each box
+    """
+    result = np.empty(len(mins))
+    step = max(1, chunk_size // max(len(points), 1))
+    for start in range(0, len(mins), step):
+        chunk = slice(start, min(start + step, len(mins)))
+        gaps = np.maximum(
+            np.maximum(
+                mins[np.newaxis, chunk] - points[:, np.newaxis],
+                points[:, np.newaxis] - maxs[np.newaxis, chunk]
+            ),
+            0
+        )
+        result[chunk] = reduce(gaps, chunk)
+    return result
+
+
+class _PackedTrajectories:
+    """Trajectories concatenated in one array, with their bounding boxes."""
+
+    def __init__(
+        self, others: Sequence[ndarray], dims: int = 2, scale: ndarray | None = None
+    ):
+        points, self.owner, self.offset = _concatenate_trajectories(others)
+        self.points = points[:, :dims]
+        if scale is not None:
+            self.points = self.points / scale
+        self.starts = np.flatnonzero(self.offset == 0)
+        self.lengths = np.diff(np.append(self.starts, len(self.points)))
+        self.mins = np.minimum.reduceat(self.points, self.starts, axis=0)
+        self.maxs = np.maximum.reduceat(self.points, self.starts, axis=0)
+
+    def __len__(self) -> int:
+        """Returns the number of trajectories."""
+        return len(self.starts)
+
+    def forward_distances(self, points: ndarray) -> tuple[ndarray, ndarray]:
+        """Returns the sum and maximum distance of points to each box."""
+        maximum = np.empty(len(self))
+
+        def reduce_gaps(gaps, chunk):
+            box_distances = np.sqrt((gaps ** 2).sum(axis=2))
+            maximum[chunk] = box_distances.max(axis=0)
+            return box_distances.sum(axis=0)
+
+        total = _reduce_box_gaps(points, self.mins, self.maxs, reduce_gaps)
+        return total, maximum
+
+    def backward_gaps(self, points: ndarray) -> ndarray:
+        """Returns the gaps between each indexed point and the box of points."""
+        return np.maximum(
+            np.maximum(
+                points.min(axis=0) - self.points, self.points - points.max(axis=0)
+            ),
+            0
+        )
+
+    def backward_distances(self, points: ndarray) -> tuple[ndarray, ndarray]:
+        """Returns the sum and maximum distance of each trajectory to the box."""
+        box_distances = np.sqrt((self.backward_gaps(points) ** 2).sum(axis=1))
+        return (
+            np.add.reduceat(box_distances, self.starts),
+            np.maximum.reduceat(box_distances, self.starts)
+        )
+
+    def matchable_counts(self, points: ndarray, epsilon: float) -> ndarray:
+        """Returns how many points of each pair may be closer than epsilon."""
+        forward = _reduce_box_gaps(
+            points, self.mins, self.maxs,
+            lambda gaps, chunk: (gaps <= epsilon).all(axis=2).sum(axis=0)
+        )
+        matchable = (self.backward_gaps(points) <= epsilon).all(axis=1)
+        backward = np.add.reduceat(matchable.astype(np.int64), self.starts)
+        return np.minimum(forward, backward)
+
+
+def _medp_lower_bound(points: ndarray, others: Sequence[ndarray]) -> ndarray:
+    """Returns the sum of the distances of points to the box of each trajectory."""
+    return _PackedTrajectories(others).forward_distances(points[:, :2])[0]
+
+
+def _medt_lower_bound(points: ndarray, others: Sequence[ndarray]) -> ndarray:
+    """Returns the MEDT of the paired points to the boxes plus the unpaired times."""
+    scale = np.array([1, 1, 1000000000])
+    query = points[:, :3] / scale
+    packed = _PackedTrajectories(others, dims=3, scale=scale)
+    paired = np.minimum(packed.lengths, len(query)) - 1
+
+    def reduce_gaps(gaps, chunk):
+        cumulative = np.sqrt((gaps ** 2).sum(axis=2)).cumsum(axis=0)
+        return cumulative[paired[chunk], np.arange(cumulative.shape[1])]
+
+    bounds = _reduce_box_gaps(query, packed.mins, packed.maxs, reduce_gaps)
+    unpaired = packed.offset > len(query)
+    bounds += np.bincount(
+        packed.owner[unpaired],
+        weights=packed.points[unpaired, 2],
+        minlength=len(packed)
+    )
+    query_times = np.concatenate([[0.], np.cumsum(query[:, 2])])
+    shorter = packed.lengths + 1 < len(query)
+    bounds[shorter] += query_times[-1] - query_times[packed.lengths[shorter] + 1]
+    return bounds
+
+
+def _dtw_lower_bound(
+    points: ndarray, others: Sequence[ndarray], window: int | None = None
+) -> ndarray:
+    """
+    Returns a lower bound of DTW between points and each trajectory.
+
+    Every point is paired at least once, so DTW is at least the sum of the
+    distances of the points of one trajectory to the box of the other. When
+    the trajectories have the same size and a window is given, the bound
+    is raised to LB_Keogh, computed on the band envelope of each trajectory.
+    """
+    packed = _PackedTrajectories(others)
+    forward, _ = packed.forward_distances(points[:, :2])
+    backward, _ = packed.backward_distances(points[:, :2])
+    bounds = np.maximum(forward, backward)
+    if window is not None:
+        same = np.flatnonzero(packed.lengths == len(points))
+        if same.size > 0:
+            stacked = np.stack([others[p][:, :2] for p in same])
+            size = 2 * window + 1
+            lower = minimum_filter1d(stacked, size, axis=1, mode='nearest')
+            upper = maximum_filter1d(stacked, size, axis=1, mode='nearest')
+            gaps = np.maximum(
+                np.maximum(lower - points[:, :2], points[:, :2] - upper), 0
+            )
+            keogh = np.sqrt((gaps ** 2).sum(axis=2)).sum(axis=1)
+            bounds[same] = np.maximum(bounds[same], keogh)
+    return bounds
+
+
+def _frechet_lower_bound(points: ndarray, others: Sequence[ndarray]) -> ndarray:
+    """Returns the largest distance of a point or an end point to the other trajectory."""
+    packed = _PackedTrajectories(others)
+    _, forward = packed.forward_distances(points[:, :2])
+    _, backward = packed.backward_distances(points[:, :2])
+    firsts = packed.points[packed.starts]
+    lasts = packed.points[packed.starts + packed.lengths - 1]
+    ends = np.maximum(
+        np.sqrt(((firsts - points[0, :2]) ** 2).sum(axis=1)),
+        np.sqrt(((lasts - points[-1, :2]) ** 2).sum(axis=1))
+    )
+    return np.maximum(np.maximum(forward, backward), ends)
+
+
+def _hausdorff_lower_bound(points: ndarray, others: Sequence[ndarray]) -> ndarray:
+    """Returns the largest distance of a point to the box of the other trajectory."""
+    packed = _PackedTrajectories(others)
+    _, forward = packed.forward_distances(points[:, :2])
+    _, backward = packed.backward_distances(points[:, :2])
+    return np.maximum(forward, backward)
+
+
+def _edr_lower_bound(
+    points: ndarray, others: Sequence[ndarray], epsilon: float = 0.001
+) -> ndarray:
+    """Returns the edits needed when only points near the other box are matched."""
+    packed = _PackedTrajectories(others)
+    matchable = packed.matchable_counts(points[:, :2], epsilon)
+    return np.maximum(packed.lengths, len(points)) - matchable
+
+
+def _lcss_lower_bound(
+    points: ndarray,
+    others: Sequence[ndarray],
+    epsilon: float = 0.001,
+    delta: int | None = None
+) -> ndarray:
+    """Returns the LCSS distance when only points near the other box are matched."""
+    packed = _PackedTrajectories(others)
+    matchable = packed.matchable_counts(points[:, :2], epsilon)
+    return 1 - matchable / np.minimum(packed.lengths, len(points))
+
+
+DistanceMeasure = namedtuple('DistanceMeasure', 'distance lower_bound')
+
+_DISTANCE_MEASURES: dict[str, DistanceMeasure] = {}
+
+
+def register_distance(
+    name: str,
+    distance: Callable[..., ndarray],
+    lower_bound: Callable[..., ndarray]
+):
+    """
+    Registers a trajectory distance measure used by the query functions.
+
+    Both functions receive one trajectory and a sequence of others, as
+    arrays with the latitude, longitude and timestamp in milliseconds of
+    each point, plus the parameters of the measure, and return a value for
+    each of the others.
+
+    Parameters
+    ----------
+    name: str
+        Name of the distance measure
+    distance: Callable
+        Function computing the distances
+    lower_bound: Callable
+        Function computing values never greater than the distances,
+        and cheaper to compute
+
+    Example
+    -------
+    >>> from pymove.utils.distances import register_distance
+    >>> register_distance(
+    >>>     'START', lambda p, others: np.array([abs(p[0, 0] - o[0, 0]) for o in others]),
+    >>>     lambda p, others: np.zeros(len(others))
+    >>> )
+    """
+    _DISTANCE_MEASURES[name] = DistanceMeasure(distance, lower_bound)
+
+
+def get_distance(name: str) -> DistanceMeasure:
+    """
+    Returns a registered trajectory distance measure.
+
+    Parameters
+    ----------
+    name: str
+        Name of the distance measure
+
+    Returns
+    -------
+    DistanceMeasure
+        named tuple with the distance and lower_bound functions
+
+    Raises
+    ------
+    ValueError
+        If the distance measure is not registered
+
+    Example
+    -------
+    >>> from pymove.utils.distances import get_distance
+    >>> get_distance('DTW').distance(
+    >>>     np.array([[0., 0., 0.], [0., 1., 0.]]), [np.array([[0., 2., 0.]])]
+    >>> )
+    array([3.])
+    """
+    if name not in _DISTANCE_MEASURES:
+        raise ValueError(
+            'Unknown distance measure. Use one of %s' % list(_DISTANCE_MEASURES)
+        )
+    return _DISTANCE_MEASURES[name]
+
+
+def _pairwise_measure(measure: Callable[..., float]) -> Callable[..., ndarray]:
+    """Returns a one-vs-many version of a measure between coordinate arrays."""
+    def distance(points, others, **kwargs):
+        return np.array([
+            measure(points[:, :2], other[:, :2], **kwargs) for other in others
+        ])
+    return distance
+
+
+register_distance(
+    MEDP,
+    lambda points, others: medp_batch(points[:, :2], [o[:, :2] for o in others]),
+    _medp_lower_bound
+)
+register_distance(
+    MEDT,
+    lambda points, others: medt_batch(
+        points[:, :2], points[:, 2], [o[:, :2] for o in others], [o[:, 2] for o in others]
+    ),
+    _medt_lower_bound
+)
+register_distance(DTW, _pairwise_measure(dtw), _dtw_lower_bound)
+register_distance(FRECHET, _pairwise_measure(frechet), _frechet_lower_bound)
+register_distance(HAUSDORFF, _pairwise_measure(hausdorff), _hausdorff_lower_bound)
+register_distance(EDR, _pairwise_measure(edr), _edr_lower_bound)
+register_distance(LCSS, _pairwise_measure(lcss), _lcss_lower_bound)
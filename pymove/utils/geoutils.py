@@ -2,9 +2,14 @@
 Geo operations.
 
 v_color,
+encode_geohash_array,
+decode_geohash_array,
 create_geohash_df,
 create_bin_geohash_df,
 decode_geohash_to_latlon,
+bin_geohash_to_bits,
+bin_geohash_common_prefix,
+bin_geohash_neighbors,
 
 """
 from __future__ import annotations
@@ -25,7 +30,6 @@ from pymove.utils.constants import (
     LONGITUDE,
     LONGITUDE_DECODE,
 )
-from pymove.utils.log import progress_bar
 
 BINARY = [
     np.asarray(
@@ -33,6 +37,11 @@ BINARY = [
     ) for x in range(0, len(BASE_32))
 ]
 BASE_32_TO_BIN = dict(zip(BASE_32, BINARY))
+GEOHASH_BASE_32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_BYTES = np.frombuffer(GEOHASH_BASE_32.encode(), dtype=np.uint8)
+BYTES_TO_GEOHASH = np.full(256, 255, dtype=np.uint8)
+BYTES_TO_GEOHASH[GEOHASH_BYTES] = np.arange(len(GEOHASH_BASE_32))
+GEOHASH_CHUNK_SIZE = 1 << 16
 
 
 def v_color(ob: BaseGeometry) -> str:
@@ -215,7 +224,204 @@ def _reset_and_create_arrays_none(
     return latitudes, longitudes, geohash, bin_geohash
 
 
-def create_geohash_df(data: DataFrame, precision: float = 15):
+def _geohash_codes(lat: ndarray, lon: ndarray, precision: int) -> ndarray:
+    """
+    Encodes arrays of latitudes and longitudes to geohash characters.
+
+    The intervals are halved as in the scalar encoder, so the results
+    are the same, for GEOHASH_CHUNK_SIZE points at a time.
+
+    Parameters
+    ----------
+    lat : array
+        Latitudes in degrees.
+    lon : array
+        Longitudes in degrees.
+    precision : int
+        Number of characters in resulting geohashes
+
+    Return
+    ------
+    array
+        The base 32 values of the characters of each geohash
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    codes = np.zeros((lat.size, precision), dtype=np.uint8)
+    for start in range(0, lat.size, GEOHASH_CHUNK_SIZE):
+        stop = min(start + GEOHASH_CHUNK_SIZE, lat.size)
+        size = stop - start
+        # longitude bits come first
+        axes = [
+            (lon[start:stop], np.full(size, -180.0), np.full(size, 180.0)),
+            (lat[start:stop], np.full(size, -90.0), np.full(size, 90.0)),
+        ]
+        chunk = codes[start:stop]
+        for bit in range(5 * precision):
+            values, low, high = axes[bit % 2]
+            mid = (low + high) / 2
+            above = values > mid
+            np.copyto(low, mid, where=above)
+            np.copyto(high, mid, where=~above)
+            chunk[:, bit // 5] |= above.view(np.uint8) << np.uint8(4 - bit % 5)
+    return codes
+
+
+def _geohash_coordinates(codes: ndarray) -> tuple[ndarray, ndarray]:
+    """
+    Decodes geohash characters to latitudes and longitudes.
+
+    The centers are rounded to the known decimals, as in the scalar decoder.
+
+    Parameters
+    ----------
+    codes : array
+        The base 32 values of the characters of each geohash
+
+    Return
+    ------
+    (lat : array, lon : array)
+        Geohashed locations.
+    """
+    size, precision = codes.shape
+    axes = [
+        (np.full(size, -180.0), np.full(size, 180.0)),
+        (np.full(size, -90.0), np.full(size, 90.0)),
+    ]
+    errors = [180.0, 90.0]
+    for bit in range(5 * precision):
+        low, high = axes[bit % 2]
+        errors[bit % 2] /= 2
+        mid = (low + high) / 2
+        above = (codes[:, bit // 5] >> (4 - bit % 5)) & 1 == 1
+        np.copyto(low, mid, where=above)
+        np.copyto(high, mid, where=~above)
+
+    centers = []
+    for (low, high), error in zip(axes, errors):
+        center = (low + high) / 2
+        decimals = max(1, int(round(-np.log10(error)))) - 1
+        if decimals < 10:
+            centers.append(np.round(center, decimals))
+        else:
+            # scaled rounding loses the last digits of sub-millimeter geohashes
+            centers.append(np.array(
+                [float('%.*f' % (decimals, c)) for c in center.tolist()]
+            ))
+    lon, lat = centers
+    return lat, lon
+
+
+def encode_geohash_array(
+    lat: ndarray, lon: ndarray, precision: int = 15, dtype: str = 'str'
+) -> ndarray:
+    """
+    Encodes arrays of latitudes and longitudes to geohashes.
+
+    Parameters
+    ----------
+    lat : array
+        Latitudes in degrees.
+    lon : array
+        Longitudes in degrees.
+    precision : int, optional
+        Number of characters in resulting geohashes, by default 15
+    dtype : str, optional
+        Type of the geohashes, by default 'str'
+            'str': python strings
+            'bytes': fixed width numpy bytes
+            'int': unsigned integers with 5 bits by character,
+            up to a precision of 12
+
+    Return
+    ------
+    array
+        Geohashes of supplied latitudes and longitudes.
+
+    Raises
+    ------
+    ValueError
+        If dtype is not valid or cannot hold the precision
+
+    Example
+    -------
+    >>> from pymove.utils.geoutils import encode_geohash_array
+    >>> lat, lon = [-3.777736, -3.793388], [-38.547792, -38.517722]
+    >>> encode_geohash_array(lat, lon)
+    array(['7pkddb6356fyzxq', '7pkd7t2mbj0z1v7'], dtype=object)
+    >>> encode_geohash_array(lat, lon, precision=8, dtype='bytes')
+    array([b'7pkddb63', b'7pkd7t2m'], dtype='|S8')
+    >>> encode_geohash_array(lat, lon, precision=8, dtype='int')
+    array([263683713219, 263683564627], dtype=uint64)
+    """
+    if dtype not in ['str', 'bytes', 'int']:
+        raise ValueError(f'dtype {dtype} is not valid')
+    if dtype == 'int' and precision > 12:
+        raise ValueError('int geohashes hold up to 12 characters')
+
+    codes = _geohash_codes(lat, lon, precision)
+    if dtype == 'int':
+        shifts = np.arange(5 * (precision - 1), -1, -5, dtype=np.uint64)
+        return np.bitwise_or.reduce(codes.astype(np.uint64) << shifts, axis=1)
+    geohashes = GEOHASH_BYTES[codes].view(f'S{precision}').ravel()
+    if dtype == 'bytes':
+        return geohashes
+    return geohashes.astype(str).astype(object)
+
+
+def decode_geohash_array(
+    geohash: ndarray, precision: int | None = None
+) -> tuple[ndarray, ndarray]:
+    """
+    Decodes arrays of geohashes to latitudes and longitudes.
+
+    Parameters
+    ----------
+    geohash : array
+        Geohashes as strings, bytes or integers
+    precision : int, optional
+        Number of characters in integer geohashes, by default None
+
+    Return
+    ------
+    (lat : array, lon : array)
+        Geohashed locations, with the decimals known by the geohashes.
+
+    Raises
+    ------
+    ValueError
+        If integer geohashes have no precision or the geohashes are not valid
+
+    Example
+    -------
+    >>> from pymove.utils.geoutils import decode_geohash_array
+    >>> decode_geohash_array(['7pkddb6356fyzxq', '7pkd7t2mbj0z1v7'])
+    (array([-3.777736, -3.793388]), array([-38.547792, -38.517722]))
+    """
+    geohash = np.asarray(geohash)
+    if np.issubdtype(geohash.dtype, np.integer):
+        if precision is None:
+            raise ValueError('integer geohashes need a precision')
+        shifts = np.arange(5 * (precision - 1), -1, -5, dtype=np.uint64)
+        codes = (geohash.astype(np.uint64)[:, None] >> shifts) & np.uint64(31)
+        return _geohash_coordinates(codes.astype(np.uint8))
+
+    geohash = geohash.astype(bytes)
+    characters = geohash.view(np.uint8).reshape(geohash.size, geohash.itemsize)
+    codes = BYTES_TO_GEOHASH[characters]
+    lengths = np.count_nonzero(characters, axis=1)
+    if np.any(codes[characters != 0] == 255):
+        raise ValueError('geohashes must have only base 32 characters')
+
+    lat = np.empty(geohash.size, dtype=np.float64)
+    lon = np.empty(geohash.size, dtype=np.float64)
+    for length in np.unique(lengths):
+        rows = lengths == length
+        lat[rows], lon[rows] = _geohash_coordinates(codes[rows, :length])
+    return lat, lon
+
+
+def create_geohash_df(data: DataFrame, precision: int = 15, dtype: str = 'str'):
     """
     Create geohash from geographic coordinates and integrate with df.
 
@@ -223,8 +429,11 @@ def create_geohash_df(data: DataFrame, precision: float = 15):
     ----------
     data : dataframe
         The input trajectories data
-    precision : float, optional
+    precision : int, optional
         Number of characters in resulting geohash, by default 15
+    dtype : str, optional
+        Type of the geohashes, 'str', 'bytes' or 'int', by default 'str'
+        See encode_geohash_array
 
     Return
     ------
@@ -250,17 +459,15 @@ def create_geohash_df(data: DataFrame, precision: float = 15):
     3   39.984211   116.319389   wx4eqyvhyjnv5m7
     4   39.984217   116.319422   wx4eqyvhyyr2yy8
     """
-    _, _, geohash, _ = _reset_and_create_arrays_none(data)
-
-    for idx, row in progress_bar(
-        data[[LATITUDE, LONGITUDE]].iterrows(), total=data.shape[0]
-    ):
-        geohash[idx] = _encode(row[LATITUDE], row[LONGITUDE], precision)
-
-    data[GEOHASH] = geohash
+    data.reset_index(drop=True, inplace=True)
+    data[GEOHASH] = encode_geohash_array(
+        data[LATITUDE], data[LONGITUDE], precision, dtype
+    )
 
 
-def create_bin_geohash_df(data: DataFrame, precision: float = 15):
+def create_bin_geohash_df(
+    data: DataFrame, precision: int | None = None, packed: bool = False
+):
     """
     Create trajectory geohash binaries and integrate with df.
 
@@ -268,8 +475,14 @@ def create_bin_geohash_df(data: DataFrame, precision: float = 15):
     ----------
     data : dataframe
         The input trajectories data
-    precision : float, optional
-        Number of characters in resulting geohash, by default 15
+    precision : int, optional
+        Number of characters in resulting geohash,
+        by default 12 if packed, otherwise 15
+    packed : boolean, optional
+        Whether to store the geohash bits packed in an uint64 column,
+        up to a precision of 12, instead of an array by row, by default False
+        See bin_geohash_to_bits, bin_geohash_common_prefix
+        and bin_geohash_neighbors
 
     Return
     ------
@@ -294,13 +507,36 @@ def create_bin_geohash_df(data: DataFrame, precision: float = 15):
     2   39.984224   116.319402  [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 1, ...
     3   39.984211   116.319389  [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 1, ...
     4   39.984217   116.319422  [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 1, ...
+    >>> create_bin_geohash_df(geoLife_df, packed=True)
+    >>> geoLife_df
+              lat          lon          bin_geohash
+    0   39.984094   116.319236  1041613234018350671
+    1   39.984198   116.319322  1041613234019054367
+    2   39.984224   116.319402  1041613234019202316
+    3   39.984211   116.319389  1041613234019190427
+    4   39.984217   116.319422  1041613234019203810
     """
+    if precision is None:
+        precision = 12 if packed else 15
+
+    if packed:
+        data.reset_index(drop=True, inplace=True)
+        data[BIN_GEOHASH] = encode_geohash_array(
+            data[LATITUDE], data[LONGITUDE], precision, 'int'
+        )
+        return
+
     *_, bin_geohash = _reset_and_create_arrays_none(data)
 
-    for idx, row in progress_bar(
-        data[[LATITUDE, LONGITUDE]].iterrows(), total=data.shape[0]
-    ):
-        bin_geohash[idx] = _bin_geohash(row[LATITUDE], row[LONGITUDE], precision)
+    # the characters are written with the binary of their BASE_32 index
+    codes = _geohash_codes(data[LATITUDE], data[LONGITUDE], precision)
+    indexes = np.searchsorted(BASE_32, list(GEOHASH_BASE_32)).astype(np.uint8)
+    bits = np.unpackbits(indexes[codes][:, :, None], axis=2)[:, :, 2:]
+    used = np.ones(bits.shape, dtype=bool)
+    used[:, :, 0] = bits[:, :, 0] == 1
+    bin_geohash[:] = np.split(
+        bits[used].astype(int), np.cumsum(used.sum(axis=(1, 2)))[:-1]
+    )
 
     data[BIN_GEOHASH] = bin_geohash
 
@@ -308,7 +544,8 @@ def create_bin_geohash_df(data: DataFrame, precision: float = 15):
 def decode_geohash_to_latlon(
     data: DataFrame,
     label_geohash: str = GEOHASH,
-    reset_index: bool = True
+    reset_index: bool = True,
+    precision: int | None = None
 ):
     """
     Decode feature with hash of trajectories back to geographic coordinates.
@@ -321,6 +558,8 @@ def decode_geohash_to_latlon(
         The name of the feature with hashed trajectories, by default GEOHASH
     reset_index : boolean, optional
         Condition to reset the df index, by default True
+    precision : int, optional
+        Number of characters in integer geohashes, by default None
 
     Return
     ------
@@ -349,12 +588,159 @@ def decode_geohash_to_latlon(
     if label_geohash not in data:
         raise ValueError(f'feature {label_geohash} not in df')
 
-    lat, lon, _, _ = _reset_and_create_arrays_none(data, reset_index=reset_index)
+    if reset_index:
+        data.reset_index(drop=True, inplace=True)
 
-    for idx, row in progress_bar(data[[label_geohash]].iterrows(), total=data.shape[0]):
-        lat_lon = _decode(row[label_geohash])
-        lat[idx] = lat_lon[0]
-        lon[idx] = lat_lon[1]
+    lat, lon = decode_geohash_array(data[label_geohash].to_numpy(), precision)
 
     data[LATITUDE_DECODE] = lat
     data[LONGITUDE_DECODE] = lon
+
+
+def _bit_length(values: ndarray) -> ndarray:
+    """Returns the number of bits of unsigned integers up to 64 bits."""
+    values = np.asarray(values, dtype=np.uint64)
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    bits = np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+    return bits.astype(np.int64)
+
+
+def _deinterleave(bin_geohash: ndarray, precision: int) -> tuple[ndarray, ndarray]:
+    """Returns the latitude and longitude cell indexes of packed geohashes."""
+    bin_geohash = np.asarray(bin_geohash, dtype=np.uint64)
+    indexes = [np.zeros(bin_geohash.shape, dtype=np.uint64) for _ in range(2)]
+    total = 5 * precision
+    for bit in range(total):
+        value = (bin_geohash >> np.uint64(total - 1 - bit)) & np.uint64(1)
+        indexes[bit % 2] = (indexes[bit % 2] << np.uint64(1)) | value
+    lon, lat = indexes
+    return lat, lon
+
+
+def _interleave(lat: ndarray, lon: ndarray, precision: int) -> ndarray:
+    """Returns the packed geohashes of latitude and longitude cell indexes."""
+    total = 5 * precision
+    bits = [(total + 1) // 2, total // 2]
+    indexes = [np.asarray(lon, dtype=np.uint64), np.asarray(lat, dtype=np.uint64)]
+    bin_geohash = np.zeros(indexes[0].shape, dtype=np.uint64)
+    for bit in range(total):
+        shift = np.uint64(bits[bit % 2] - 1 - bit // 2)
+        value = (indexes[bit % 2] >> shift) & np.uint64(1)
+        bin_geohash = (bin_geohash << np.uint64(1)) | value
+    return bin_geohash
+
+
+def bin_geohash_to_bits(bin_geohash: ndarray, precision: int) -> ndarray:
+    """
+    Unpacks packed binary geohashes to a matrix of bits.
+
+    Parameters
+    ----------
+    bin_geohash : array
+        Binary geohashes packed in unsigned integers
+    precision : int
+        Number of characters in the geohashes
+
+    Return
+    ------
+    array
+        A row of 5 * precision bits for each geohash
+
+    Example
+    -------
+    >>> from pymove.utils.geoutils import bin_geohash_to_bits
+    >>> bin_geohash_to_bits([263683713219], precision=8)[:, :10]
+    array([[0, 0, 1, 1, 1, 1, 0, 1, 0, 1]], dtype=uint8)
+    """
+    big_endian = np.asarray(bin_geohash, dtype='>u8')
+    bits = np.unpackbits(
+        big_endian.view(np.uint8).reshape(big_endian.size, 8), axis=1
+    )
+    return bits[:, 64 - 5 * precision:]
+
+
+def bin_geohash_common_prefix(
+    bin_geohash: ndarray, other: ndarray, precision: int
+) -> ndarray:
+    """
+    Returns the number of leading bits shared by packed binary geohashes.
+
+    Geohashes sharing k bits lie in the same cell of a geohash with k bits.
+
+    Parameters
+    ----------
+    bin_geohash : array
+        Binary geohashes packed in unsigned integers
+    other : array or int
+        Binary geohashes compared with bin_geohash
+    precision : int
+        Number of characters in the geohashes
+
+    Return
+    ------
+    array
+        The length of the common prefix of each pair of geohashes
+
+    Example
+    -------
+    >>> from pymove.utils.geoutils import bin_geohash_common_prefix
+    >>> bin_geohash_common_prefix(
+    ...     [263683713219, 263683564627], 263683713219, precision=8
+    ... )
+    array([40, 21])
+    """
+    different = (
+        np.asarray(bin_geohash, dtype=np.uint64) ^ np.asarray(other, dtype=np.uint64)
+    )
+    return 5 * precision - _bit_length(different)
+
+
+def bin_geohash_neighbors(bin_geohash: ndarray, precision: int) -> ndarray:
+    """
+    Returns the eight neighbors of packed binary geohashes.
+
+    The neighbors wrap around the antimeridian, and the latitude
+    is clamped at the poles.
+
+    Parameters
+    ----------
+    bin_geohash : array
+        Binary geohashes packed in unsigned integers
+    precision : int
+        Number of characters in the geohashes
+
+    Return
+    ------
+    array
+        The north, northeast, east, southeast, south, southwest, west and
+        northwest neighbors of each geohash
+
+    Example
+    -------
+    >>> from pymove.utils.geoutils import (
+    ...     bin_geohash_neighbors, encode_geohash_array
+    ... )
+    >>> geohash = encode_geohash_array([-3.777736], [-38.547792], 4, 'int')
+    >>> geohash
+    array([251468], dtype=uint64)
+    >>> bin_geohash_neighbors(geohash, precision=4)
+    array([[251469, 251471, 251470, 251467, 251465, 251459, 251462, 251463]],
+          dtype=uint64)
+    """
+    lat, lon = _deinterleave(bin_geohash, precision)
+    lat, lon = lat.astype(np.int64), lon.astype(np.int64)
+    lat_cells = 1 << (5 * precision // 2)
+    lon_cells = 1 << ((5 * precision + 1) // 2)
+
+    neighbors = []
+    for dlat, dlon in [
+        (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)
+    ]:
+        neighbor_lat = lat + dlat
+        neighbor_lat = np.where(
+            (neighbor_lat < 0) | (neighbor_lat >= lat_cells), lat, neighbor_lat
+        )
+        neighbor_lon = np.mod(lon + dlon, lon_cells)
+        neighbors.append(_interleave(neighbor_lat, neighbor_lon, precision))
+    return np.stack(neighbors, axis=-1)
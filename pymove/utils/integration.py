@@ -7,6 +7,7 @@ union_poi_bar_restaurant,
 union_poi_parks,
 union_poi_police,
 join_collective_areas,
+create_poi_index,
 join_with_pois,
 join_with_pois_by_category,
 join_with_events,
@@ -17,12 +18,16 @@ merge_home_with_poi
 """
 from __future__ import annotations
 
-from collections import namedtuple
+from itertools import chain
 
 import numpy as np
 from numpy import ndarray
-from pandas import DataFrame, Timedelta
+from pandas import DataFrame, Index, Timedelta
 from pandas.core.series import Series
+from scipy.spatial import cKDTree
+from shapely.geometry import Point
+from shapely.prepared import prep
+from shapely.vectorized import contains, touches
 
 from pymove.preprocessing import filters
 from pymove.utils.constants import (
@@ -44,6 +49,7 @@ from pymove.utils.constants import (
     TYPE_POI,
     VIOLATING,
 )
+from pymove.utils.conversions import lat_lon_to_unit_sphere, meters_to_chord
 from pymove.utils.distances import haversine
 from pymove.utils.log import logger, progress_bar
 
@@ -406,6 +412,7 @@ def join_collective_areas(
     data: DataFrame,
     areas: DataFrame,
     label_geometry: str = GEOMETRY,
+    use_lat_lon: bool = False,
     inplace: bool = False
 ) -> DataFrame | None:
     """
@@ -422,6 +429,9 @@ def join_collective_areas(
         The input coletive areas data
     label_geometry : str, optional
         Label referring to the Point of Interest category, by default GEOMETRY
+    use_lat_lon : boolean, optional
+        if set to true the points are read from the latitude and longitude
+        columns of data, so the geometry column is not needed, by default False
     inplace : boolean, optional
         if set to true the original dataframe will be altered to contain
         the result of the filtering, otherwise a copy will be returned, by default False
@@ -431,6 +441,12 @@ def join_collective_areas(
     DataFrame
         data with joined geometries or None
 
+    Notes
+    -----
+    Points are sorted by longitude once, each area only tests the points
+    inside its bounding box, and polygonal areas are tested with
+    vectorized prepared-geometry predicates.
+
     Examples
     --------
     >>> from pymove.utils.integration import join_collective_areas
@@ -467,17 +483,43 @@ def join_collective_areas(
     if not inplace:
         data = data.copy()
     logger.debug('Integration between trajectories and collectives areas')
-    Geometry = namedtuple('Geometry', 'geom coordinates')
+    polygons = list({g.wkb: g for g in areas[label_geometry]}.values())
+
+    if use_lat_lon:
+        x = data[LONGITUDE].to_numpy(dtype=np.float64)
+        y = data[LATITUDE].to_numpy(dtype=np.float64)
+    else:
+        geometries = data[label_geometry].to_numpy()
+        x = np.fromiter((g.x for g in geometries), np.float64, len(geometries))
+        y = np.fromiter((g.y for g in geometries), np.float64, len(geometries))
 
-    polygons = areas[label_geometry].apply(
-        lambda g: Geometry(g.__class__, g.__geo_interface__.get('coordinates'))
-    ).unique()
-    polygons = [p.geom(p.coordinates) for p in polygons]
-    data[VIOLATING] = False
+    order = np.argsort(x, kind='stable')
+    sorted_x = x[order]
+    violating = np.zeros(len(x), dtype=bool)
     for p in progress_bar(polygons, desc='Joining trajectories and areas'):
-        intersects = data[label_geometry].apply(lambda x: x.intersects(p))
-        index = data[intersects].index
-        data.at[index, VIOLATING] = True
+        min_x, min_y, max_x, max_y = p.bounds
+        start = np.searchsorted(sorted_x, min_x, side='left')
+        end = np.searchsorted(sorted_x, max_x, side='right')
+        candidates = order[start:end]
+        candidates = candidates[
+            (y[candidates] >= min_y)
+            & (y[candidates] <= max_y)
+            & ~violating[candidates]
+        ]
+        if candidates.size == 0:
+            continue
+        cx, cy = x[candidates], y[candidates]
+        if p.geom_type in ('Polygon', 'MultiPolygon'):
+            intersects = contains(p, cx, cy) | touches(p, cx, cy)
+        else:
+            prepared = prep(p)
+            intersects = np.fromiter(
+                (prepared.intersects(Point(px, py)) for px, py in zip(cx, cy)),
+                dtype=bool,
+                count=candidates.size
+            )
+        violating[candidates[intersects]] = True
+    data[VIOLATING] = violating
     if not inplace:
         return data
 
@@ -682,12 +724,109 @@ def _reset_set_window_and_creates_event_id_type_all(
     return window_starts, window_ends, current_distances, event_id, event_type
 
 
+def _time_window_pairs(
+    times: ndarray,
+    window_starts: ndarray,
+    window_ends: ndarray,
+    order: ndarray | None = None
+) -> tuple[ndarray, ndarray]:
+    """
+    Finds the instants that fall inside each time window.
+
+    The instants are sorted once and each window is answered with a binary
+    search, so the cost grows with the number of pairs found.
+
+    Parameters
+    ----------
+    times : ndarray
+        Instants, as integers.
+    window_starts : ndarray
+        Start of each window, inclusive, as integers.
+    window_ends : ndarray
+        End of each window, inclusive, as integers.
+    order : ndarray, optional
+        Positions that sort the instants, allowing many calls to reuse
+        the sort, by default None
+
+    Returns
+    -------
+    tuple[ndarray, ndarray]
+        position of the window of each pair,
+        position of the instant of each pair
+
+    Examples
+    --------
+    >>> from pymove.utils.integration import _time_window_pairs
+    >>> _time_window_pairs(
+    >>>     np.array([5, 1, 3]), np.array([0, 4]), np.array([3, 9])
+    >>> )
+    (array([0, 0, 1]), array([1, 2, 0]))
+    """
+    if order is None:
+        order = np.argsort(times, kind='stable')
+    sorted_times = times[order]
+    lower = np.searchsorted(sorted_times, window_starts, side='left')
+    upper = np.searchsorted(sorted_times, window_ends, side='right')
+    lengths = np.maximum(upper - lower, 0)
+
+    windows = np.repeat(np.arange(lengths.size), lengths)
+    offsets = np.arange(windows.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return windows, order[np.repeat(lower, lengths) + offsets]
+
+
+def create_poi_index(df_pois: DataFrame) -> tuple[cKDTree, ndarray]:
+    """
+    Builds a spatial index over the locations of the points of interest.
+
+    Points are indexed by their coordinates in the unit sphere, where the
+    euclidean distance grows with the haversine distance, so the nearest
+    neighbour in the tree is the nearest point of interest. Repeated
+    locations are indexed once, keeping the first point of interest,
+    and points without finite coordinates are left out.
+
+    Parameters
+    ----------
+    df_pois : DataFrame
+        The input point of interest data.
+
+    Returns
+    -------
+    tuple[cKDTree, ndarray]
+        tree over the distinct locations,
+        position in df_pois of the point of interest of each tree node
+
+    Examples
+    --------
+    >>> from pymove.utils.integration import create_poi_index
+    >>> pois
+              lat          lon   id   type_poi              name_poi
+    0   39.984094   116.319236    1    policia        distrito_pol_1
+    1   39.991013   116.326384    2    policia       policia_federal
+    2   40.010000   116.312615    3   comercio   supermercado_aroldo
+    >>> tree, positions = create_poi_index(pois)
+    >>> positions
+    array([0, 1, 2])
+    """
+    finite = (
+        np.isfinite(df_pois[LATITUDE].to_numpy(dtype=np.float64))
+        & np.isfinite(df_pois[LONGITUDE].to_numpy(dtype=np.float64))
+    )
+    positions = np.flatnonzero(
+        ~df_pois.duplicated(subset=[LATITUDE, LONGITUDE]).values & finite
+    )
+    points = lat_lon_to_unit_sphere(
+        df_pois[LATITUDE].values[positions], df_pois[LONGITUDE].values[positions]
+    )
+    return cKDTree(points), positions
+
+
 def join_with_pois(
     data: DataFrame,
     df_pois: DataFrame,
     label_id: str = TRAJ_ID,
     label_poi_name: str = NAME_POI,
     reset_index: bool = True,
+    poi_index: tuple[cKDTree, ndarray] | None = None,
     inplace: bool = False
 ):
     """
@@ -710,6 +849,10 @@ def join_with_pois(
     reset_index : bool, optional
         Flag for reset index of the df_pois and data dataframes before the join,
         by default True
+    poi_index : tuple[cKDTree, ndarray], optional
+        Spatial index of df_pois created by create_poi_index, allowing the
+        index to be reused across many trajectory batches,
+        by default None, creates the index
     inplace : boolean, optional
         if set to true the original dataframe will be altered to contain
         the result of the filtering, otherwise a copy will be returned, by default False
@@ -751,43 +894,30 @@ def join_with_pois(
         df_pois = df_pois.copy()
 
     values = _reset_and_creates_id_and_lat_lon(data, df_pois, False, reset_index)
-    minimum_distances, ids_pois, tag_pois, lat_poi, lon_poi = values
-
-    for idx, row in progress_bar(
-        df_pois.iterrows(), total=len(df_pois), desc='Optimized integration with POIs'
-    ):
-        # update lat and lon of current index
-        lat_poi.fill(row[LATITUDE])
-        lon_poi.fill(row[LONGITUDE])
-
-        # First iteration is minimum distances
-        if idx == 0:
-            minimum_distances = np.array(
-                haversine(
-                    lat_poi,
-                    lon_poi,
-                    data[LATITUDE].values,
-                    data[LONGITUDE].values
-                )
-            )
-            ids_pois.fill(row[label_id])
-            tag_pois.fill(row[label_poi_name])
-        else:
-            # compute dist between a POI and ALL
-            current_distances = np.float64(
-                haversine(
-                    lat_poi,
-                    lon_poi,
-                    data[LATITUDE].values,
-                    data[LONGITUDE].values
-                )
-            )
-            compare = current_distances < minimum_distances
-            minimum_distances = np.minimum(
-                current_distances, minimum_distances, dtype=np.float64
+    minimum_distances, ids_pois, tag_pois, *_ = values
+
+    if df_pois.shape[0] > 0 and data.shape[0] > 0:
+        if poi_index is None:
+            poi_index = create_poi_index(df_pois)
+        tree, positions = poi_index
+
+        # points without finite coordinates keep the default values
+        lat_user = data[LATITUDE].to_numpy(dtype=np.float64)
+        lon_user = data[LONGITUDE].to_numpy(dtype=np.float64)
+        finite = np.isfinite(lat_user) & np.isfinite(lon_user)
+        if tree.n > 0 and finite.any():
+            lat_user, lon_user = lat_user[finite], lon_user[finite]
+            _, nearest = tree.query(lat_lon_to_unit_sphere(lat_user, lon_user))
+            nearest = positions[nearest]
+
+            minimum_distances[finite] = haversine(
+                df_pois[LATITUDE].values[nearest],
+                df_pois[LONGITUDE].values[nearest],
+                lat_user,
+                lon_user
             )
-            ids_pois[compare] = row[label_id]
-            tag_pois[compare] = row[label_poi_name]
+            ids_pois[finite] = df_pois[label_id].values[nearest]
+            tag_pois[finite] = df_pois[label_poi_name].values[nearest]
 
     data[ID_POI] = ids_pois
     data[DIST_POI] = minimum_distances
@@ -803,6 +933,7 @@ def join_with_pois_by_category(
     df_pois: DataFrame,
     label_category: str = TYPE_POI,
     label_id: str = TRAJ_ID,
+    max_distance: float | None = None,
     inplace: bool = False
 ):
     """
@@ -822,6 +953,10 @@ def join_with_pois_by_category(
         Label of df_pois referring to the point of interest category, by default TYPE_POI
     label_id : str, optional
         Label of df_pois referring to the point of interest id, by default TRAJ_ID
+    max_distance : float, optional
+        Maximum distance in meters to the nearest point of interest of a
+        category, points without one get a NaN id and infinite distance,
+        by default None
     inplace : boolean, optional
         if set to true the original dataframe will be altered to contain
         the result of the filtering, otherwise a copy will be returned, by default False
@@ -868,44 +1003,46 @@ def join_with_pois_by_category(
     data.reset_index(drop=True, inplace=True)
     df_pois.reset_index(drop=True, inplace=True)
 
-    # create numpy array to store new column to DataFrame of movement objects
-    current_distances = np.full(
-        data.shape[0], np.Infinity, dtype=np.float64
-    )
-    ids_pois = np.full(data.shape[0], np.NAN, dtype='object_')
-
     unique_categories = df_pois[label_category].unique()
     size_categories = len(unique_categories)
     logger.debug('There are %s categories' % size_categories)
 
-    for i, c in enumerate(unique_categories, start=1):
-        # creating lat and lon array to operation
-        df_category = df_pois[df_pois[label_category] == c]
-        df_category.reset_index(drop=True, inplace=True)
-
-        desc = f'computing dist to {c} category ({i}/{size_categories})'
-        for idx, row in progress_bar(data.iterrows(), total=len(data), desc=desc):
-            lat_user = np.full(
-                df_category.shape[0], row[LATITUDE], dtype=np.float64
-            )
-            lon_user = np.full(
-                df_category.shape[0], row[LONGITUDE], dtype=np.float64
-            )
-
-            # computing distances to
-            distances = haversine(
-                lat_user,
-                lon_user,
-                df_category[LATITUDE].values,
-                df_category[LONGITUDE].values,
-            )
+    if max_distance is None:
+        max_distance = np.inf
+    # the tree search is pruned by the chord, slightly relaxed against rounding
+    upper_bound = meters_to_chord(max_distance) * (1 + 1e-9)
+
+    # points without finite coordinates keep the default values
+    lat_user = data[LATITUDE].to_numpy(dtype=np.float64)
+    lon_user = data[LONGITUDE].to_numpy(dtype=np.float64)
+    finite = np.isfinite(lat_user) & np.isfinite(lon_user)
+    points = lat_lon_to_unit_sphere(lat_user[finite], lon_user[finite])
+
+    for c in progress_bar(unique_categories, desc='Integration with POIs by category'):
+        # create numpy array to store new column to DataFrame of movement objects
+        current_distances = np.full(
+            data.shape[0], np.Infinity, dtype=np.float64
+        )
+        ids_pois = np.full(data.shape[0], np.NAN, dtype='object_')
 
-            # get index to arg_min and min distance
-            index_min = np.argmin(distances)
+        df_category = df_pois[df_pois[label_category] == c]
+        tree, positions = create_poi_index(df_category)
+        _, nearest = tree.query(points, distance_upper_bound=upper_bound)
+        found = np.zeros(data.shape[0], dtype=bool)
+        found[finite] = nearest < tree.n
+        nearest = positions[nearest[nearest < tree.n]]
+
+        current_distances[found] = haversine(
+            lat_user[found],
+            lon_user[found],
+            df_category[LATITUDE].values[nearest],
+            df_category[LONGITUDE].values[nearest],
+        )
+        ids_pois[found] = df_category[label_id].values[nearest]
 
-            # setting data for a single object movement
-            current_distances[idx] = np.min(distances)
-            ids_pois[idx] = df_category.at[index_min, label_id]
+        far = current_distances > max_distance
+        current_distances[far] = np.Infinity
+        ids_pois[far] = np.NAN
 
         data['id_%s' % c] = ids_pois
         data['dist_%s' % c] = current_distances
@@ -922,6 +1059,7 @@ def join_with_events(
     time_window: int = 900,
     label_event_id: str = EVENT_ID,
     label_event_type: str = EVENT_TYPE,
+    chunk_size: int = 10000,
     inplace: bool = False
 ):
     """
@@ -948,6 +1086,8 @@ def join_with_events(
         Label of df_events referring to the id of the event, by default EVENT_ID
     label_event_type : str, optional
         Label of df_events referring to the type of the event, by default EVENT_TYPE
+    chunk_size : int, optional
+        Number of events processed together, by default 10000
     inplace : boolean, optional
         if set to true the original dataframe will be altered to contain
         the result of the filtering, otherwise a copy will be returned, by default False
@@ -981,11 +1121,6 @@ def join_with_events(
     4  39.981668  116.310769 2008-10-24 01:57:57   3 \
                     feira  3154.296880    adocao_de_animais
 
-    Raises
-    ------
-    ValueError
-        If feature generation fails
-
     """
     if not inplace:
         data = data.copy()
@@ -994,7 +1129,7 @@ def join_with_events(
     values = _reset_set_window__and_creates_event_id_type(
         data, df_events, time_window, label_date
     )
-    *_, current_distances, event_id, event_type = values
+    *_, event_id, event_type = values
     window_starts, window_ends, *_ = _reset_set_window__and_creates_event_id_type(
         df_events, data, time_window, label_date
     )
@@ -1003,49 +1138,42 @@ def join_with_events(
         data.shape[0], np.Infinity, dtype=np.float64
     )
 
-    for idx, row in progress_bar(
-        df_events.iterrows(), total=len(df_events), desc='Integration with Events'
+    lat_user = data[LATITUDE].values
+    lon_user = data[LONGITUDE].values
+    time_user = data[DATETIME].values.astype('datetime64[ns]').astype(np.int64)
+    order = np.argsort(time_user, kind='stable')
+    window_starts = window_starts.values.astype('datetime64[ns]').astype(np.int64)
+    window_ends = window_ends.values.astype('datetime64[ns]').astype(np.int64)
+
+    for start in progress_bar(
+        range(0, df_events.shape[0], chunk_size), desc='Integration with Events'
     ):
-        df_filtered = filters.by_datetime(
-            data, window_starts[idx], window_ends[idx]
+        chunk = slice(start, start + chunk_size)
+        events, points = _time_window_pairs(
+            time_user, window_starts[chunk], window_ends[chunk], order
         )
-        if df_filtered is None:
-            raise ValueError('Filtering datetime failed!')
-
-        size_filter = df_filtered.shape[0]
-
-        if size_filter > 0:
-            indexes = df_filtered.index
-            lat_event = np.full(
-                df_filtered.shape[0], row[LATITUDE], dtype=np.float64
-            )
-            lon_event = np.full(
-                df_filtered.shape[0], row[LONGITUDE], dtype=np.float64
-            )
-
-            # First iteration is minimum distances
-            if idx == 0:
-                minimum_distances[indexes] = haversine(
-                    lat_event,
-                    lon_event,
-                    df_filtered[LATITUDE].values,
-                    df_filtered[LONGITUDE].values,
-                )
-                event_id[indexes] = row[label_event_id]
-                event_type[indexes] = row[label_event_type]
-            else:
-                current_distances[indexes] = haversine(
-                    lat_event,
-                    lon_event,
-                    df_filtered[LATITUDE].values,
-                    df_filtered[LONGITUDE].values,
-                )
-                compare = current_distances < minimum_distances
-                minimum_distances = np.minimum(
-                    current_distances, minimum_distances
-                )
-                event_id[compare] = row[label_event_id]
-                event_type[compare] = row[label_event_type]
+        events += start
+
+        current_distances = np.asarray(haversine(
+            df_events[LATITUDE].values[events],
+            df_events[LONGITUDE].values[events],
+            lat_user[points],
+            lon_user[points],
+        ))
+
+        # nearest event of each point, the first one on ties
+        nearest = np.lexsort((events, current_distances, points))
+        first = np.ones(nearest.size, dtype=np.bool_)
+        first[1:] = np.diff(points[nearest]) != 0
+        nearest = nearest[first]
+        points, events = points[nearest], events[nearest]
+        current_distances = current_distances[nearest]
+
+        compare = current_distances < minimum_distances[points]
+        points, events = points[compare], events[compare]
+        minimum_distances[points] = current_distances[compare]
+        event_id[points] = df_events[label_event_id].values[events]
+        event_type[points] = df_events[label_event_type].values[events]
 
     data[label_event_id] = event_id
     data[DIST_EVENT] = minimum_distances
@@ -1064,7 +1192,8 @@ def join_with_event_by_dist_and_time(
     label_event_type: str = EVENT_TYPE,
     time_window: float = 3600,
     radius: float = 1000,
-    inplace: bool = False
+    inplace: bool = False,
+    chunk_size: int = 10000
 ):
     """
     Performs the integration between trajectories and events on windows.
@@ -1094,6 +1223,8 @@ def join_with_event_by_dist_and_time(
     inplace : boolean, optional
         if set to true the original dataframe will be altered to contain
         the result of the filtering, otherwise a copy will be returned, by default False
+    chunk_size : int, optional
+        Number of points, close in time, processed together, by default 10000
 
     Examples
     --------
@@ -1145,56 +1276,98 @@ def join_with_event_by_dist_and_time(
 
     window_start, window_end, current_distances, event_id, event_type = values
 
-    for idx, row in progress_bar(
-        data.iterrows(), total=len(data), desc='Integration with Events'
-    ):
-        # set min and max of coordinates by radius
-        bbox = filters.get_bbox_by_radius(
-            (row[LATITUDE], row[LONGITUDE]), radius
-        )
-
-        # filter event by radius
-        df_filtered = filters.by_bbox(
-            df_events, bbox, inplace=False
-        )
-
-        if df_filtered is None:
-            raise ValueError('Filtering bbox failed')
-
-        # filter event by datetime
-        filters.by_datetime(
-            df_filtered,
-            start_datetime=window_start[idx],
-            end_datetime=window_end[idx],
-            inplace=True
-        )
-
-        # get df_filtered size
-        size_filter = df_filtered.shape[0]
-
-        if size_filter > 0:
-            # reseting index of data frame
-            df_filtered.reset_index(drop=True, inplace=True)
-
-            # create lat and lon array to operation
-            lat_user = np.full(
-                size_filter, row[LATITUDE], dtype=np.float64
-            )
-            lon_user = np.full(
-                size_filter, row[LONGITUDE], dtype=np.float64
+    lat_user = data[LATITUDE].values
+    lon_user = data[LONGITUDE].values
+    lat_event = df_events[LATITUDE].values
+    lon_event = df_events[LONGITUDE].values
+    time_event = df_events[DATETIME].values.astype('datetime64[ns]').astype(np.int64)
+    window_start = window_start.values.astype('datetime64[ns]').astype(np.int64)
+    window_end = window_end.values.astype('datetime64[ns]').astype(np.int64)
+
+    # set min and max of coordinates by radius
+    bbox = np.asarray(filters.get_bbox_by_radius((lat_user, lon_user), radius))
+
+    # the ball around the farthest bbox corner contains the bbox of the point
+    reach = np.maximum(
+        np.asarray(haversine(lat_user, lon_user, bbox[0], bbox[3])),
+        np.asarray(haversine(lat_user, lon_user, bbox[2], bbox[3])),
+    )
+    chords = np.asarray(meters_to_chord(reach)) * (1 + 1e-6)
+
+    order = np.argsort(time_event, kind='stable')
+    sorted_times = time_event[order]
+    lower = np.searchsorted(sorted_times, window_start, side='left')
+    upper = np.searchsorted(sorted_times, window_end, side='right')
+    lengths = np.where(np.isfinite(reach), np.maximum(upper - lower, 0), 0)
+
+    # blocks of points close in time share the events of their windows
+    by_time = np.argsort(window_start, kind='stable')
+    by_time = by_time[lengths[by_time] > 0]
+    matches = [(np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))]
+    for start in range(0, by_time.size, chunk_size):
+        block = by_time[start:start + chunk_size]
+        temporal = lengths[block].sum()
+
+        spatial = temporal
+        if temporal > block.size:
+            lo, hi = lower[block].min(), upper[block].max()
+            tree = cKDTree(
+                lat_lon_to_unit_sphere(lat_event[order[lo:hi]], lon_event[order[lo:hi]])
             )
-
-            # calculate of distances between points
-            distances = haversine(
-                lat_user,
-                lon_user,
-                df_filtered[LATITUDE].to_numpy(),
-                df_filtered[LONGITUDE].to_numpy()
+            sphere = lat_lon_to_unit_sphere(lat_user[block], lon_user[block])
+            counts = tree.query_ball_point(sphere, chords[block], return_length=True)
+            spatial = counts.sum()
+
+        # candidate pairs from the events around each point, when fewer
+        if spatial < temporal:
+            neighbours = tree.query_ball_point(sphere, chords[block])
+            points = np.repeat(block, counts)
+            events = order[lo + np.fromiter(
+                chain.from_iterable(neighbours), dtype=np.intp, count=points.size
+            )]
+        else:
+            points, events = _time_window_pairs(
+                time_event, window_start[block], window_end[block], order
             )
-
-            current_distances[idx] = distances
-            event_type[idx] = df_filtered[label_event_type].to_numpy(dtype=np.ndarray)
-            event_id[idx] = df_filtered[label_event_id].to_numpy(dtype=np.ndarray)
+            points = block[points]
+
+        # filter event by radius and datetime
+        inside = (
+            (lat_event[events] >= bbox[0][points])
+            & (lon_event[events] >= bbox[1][points])
+            & (lat_event[events] <= bbox[2][points])
+            & (lon_event[events] <= bbox[3][points])
+            & (time_event[events] >= window_start[points])
+            & (time_event[events] <= window_end[points])
+        )
+        matches.append((points[inside], events[inside]))
+
+    points = np.concatenate([p for p, _ in matches])
+    events = np.concatenate([e for _, e in matches])
+    order = np.lexsort((events, points))
+    points, events = points[order], events[order]
+
+    # calculate of distances between points
+    distances = np.asarray(haversine(
+        lat_user[points], lon_user[points], lat_event[events], lon_event[events]
+    ))
+    types = df_events[label_event_type].to_numpy(dtype=np.ndarray)[events]
+    ids = df_events[label_event_id].to_numpy(dtype=np.ndarray)[events]
+
+    matched, bounds = np.unique(points, return_index=True)
+    for idx, dist_, type_, id_ in progress_bar(
+        zip(
+            matched,
+            np.split(distances, bounds[1:]),
+            np.split(types, bounds[1:]),
+            np.split(ids, bounds[1:]),
+        ),
+        total=matched.size,
+        desc='Integration with Events'
+    ):
+        current_distances[idx] = dist_
+        event_type[idx] = type_
+        event_id[idx] = id_
 
     data[label_event_id] = event_id
     data[DIST_EVENT] = current_distances
@@ -1274,52 +1447,38 @@ def join_with_home_by_id(
         data = data.copy()
         df_home = df_home.copy()
 
-    ids_without_home = []
-
     if data.index.name is None:
         logger.debug(f'...setting {label_id} as index')
         data.set_index(label_id, inplace=True)
 
-    for idx in progress_bar(
-        data.index.unique(), total=len(data.index.unique()), desc='Integration with Home'
-    ):
-        filter_home = df_home[label_id] == idx
+    # first home of each id, joined to the points by the id
+    df_home = df_home.drop_duplicates(subset=label_id, keep='first')
+    position = Index(df_home[label_id]).get_indexer(data.index)
+    has_home = position >= 0
+    position = position[has_home]
+    logger.debug(f'...{data.index[~has_home].nunique()} ids have no HOME')
+
+    distances = np.full(data.shape[0], np.nan, dtype=np.float64)
+    distances[has_home] = haversine(
+        data[LATITUDE].values[has_home],
+        data[LONGITUDE].values[has_home],
+        df_home[LATITUDE].values[position],
+        df_home[LONGITUDE].values[position],
+    )
+    homes = np.full(data.shape[0], np.nan, dtype='object_')
+    homes[has_home] = df_home[label_address].values[position]
+    cities = np.full(data.shape[0], np.nan, dtype='object_')
+    cities[has_home] = df_home[label_city].values[position]
 
-        if df_home[filter_home].shape[0] == 0:
-            logger.debug(f'...id: {idx} has not HOME')
-            ids_without_home.append(idx)
-        else:
-            home = df_home[filter_home].iloc[0]
-            lat_user = data.at[idx, LATITUDE].values
-            lon_user = data.at[idx, LONGITUDE].values
-
-            # if user has a single tuple
-            if not isinstance(lat_user, np.ndarray):
-                lat_home = home[LATITUDE].values
-                lon_home = home[LONGITUDE].values
-                data.at[idx, DIST_HOME] = haversine(
-                    lat_user, lon_user, lat_home, lon_home
-                )
-                data.at[idx, HOME] = home[label_address]
-                data.at[idx, label_city] = home[label_city]
-            else:
-                lat_home = np.full(
-                    data.loc[idx].shape[0], home[LATITUDE], dtype=np.float64
-                )
-                lon_home = np.full(
-                    data.loc[idx].shape[0], home[LONGITUDE], dtype=np.float64
-                )
-                data.at[idx, DIST_HOME] = haversine(
-                    lat_user, lon_user, lat_home, lon_home
-                )
-                data.at[idx, HOME] = np.array(home[label_address])
-                data.at[idx, label_city] = np.array(home[label_city])
+    data[DIST_HOME] = distances
+    data[HOME] = homes
+    data[label_city] = cities
 
     data.reset_index(inplace=True)
     logger.debug('... Resetting index')
 
     if drop_id_without_home:
-        data.drop(data.loc[data[TRAJ_ID].isin(ids_without_home)].index, inplace=True)
+        data.drop(data.index[~has_home], inplace=True)
 
     if not inplace:
         return data